@@ -0,0 +1,144 @@
+
+# Measures per-call overhead of the small, frequently called methods, where
+# argument handling rather than LMDB dominates. Run against each binding with
+# LMDB_FORCE_CPYTHON=1 or LMDB_FORCE_CFFI=1.
+
+from __future__ import print_function
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+
+from time import time as now
+import lmdb
+
+COUNT = 200000
+REPEAT = 5
+
+if os.path.exists('/ram'):
+    DB_PATH = tempfile.mkdtemp(dir='/ram', prefix='callbench')
+else:
+    DB_PATH = tempfile.mkdtemp(prefix='callbench')
+
+env = lmdb.open(DB_PATH, map_size=1048576 * 400, sync=False)
+atexit.register(shutil.rmtree, DB_PATH)
+atexit.register(env.close)
+
+keys = [('%08d' % i).encode() for i in range(COUNT)]
+with env.begin(write=True) as txn:
+    for key in keys:
+        txn.put(key, key)
+
+
+def case(title):
+    def wrapper(func):
+        best = None
+        for _ in range(REPEAT):
+            t0 = now()
+            func()
+            t = now() - t0
+            best = t if best is None else min(best, t)
+        print('%46s:  %6.1f ns/call   %10d/sec'
+              % (title, 1e9 * best / COUNT, COUNT / best))
+        return func
+    return wrapper
+
+
+print('binding: %s  python: %s'
+      % ('cffi' if 'lmdb.cffi' in sys.modules else 'cpython',
+         sys.version.split()[0]))
+
+txn = env.begin()
+db = env.open_db(None)
+curs = txn.cursor()
+
+
+@case('Transaction.get(key)')
+def test():
+    get = txn.get
+    for key in keys:
+        get(key)
+
+
+@case('Transaction.get(key, None, db)')
+def test():
+    get = txn.get
+    for key in keys:
+        get(key, None, db)
+
+
+@case('Transaction.get(key, db=db)')
+def test():
+    get = txn.get
+    for key in keys:
+        get(key, db=db)
+
+
+@case('Environment.get(key)')
+def test():
+    get = env.get
+    for key in keys:
+        get(key)
+
+
+@case('Transaction.cursor()')
+def test():
+    cursor = txn.cursor
+    for _ in keys:
+        cursor()
+
+
+@case('Cursor.get(key)')
+def test():
+    get = curs.get
+    for key in keys:
+        get(key)
+
+
+@case('Cursor.set_key(key)')
+def test():
+    set_key = curs.set_key
+    for key in keys:
+        set_key(key)
+
+
+@case('Environment.begin()')
+def test():
+    begin = env.begin
+    for _ in keys:
+        begin().abort()
+
+txn.abort()
+
+
+@case('Transaction.put(key, value)')
+def test():
+    with env.begin(write=True) as txn:
+        put = txn.put
+        for key in keys:
+            put(key, key)
+
+
+@case('Transaction.put(key, value, overwrite=False)')
+def test():
+    with env.begin(write=True) as txn:
+        put = txn.put
+        for key in keys:
+            put(key, key, overwrite=False)
+
+
+@case('Cursor.put(key, value)')
+def test():
+    with env.begin(write=True) as txn:
+        put = txn.cursor().put
+        for key in keys:
+            put(key, key)
+
+
+@case('Transaction.replace(key, value)')
+def test():
+    with env.begin(write=True) as txn:
+        replace = txn.replace
+        for key in keys:
+            replace(key, key)
@@ -0,0 +1,104 @@
+/*
+ * Copyright 2013 The py-lmdb authors, all rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted only as authorized by the OpenLDAP
+ * Public License.
+ *
+ * A copy of this license is available in the file LICENSE in the
+ * top-level directory of the distribution or, alternatively, at
+ * <http://www.OpenLDAP.org/license.html>.
+ *
+ * OpenLDAP is a registered trademark of the OpenLDAP Foundation.
+ *
+ * Individual files and/or contributed packages may be copyright by
+ * other parties and/or subject to additional restrictions.
+ *
+ * This work also contains materials derived from public sources.
+ *
+ * Additional information about OpenLDAP can be obtained at
+ * <http://www.openldap.org/>.
+ */
+
+#ifndef LMDB_CAS_H
+#define LMDB_CAS_H
+
+#include <string.h>
+
+/**
+ * Position `curs` on the value `expected` of `key`, returning 0 if it is
+ * found, or MDB_NOTFOUND if the key has some other value or does not exist.
+ * If `expected` is NULL, instead return 0 only if the key does not exist.
+ */
+static int cas_find(MDB_cursor *curs, MDB_val *key, MDB_val *expected,
+                    int dupsort)
+{
+    MDB_val val;
+    int rc;
+
+    if(! expected) {
+        rc = mdb_cursor_get(curs, key, &val, MDB_SET);
+        if(! rc) {
+            return MDB_NOTFOUND;
+        }
+        return (rc == MDB_NOTFOUND) ? 0 : rc;
+    }
+    if(dupsort) {
+        val = *expected;
+        return mdb_cursor_get(curs, key, &val, MDB_GET_BOTH);
+    }
+    rc = mdb_cursor_get(curs, key, &val, MDB_SET);
+    if(! rc && (val.mv_size != expected->mv_size ||
+                memcmp(val.mv_data, expected->mv_data, val.mv_size))) {
+        rc = MDB_NOTFOUND;
+    }
+    return rc;
+}
+
+/**
+ * Compare and swap: if `key` has the value `expected`, replace it with `val`,
+ * or delete it if `val` is NULL. If `expected` is NULL the key must not
+ * exist, and is created. For dupsort=True databases `expected` names one of
+ * the key's values, which is replaced or deleted.
+ *
+ * The key is found using a single cursor positioning step, and a value of a
+ * non-dupsort database is overwritten in place using MDB_CURRENT.
+ *
+ * Doesn't allocate besides the cursor and may be called with the GIL
+ * released. Returns 0 on success, MDB_NOTFOUND if the key did not have the
+ * expected value, or any other error from LMDB.
+ */
+static int cas_c(MDB_txn *txn, MDB_dbi dbi, MDB_val *key, MDB_val *val,
+                 MDB_val *expected)
+{
+    MDB_cursor *curs;
+    unsigned int flags;
+    int dupsort;
+    int rc;
+
+    if((rc = mdb_dbi_flags(txn, dbi, &flags))) {
+        return rc;
+    }
+    dupsort = (flags & MDB_DUPSORT) != 0;
+    if((rc = mdb_cursor_open(txn, dbi, &curs))) {
+        return rc;
+    }
+    if(! (rc = cas_find(curs, key, expected, dupsort))) {
+        if(! val) {
+            rc = mdb_cursor_del(curs, 0);
+        } else if(! expected) {
+            rc = mdb_cursor_put(curs, key, val, 0);
+        } else if(dupsort) {
+            /* The new value may sort elsewhere among the duplicates. */
+            if(! (rc = mdb_cursor_del(curs, 0))) {
+                rc = mdb_cursor_put(curs, key, val, 0);
+            }
+        } else {
+            rc = mdb_cursor_put(curs, key, val, MDB_CURRENT);
+        }
+    }
+    mdb_cursor_close(curs);
+    return rc;
+}
+
+#endif /* !LMDB_CAS_H */
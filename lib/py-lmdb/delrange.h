@@ -0,0 +1,134 @@
+/*
+ * Copyright 2013 The py-lmdb authors, all rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted only as authorized by the OpenLDAP
+ * Public License.
+ *
+ * A copy of this license is available in the file LICENSE in the
+ * top-level directory of the distribution or, alternatively, at
+ * <http://www.OpenLDAP.org/license.html>.
+ *
+ * OpenLDAP is a registered trademark of the OpenLDAP Foundation.
+ *
+ * Individual files and/or contributed packages may be copyright by
+ * other parties and/or subject to additional restrictions.
+ *
+ * This work also contains materials derived from public sources.
+ *
+ * Additional information about OpenLDAP can be obtained at
+ * <http://www.openldap.org/>.
+ */
+
+
+#ifndef LMDB_DELRANGE_H
+#define LMDB_DELRANGE_H
+
+#include <errno.h>
+#include <stdint.h>
+#include <string.h>
+
+#include "iterbatch.h"
+
+/** Size of the record describing a named database in the main database, an
+ * MDB_db, which lmdb.h doesn't expose. Only records of this size are checked
+ * by delete_range_named(). */
+#define DELRANGE_DB_SIZE \
+    (sizeof(uint32_t) + (2 * sizeof(uint16_t)) + (5 * sizeof(size_t)))
+
+/**
+ * Set `*named` if the current record of `curs`, described by `key` and
+ * `val`, describes a named database. mdb_cursor_del() refuses such records,
+ * and leaves the transaction unusable. Rewriting the record in place with
+ * MDB_RESERVE refuses them too, but harmlessly, and leaves any other record
+ * of the same size unchanged.
+ */
+static int delete_range_named(MDB_cursor *curs, MDB_val *key, MDB_val *val,
+                              int *named)
+{
+    MDB_val data = *val;
+    int rc;
+
+    rc = mdb_cursor_put(curs, key, &data, MDB_CURRENT | MDB_RESERVE);
+    *named = rc == MDB_INCOMPATIBLE;
+    return *named ? 0 : rc;
+}
+
+/**
+ * Delete records starting at the current position of `curs`, described by
+ * `key` and `val`, until reaching a key beyond `bound` if it is not NULL, or
+ * the end of the database. In a dupsort database, every value of each key is
+ * deleted at once, and `scratch` must have room for the longest possible key,
+ * i.e. mdb_env_get_maxkeysize(). In the main database, records describing
+ * named databases are skipped. `*count` is set to the number of records
+ * deleted, and `key` and `val` to the record following them.
+ *
+ * Doesn't allocate and may be called with the GIL released. Returns 0 at the
+ * end of the range, MDB_NOTFOUND at the end of the database, including once
+ * it is empty, otherwise the mdb error.
+ */
+static int delete_range_c(MDB_cursor *curs, MDB_val *key, MDB_val *val,
+                          struct iter_bound *bound, char *scratch,
+                          size_t *count)
+{
+    MDB_txn *txn = mdb_cursor_txn(curs);
+    unsigned int flags;
+    MDB_dbi main_dbi;
+    MDB_stat st;
+    size_t dups;
+    int named;
+    int rc;
+
+    *count = 0;
+    if((rc = mdb_dbi_flags(txn, mdb_cursor_dbi(curs), &flags)) ||
+       (rc = mdb_dbi_open(txn, NULL, 0, &main_dbi))) {
+        return rc;
+    }
+
+    for(;;) {
+        if(bound && iter_beyond(curs, MDB_NEXT, key, bound)) {
+            return 0;
+        }
+        /* Named databases can't be mixed with these main database flags. */
+        named = 0;
+        if(mdb_cursor_dbi(curs) == main_dbi &&
+           ! (flags & (MDB_DUPSORT | MDB_INTEGERKEY)) &&
+           val->mv_size == DELRANGE_DB_SIZE &&
+           (rc = delete_range_named(curs, key, val, &named))) {
+            return rc;
+        }
+        if(named) {
+            rc = mdb_cursor_get(curs, key, val, MDB_NEXT);
+        } else if(! (flags & MDB_DUPSORT)) {
+            if((rc = mdb_cursor_del(curs, 0))) {
+                return rc;
+            }
+            (*count)++;
+            /* Deletion leaves the cursor on the following record, or
+             * unpositioned if it was the last one in the database. */
+            rc = mdb_cursor_get(curs, key, val, MDB_GET_CURRENT);
+            if(rc == EINVAL &&
+               ! mdb_stat(txn, mdb_cursor_dbi(curs), &st) &&
+               ! st.ms_entries) {
+                rc = MDB_NOTFOUND;
+            }
+        } else {
+            if((rc = mdb_cursor_count(curs, &dups))) {
+                return rc;
+            }
+            memcpy(scratch, key->mv_data, key->mv_size);
+            if((rc = mdb_cursor_del(curs, MDB_NODUPDATA))) {
+                return rc;
+            }
+            *count += dups;
+            /* Deleting a key leaves the cursor unusable, so seek past it. */
+            key->mv_data = scratch;
+            rc = mdb_cursor_get(curs, key, val, MDB_SET_RANGE);
+        }
+        if(rc) {
+            return rc;
+        }
+    }
+}
+
+#endif /* !LMDB_DELRANGE_H */
@@ -0,0 +1,134 @@
+/*
+ * Copyright 2013 The py-lmdb authors, all rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted only as authorized by the OpenLDAP
+ * Public License.
+ *
+ * A copy of this license is available in the file LICENSE in the
+ * top-level directory of the distribution or, alternatively, at
+ * <http://www.OpenLDAP.org/license.html>.
+ *
+ * OpenLDAP is a registered trademark of the OpenLDAP Foundation.
+ *
+ * Individual files and/or contributed packages may be copyright by
+ * other parties and/or subject to additional restrictions.
+ *
+ * This work also contains materials derived from public sources.
+ *
+ * Additional information about OpenLDAP can be obtained at
+ * <http://www.openldap.org/>.
+ */
+
+#ifndef LMDB_GETMULTI_H
+#define LMDB_GETMULTI_H
+
+#include <string.h>
+
+#include "preload.h"
+
+/**
+ * Sort the `count` indices in `order` according to the database order of the
+ * keys they refer to in `keys`, using `tmp` as scratch space for `count`
+ * indices. `order` must initially contain 0..count-1.
+ *
+ * This is a bottom-up merge sort, since qsort() has no portable way to pass
+ * the MDB_txn and MDB_dbi required by mdb_cmp() to its comparison function.
+ * Doesn't allocate and may be called with the GIL released.
+ */
+static void getmulti_sort(MDB_cursor *curs, MDB_val *keys, size_t *order,
+                          size_t *tmp, size_t count)
+{
+    MDB_txn *txn = mdb_cursor_txn(curs);
+    MDB_dbi dbi = mdb_cursor_dbi(curs);
+    size_t *src = order;
+    size_t *dst = tmp;
+    size_t width;
+
+    for(width = 1; width < count; width *= 2) {
+        size_t lo;
+        size_t *swap;
+
+        for(lo = 0; lo < count; lo += 2 * width) {
+            size_t mid = (lo + width < count) ? lo + width : count;
+            size_t hi = (mid + width < count) ? mid + width : count;
+            size_t i = lo;
+            size_t j = mid;
+            size_t k = lo;
+
+            while(i < mid && j < hi) {
+                if(mdb_cmp(txn, dbi, keys + src[j], keys + src[i]) < 0) {
+                    dst[k++] = src[j++];
+                } else {
+                    dst[k++] = src[i++];
+                }
+            }
+            while(i < mid) {
+                dst[k++] = src[i++];
+            }
+            while(j < hi) {
+                dst[k++] = src[j++];
+            }
+        }
+        swap = src;
+        src = dst;
+        dst = swap;
+    }
+
+    if(src != order) {
+        memcpy(order, src, sizeof(size_t) * count);
+    }
+}
+
+/**
+ * Look up each of the `count` keys in `keys` using `curs`, storing the result
+ * for each in `vals`. The mv_data field of missing keys is set to NULL, and
+ * each found key is updated to point at the copy stored in the database.
+ *
+ * If `order` is not NULL, keys are visited in the sequence it gives, as
+ * produced by getmulti_sort(). Since LMDB checks whether an initialized cursor
+ * is already on the right leaf page before descending from the root, visiting
+ * keys in order lets neighbouring lookups share pages. Repeated keys are
+ * looked up only once.
+ *
+ * Must be called with the GIL released. Returns 0 on success, otherwise the
+ * first error other than MDB_NOTFOUND, with `*done` set to the index of the
+ * failing key.
+ */
+static int getmulti_c(MDB_cursor *curs, MDB_val *keys, MDB_val *vals,
+                      size_t *order, size_t count, size_t *done)
+{
+    MDB_txn *txn = mdb_cursor_txn(curs);
+    MDB_dbi dbi = mdb_cursor_dbi(curs);
+    int mode = preload_mode(mdb_txn_env(txn));
+    size_t prev = 0;
+    size_t j;
+    int rc;
+
+    for(j = 0; j < count; j++) {
+        size_t i = order ? order[j] : j;
+
+        if(order && j && !mdb_cmp(txn, dbi, keys + i, keys + prev)) {
+            keys[i] = keys[prev];
+            vals[i] = vals[prev];
+            continue;
+        }
+
+        rc = mdb_cursor_get(curs, keys + i, vals + i, MDB_SET_KEY);
+        if(rc) {
+            vals[i].mv_data = NULL;
+            vals[i].mv_size = 0;
+            if(rc != MDB_NOTFOUND) {
+                *done = i;
+                return rc;
+            }
+        } else {
+            preload(mode, rc, vals[i].mv_data, vals[i].mv_size);
+        }
+        prev = i;
+    }
+    *done = count;
+    return 0;
+}
+
+#endif /* !LMDB_GETMULTI_H */
@@ -0,0 +1,182 @@
+/*
+ * Copyright 2013 The py-lmdb authors, all rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted only as authorized by the OpenLDAP
+ * Public License.
+ *
+ * A copy of this license is available in the file LICENSE in the
+ * top-level directory of the distribution or, alternatively, at
+ * <http://www.OpenLDAP.org/license.html>.
+ *
+ * OpenLDAP is a registered trademark of the OpenLDAP Foundation.
+ *
+ * Individual files and/or contributed packages may be copyright by
+ * other parties and/or subject to additional restrictions.
+ *
+ * This work also contains materials derived from public sources.
+ *
+ * Additional information about OpenLDAP can be obtained at
+ * <http://www.openldap.org/>.
+ */
+
+#ifndef LMDB_INCR_H
+#define LMDB_INCR_H
+
+#include <errno.h>
+#include <stdint.h>
+
+/**
+ * Return the `width` byte integer at `p` as 64 bits, sign-extended if
+ * `is_signed`.
+ */
+static uint64_t incr_load(const unsigned char *p, int width, int is_signed,
+                          int big_endian)
+{
+    uint64_t v = 0;
+    int i;
+
+    for(i = 0; i < width; i++) {
+        v = (v << 8) | p[big_endian ? i : (width - 1 - i)];
+    }
+    if(is_signed && width < 8 && (v >> ((8 * width) - 1))) {
+        v |= ~(uint64_t)0 << (8 * width);
+    }
+    return v;
+}
+
+/**
+ * Store the low `width` bytes of `v` at `p`.
+ */
+static void incr_store(unsigned char *p, uint64_t v, int width,
+                       int big_endian)
+{
+    int i;
+
+    for(i = 0; i < width; i++) {
+        p[big_endian ? (width - 1 - i) : i] = (unsigned char) v;
+        v >>= 8;
+    }
+}
+
+/**
+ * Add `delta` to `*v`, a `width` byte integer. Returns ERANGE, leaving `*v`
+ * unchanged, if the result can't be represented.
+ */
+static int incr_add(uint64_t *v, int64_t delta, int width, int is_signed)
+{
+    int bits = 8 * width;
+    uint64_t mag;
+
+    if(is_signed) {
+        int64_t max = (int64_t)(~(uint64_t)0 >> (65 - bits));
+        int64_t min = -max - 1;
+        int64_t cur = (int64_t) *v;
+        if((delta > 0 && cur > (max - delta)) ||
+           (delta < 0 && cur < (min - delta))) {
+            return ERANGE;
+        }
+        *v = (uint64_t)(cur + delta);
+    } else {
+        uint64_t max = ~(uint64_t)0 >> (64 - bits);
+        if(delta >= 0) {
+            if((uint64_t) delta > max || *v > (max - (uint64_t) delta)) {
+                return ERANGE;
+            }
+            *v += (uint64_t) delta;
+        } else {
+            /* Avoid overflow negating INT64_MIN. */
+            mag = ((uint64_t) -(delta + 1)) + 1;
+            if(*v < mag) {
+                return ERANGE;
+            }
+            *v -= mag;
+        }
+    }
+    return 0;
+}
+
+/**
+ * Add `delta` to the `width` byte integer value of `key`, storing the new
+ * value in `*result`. A missing key is treated as 0 and created. An existing
+ * value is found with a single cursor positioning step and overwritten in
+ * place using MDB_CURRENT.
+ *
+ * Doesn't allocate and may be called with the GIL released. Returns 0 on
+ * success, MDB_INCOMPATIBLE for a dupsort=True database, MDB_BAD_VALSIZE if
+ * the existing value is not `width` bytes, ERANGE if the result would
+ * overflow, or any other error from LMDB.
+ */
+static int incr_c(MDB_cursor *curs, MDB_val *key, int64_t delta, int width,
+                  int is_signed, int big_endian, uint64_t *result)
+{
+    unsigned char buf[8];
+    unsigned int flags;
+    MDB_val val;
+    uint64_t v = 0;
+    int rc;
+
+    rc = mdb_dbi_flags(mdb_cursor_txn(curs), mdb_cursor_dbi(curs), &flags);
+    if(rc) {
+        return rc;
+    }
+    if(flags & MDB_DUPSORT) {
+        return MDB_INCOMPATIBLE;
+    }
+
+    rc = mdb_cursor_get(curs, key, &val, MDB_SET);
+    if(! rc) {
+        if(val.mv_size != (size_t) width) {
+            return MDB_BAD_VALSIZE;
+        }
+        v = incr_load(val.mv_data, width, is_signed, big_endian);
+    } else if(rc != MDB_NOTFOUND) {
+        return rc;
+    }
+    if(incr_add(&v, delta, width, is_signed)) {
+        return ERANGE;
+    }
+
+    incr_store(buf, v, width, big_endian);
+    val.mv_size = width;
+    val.mv_data = buf;
+    /* rc is MDB_NOTFOUND if the key must be created. */
+    rc = mdb_cursor_put(curs, key, &val, rc ? 0 : MDB_CURRENT);
+    if(! rc) {
+        *result = v;
+    }
+    return rc;
+}
+
+/**
+ * Apply incr_c() to each of `count` keys and deltas in turn using a new cursor
+ * on `dbi`, storing the new values in `results`.
+ *
+ * Doesn't allocate besides the cursor and may be called with the GIL
+ * released, provided the keys cannot be modified or freed meanwhile. Returns
+ * 0 or the first error, with `*done` set to the index of the failing key.
+ */
+static int incr_many_c(MDB_txn *txn, MDB_dbi dbi, MDB_val *keys,
+                       int64_t *deltas, size_t count, int width,
+                       int is_signed, int big_endian, uint64_t *results,
+                       size_t *done)
+{
+    MDB_cursor *curs;
+    size_t i = 0;
+    int rc;
+
+    if(! (rc = mdb_cursor_open(txn, dbi, &curs))) {
+        for(; i < count; i++) {
+            rc = incr_c(curs, keys + i, deltas[i], width, is_signed,
+                        big_endian, results + i);
+            if(rc) {
+                break;
+            }
+        }
+        mdb_cursor_close(curs);
+    }
+    *done = i;
+    return rc;
+}
+
+#endif /* !LMDB_INCR_H */
@@ -0,0 +1,122 @@
+/*
+ * Copyright 2013 The py-lmdb authors, all rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted only as authorized by the OpenLDAP
+ * Public License.
+ *
+ * A copy of this license is available in the file LICENSE in the
+ * top-level directory of the distribution or, alternatively, at
+ * <http://www.OpenLDAP.org/license.html>.
+ *
+ * OpenLDAP is a registered trademark of the OpenLDAP Foundation.
+ *
+ * Individual files and/or contributed packages may be copyright by
+ * other parties and/or subject to additional restrictions.
+ *
+ * This work also contains materials derived from public sources.
+ *
+ * Additional information about OpenLDAP can be obtained at
+ * <http://www.openldap.org/>.
+ */
+
+#ifndef LMDB_ITERBATCH_H
+#define LMDB_ITERBATCH_H
+
+#include <string.h>
+
+#include "preload.h"
+
+/**
+ * Returned by iter_batch_c() when the cursor reaches a key outside its
+ * iter_bound. Does not collide with any LMDB error code.
+ */
+#define ITER_BOUND_REACHED (-1)
+
+/**
+ * Describes where a bounded iteration ends.
+ */
+struct iter_bound {
+    /** Iteration ends on reaching a key beyond `stop`, in the direction of
+     * travel. */
+    MDB_val stop;
+    /** If nonzero, a key equal to `stop` is within the bound. */
+    int inclusive;
+    /** If nonzero, `stop` is instead a prefix that every key within the
+     * bound must begin with, and `inclusive` is ignored. */
+    int prefix;
+    /** Number of bytes to remove from the start of each key collected. */
+    size_t strip;
+};
+
+/**
+ * Return nonzero if `key` lies beyond `bound` when moving using `op`, using
+ * the database's own comparison function.
+ */
+static int iter_beyond(MDB_cursor *curs, MDB_cursor_op op, MDB_val *key,
+                       struct iter_bound *bound)
+{
+    int cmp;
+
+    if(bound->prefix) {
+        return key->mv_size < bound->stop.mv_size ||
+               memcmp(key->mv_data, bound->stop.mv_data, bound->stop.mv_size);
+    }
+    cmp = mdb_cmp(mdb_cursor_txn(curs), mdb_cursor_dbi(curs),
+                  key, &bound->stop);
+    if(op == MDB_PREV || op == MDB_PREV_DUP || op == MDB_PREV_NODUP) {
+        cmp = -cmp;
+    }
+    return cmp > 0 || (cmp == 0 && !bound->inclusive);
+}
+
+/**
+ * Collect up to `batch` records into `keys` and `vals`, starting with the
+ * record `key` and `val` at which `curs` is positioned, or the one following
+ * it if `advance` is nonzero, and moving to each subsequent record using `op`.
+ * If `bound` is not NULL, collection ends at the first key beyond it, and
+ * collected keys are stripped as it describes. If `keys` is NULL, records are
+ * only counted.
+ *
+ * Must be called with the GIL released. Stores the number of records
+ * collected in `*count` and returns 0 if the batch was filled, leaving `curs`
+ * on the final record collected. Otherwise returns ITER_BOUND_REACHED with
+ * `curs` on the first key beyond `bound`, or the MDB_cursor_get() result that
+ * ended the batch early.
+ */
+static int iter_batch_c(MDB_cursor *curs, MDB_cursor_op op, int advance,
+                        MDB_val *key, MDB_val *val, MDB_val *keys,
+                        MDB_val *vals, size_t batch,
+                        struct iter_bound *bound, size_t *count)
+{
+    int mode = preload_mode(mdb_txn_env(mdb_cursor_txn(curs)));
+    size_t n = 0;
+    int rc = 0;
+
+    if(advance) {
+        rc = mdb_cursor_get(curs, key, val, op);
+    }
+    while(! rc) {
+        if(bound && iter_beyond(curs, op, key, bound)) {
+            rc = ITER_BOUND_REACHED;
+            break;
+        }
+        if(keys) {
+            preload(mode, rc, val->mv_data, val->mv_size);
+            keys[n] = *key;
+            vals[n] = *val;
+            if(bound && bound->strip) {
+                keys[n].mv_data = (char *)key->mv_data + bound->strip;
+                keys[n].mv_size -= bound->strip;
+            }
+        }
+        if(++n == batch) {
+            break;
+        }
+        rc = mdb_cursor_get(curs, key, val, op);
+    }
+    *count = n;
+    return rc;
+}
+
+#endif /* !LMDB_ITERBATCH_H */
@@ -0,0 +1,108 @@
+/*
+ * Copyright 2013 The py-lmdb authors, all rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted only as authorized by the OpenLDAP
+ * Public License.
+ *
+ * A copy of this license is available in the file LICENSE in the
+ * top-level directory of the distribution or, alternatively, at
+ * <http://www.OpenLDAP.org/license.html>.
+ *
+ * OpenLDAP is a registered trademark of the OpenLDAP Foundation.
+ *
+ * Individual files and/or contributed packages may be copyright by
+ * other parties and/or subject to additional restrictions.
+ *
+ * This work also contains materials derived from public sources.
+ *
+ * Additional information about OpenLDAP can be obtained at
+ * <http://www.openldap.org/>.
+ */
+
+#ifndef LMDB_PREFETCH_H
+#define LMDB_PREFETCH_H
+
+#include "iterbatch.h"
+#include "preload.h"
+
+/**
+ * Ask the kernel to read ahead the pages spanning `lo` to `hi`, adding their
+ * number to `*pages`.
+ */
+static void prefetch_advise(uintptr_t lo, uintptr_t hi, size_t *pages)
+{
+    size_t page_size = preload_page_size();
+    size_t len;
+
+    if(hi <= lo) {
+        return;
+    }
+    lo &= ~(uintptr_t) (page_size - 1);
+    len = ((hi - lo) + page_size - 1) & ~(page_size - 1);
+#if !defined(_WIN32) && defined(MADV_WILLNEED)
+    madvise((void *) lo, len, MADV_WILLNEED);
+#endif
+    *pages += len / page_size;
+}
+
+/**
+ * Walk the records from the current position of `curs`, described by `key`
+ * and `val`, until reaching a key beyond `bound` if it is not NULL, or the
+ * end of the database, warming the pages that hold them. The walk itself
+ * faults in the branch and leaf pages covering the range. If `overflow` is
+ * nonzero, values stored outside their leaf page, on overflow pages, are not
+ * read but requested from the kernel with madvise(MADV_WILLNEED), so that
+ * they are read in parallel, in the background. Adjacent requests are merged.
+ *
+ * Doesn't allocate and may be called with the GIL released. Adds the number
+ * of leaf and overflow pages warmed to `*pages`, counted in system pages.
+ * Returns 0 at the end of the range, MDB_NOTFOUND at the end of the
+ * database, otherwise the mdb error.
+ */
+static int prefetch_c(MDB_cursor *curs, MDB_val *key, MDB_val *val,
+                      struct iter_bound *bound, int overflow, size_t *pages)
+{
+    uintptr_t mask = ~(uintptr_t) (preload_page_size() - 1);
+    uintptr_t leaf = 0;
+    uintptr_t lo = 0;
+    uintptr_t hi = 0;
+    unsigned int flags;
+    int rc;
+
+    rc = mdb_dbi_flags(mdb_cursor_txn(curs), mdb_cursor_dbi(curs), &flags);
+    if(rc) {
+        return rc;
+    }
+    /* Duplicates are never on overflow pages, and the walk reads them. */
+    if(flags & MDB_DUPSORT) {
+        overflow = 0;
+    }
+
+    while(! (bound && iter_beyond(curs, MDB_NEXT, key, bound))) {
+        uintptr_t page = (uintptr_t) key->mv_data & mask;
+        if(page != leaf) {
+            leaf = page;
+            (*pages)++;
+        }
+        if(overflow && val->mv_size &&
+           ((uintptr_t) val->mv_data & mask) != leaf) {
+            uintptr_t start = (uintptr_t) val->mv_data;
+            uintptr_t end = start + val->mv_size;
+            if((start & mask) >= (lo & mask) && start <= hi + ~mask + 1) {
+                hi = (end > hi) ? end : hi;
+            } else {
+                prefetch_advise(lo, hi, pages);
+                lo = start;
+                hi = end;
+            }
+        }
+        if((rc = mdb_cursor_get(curs, key, val, MDB_NEXT))) {
+            break;
+        }
+    }
+    prefetch_advise(lo, hi, pages);
+    return rc;
+}
+
+#endif /* !LMDB_PREFETCH_H */
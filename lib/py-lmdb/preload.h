@@ -23,26 +23,157 @@
 #ifndef LMDB_PRELOAD_H
 #define LMDB_PRELOAD_H
 
+#include <errno.h>
+#include <stddef.h>
+#include <stdint.h>
+
+#ifdef _WIN32
+#include <windows.h> /* GetSystemInfo() */
+#else
+#include <sys/mman.h>
+#include <unistd.h>
+#endif
+
+/**
+ * How preload() faults in a value, set per environment by preload_set_mode().
+ */
+enum preload_mode {
+    /** Ask the kernel for the whole value at once, then touch each page. */
+    PRELOAD_MADVISE,
+    /** Touch each page in turn. */
+    PRELOAD_TOUCH,
+    /** Do nothing; the value faults in as it is copied. */
+    PRELOAD_NONE
+};
+
 /**
- * Touch a byte from every page in `x`, causing any read faults necessary for
- * copying the value to occur. This should be called with the GIL released, in
- * order to dramatically decrease the chances of a page fault being taken with
- * the GIL held.
+ * Values spanning fewer pages are touched rather than advised, as touching
+ * a resident page costs far less than a system call.
+ */
+#define PRELOAD_ADVISE_MIN 4
+
+/**
+ * Store `mode` as `env`'s user context, where preload_mode() finds it given
+ * only a transaction or cursor. An environment whose mode was never set uses
+ * PRELOAD_MADVISE.
+ */
+static int preload_set_mode(MDB_env *env, int mode) {
+    return mdb_env_set_userctx(env, (void *) (intptr_t) mode);
+}
+
+/** Return the enum preload_mode set for `env`. */
+static int preload_mode(MDB_env *env) {
+    return (int) (intptr_t) mdb_env_get_userctx(env);
+}
+
+/** Return the system page size. */
+static size_t preload_page_size(void) {
+    static size_t page_size;
+
+    if(! page_size) {
+#ifdef _WIN32
+        SYSTEM_INFO info;
+        GetSystemInfo(&info);
+        page_size = info.dwPageSize;
+#else
+        long sz = sysconf(_SC_PAGESIZE);
+        page_size = (sz > 0) ? (size_t) sz : 4096;
+#endif
+    }
+    return page_size;
+}
+
+/**
+ * Fault in the value `x` as `mode` describes, so that copying it will not
+ * fault. This should be called with the GIL released, in order to
+ * dramatically decrease the chances of a page fault being taken with the GIL
+ * held.
  *
  * We do this since PyMalloc cannot be invoked with the GIL released, and we
  * cannot know the size of the MDB result value before dropping the GIL. This
  * seems the simplest and cheapest compromise to ensuring multithreaded Python
  * apps don't hard stall when dealing with a database larger than RAM.
+ *
+ * With PRELOAD_MADVISE, a value spanning several pages is requested with one
+ * madvise(MADV_POPULATE_READ) where the kernel supports it (Linux 5.14),
+ * otherwise madvise(MADV_WILLNEED) starts readahead of every page at once
+ * before each page is touched, so cold pages are read in parallel rather than
+ * one fault at a time.
+ */
+static void preload(int mode, int rc, void *x, size_t size) {
+    size_t page_size;
+    uintptr_t p;
+    uintptr_t end;
+    volatile char j;
+
+    if(rc || (! size) || mode == PRELOAD_NONE) {
+        return;
+    }
+    page_size = preload_page_size();
+    p = (uintptr_t) x;
+    end = p + size;
+
+#ifndef _WIN32
+    if(mode == PRELOAD_MADVISE && size >= PRELOAD_ADVISE_MIN * page_size) {
+        void *start = (void *) (p & ~(uintptr_t) (page_size - 1));
+        size_t len = end - (uintptr_t) start;
+#ifdef MADV_POPULATE_READ
+        /* Set once the running kernel is found to lack MADV_POPULATE_READ. */
+        static int no_populate;
+        if(! no_populate) {
+            if(! madvise(start, len, MADV_POPULATE_READ)) {
+                return;
+            }
+            if(errno == EINVAL) {
+                no_populate = 1;
+            }
+        }
+#endif
+#ifdef MADV_WILLNEED
+        madvise(start, len, MADV_WILLNEED);
+#endif
+    }
+#endif
+
+    while(p < end) {
+        j = *(volatile char *) p;
+        p = (p + page_size) & ~(uintptr_t) (page_size - 1);
+    }
+    (void) j; /* -Wunused-variable */
+}
+
+/** Largest number of pages preload_resident() checks. */
+#define PRELOAD_RESIDENT_MAX 64
+
+/**
+ * Return 1 if every page spanned by `x` is resident in memory, so that
+ * copying it will not fault, or 0 if any is not, if the span is longer than
+ * PRELOAD_RESIDENT_MAX pages, or if residency cannot be determined. Costs one
+ * mincore() call.
  */
-static void preload(int rc, void *x, size_t size) {
-    if(rc == 0) {
-        volatile char j;
-        int i;
-        for(i = 0; i < size; i += 4096) {
-            j = ((volatile char *)x)[i];
+static int preload_resident(void *x, size_t size) {
+#ifdef _WIN32
+    return 0;
+#else
+    uintptr_t page_size = preload_page_size();
+    unsigned char vec[PRELOAD_RESIDENT_MAX];
+    uintptr_t start;
+    size_t pages;
+    size_t i;
+
+    start = (uintptr_t) x & ~(page_size - 1);
+    pages = (((uintptr_t) x + size - start) + page_size - 1) / page_size;
+    if(pages > PRELOAD_RESIDENT_MAX || mincore((void *) start,
+            pages * page_size, (void *) vec)) {
+        return 0;
+    }
+    for(i = 0; i < pages; i++) {
+        if(! (vec[i] & 1)) {
+            return 0;
         }
-        (void) j; /* -Wunused-variable */
     }
+    return 1;
+#endif
 }
 
 #endif /* !LMDB_PRELOAD_H */
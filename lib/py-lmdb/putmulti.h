@@ -0,0 +1,142 @@
+/*
+ * Copyright 2013 The py-lmdb authors, all rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted only as authorized by the OpenLDAP
+ * Public License.
+ *
+ * A copy of this license is available in the file LICENSE in the
+ * top-level directory of the distribution or, alternatively, at
+ * <http://www.OpenLDAP.org/license.html>.
+ *
+ * OpenLDAP is a registered trademark of the OpenLDAP Foundation.
+ *
+ * Individual files and/or contributed packages may be copyright by
+ * other parties and/or subject to additional restrictions.
+ *
+ * This work also contains materials derived from public sources.
+ *
+ * Additional information about OpenLDAP can be obtained at
+ * <http://www.openldap.org/>.
+ */
+
+#ifndef LMDB_PUTMULTI_H
+#define LMDB_PUTMULTI_H
+
+/** Records collected from Python objects before each call to putmulti_c(),
+ * bounding the memory used while consuming an iterable. */
+#define PUTMULTI_CHUNK 1024
+
+/**
+ * Store `count` records using `curs` and `flags`. If `keys` is not NULL,
+ * record `i` has the key `keys[i]` and value `vals[i]`, otherwise records are
+ * read from `buf`, each a key of `key_size` bytes followed by a value of
+ * `val_size` bytes.
+ *
+ * Doesn't allocate and may be called with the GIL released, provided the
+ * records cannot be modified or freed meanwhile. Returns 0 on success,
+ * otherwise the first error other than MDB_KEYEXIST, with `*done` set to the
+ * index of the failing record. `*added` is set to the number of records
+ * stored.
+ */
+static int putmulti_c(MDB_cursor *curs, MDB_val *keys, MDB_val *vals,
+                      char *buf, size_t key_size, size_t val_size,
+                      size_t count, unsigned int flags, size_t *done,
+                      size_t *added)
+{
+    MDB_val key = {key_size, NULL};
+    MDB_val val = {val_size, NULL};
+    size_t i;
+    int rc = 0;
+
+    *added = 0;
+    for(i = 0; i < count; i++) {
+        if(keys) {
+            rc = mdb_cursor_put(curs, keys + i, vals + i, flags);
+        } else {
+            /* MDB_KEYEXIST points `val` at the existing value. */
+            key.mv_size = key_size;
+            key.mv_data = buf;
+            val.mv_size = val_size;
+            val.mv_data = buf + key_size;
+            buf += key_size + val_size;
+            rc = mdb_cursor_put(curs, &key, &val, flags);
+        }
+        if(! rc) {
+            (*added)++;
+        } else if(rc != MDB_KEYEXIST) {
+            break;
+        }
+    }
+    *done = i;
+    return (rc == MDB_KEYEXIST) ? 0 : rc;
+}
+
+/**
+ * Return in `*count` the number of values of `key`, which is 0 if it does
+ * not exist, leaving `curs` positioned on it.
+ */
+static int putmulti_dup_count(MDB_cursor *curs, MDB_val *key, size_t *count)
+{
+    MDB_val val;
+    int rc;
+
+    *count = 0;
+    rc = mdb_cursor_get(curs, key, &val, MDB_SET);
+    if(! rc) {
+        rc = mdb_cursor_count(curs, count);
+    }
+    return (rc == MDB_NOTFOUND) ? 0 : rc;
+}
+
+/**
+ * Store the `count` values of `item_size` bytes packed in `buf` as duplicates
+ * of `key` using MDB_MULTIPLE, which requires a dupfixed=True database.
+ *
+ * MDB_MULTIPLE may stop at a value that already exists, so each such value is
+ * skipped and the remainder stored by a further call. The count of values it
+ * reports includes existing values, so the number added is found by counting
+ * the key's values before and after.
+ *
+ * Doesn't allocate and may be called with the GIL released. Returns 0 or the
+ * first error other than MDB_KEYEXIST, with `*added` set to the number of
+ * values added.
+ */
+static int putmulti_dup_c(MDB_cursor *curs, MDB_val *key, char *buf,
+                          size_t item_size, size_t count, size_t *added)
+{
+    MDB_val data[2];
+    size_t before;
+    size_t after;
+    size_t done;
+    int rc;
+
+    *added = 0;
+    if((rc = putmulti_dup_count(curs, key, &before))) {
+        return rc;
+    }
+    while(count) {
+        data[0].mv_size = item_size;
+        data[0].mv_data = buf;
+        data[1].mv_size = count;
+        data[1].mv_data = NULL;
+        rc = mdb_cursor_put(curs, key, data, MDB_MULTIPLE);
+        if(rc && rc != MDB_KEYEXIST) {
+            break;
+        }
+        rc = 0;
+        /* Skip the existing value MDB_MULTIPLE stopped at, if any. */
+        done = data[1].mv_size + 1;
+        if(done > count) {
+            break;
+        }
+        buf += done * item_size;
+        count -= done;
+    }
+    if(! putmulti_dup_count(curs, key, &after)) {
+        *added = after - before;
+    }
+    return rc;
+}
+
+#endif /* !LMDB_PUTMULTI_H */
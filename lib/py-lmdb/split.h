@@ -0,0 +1,801 @@
+/*
+ * Copyright 2013 The py-lmdb authors, all rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted only as authorized by the OpenLDAP
+ * Public License.
+ *
+ * A copy of this license is available in the file LICENSE in the
+ * top-level directory of the distribution or, alternatively, at
+ * <http://www.OpenLDAP.org/license.html>.
+ *
+ * OpenLDAP is a registered trademark of the OpenLDAP Foundation.
+ *
+ * Individual files and/or contributed packages may be copyright by
+ * other parties and/or subject to additional restrictions.
+ *
+ * This work also contains materials derived from public sources.
+ *
+ * Additional information about OpenLDAP can be obtained at
+ * <http://www.openldap.org/>.
+ */
+
+#ifndef LMDB_SPLIT_H
+#define LMDB_SPLIT_H
+
+#include <errno.h>
+#include <math.h>
+#include <stdint.h>
+#include <stdlib.h>
+#include <string.h>
+
+/*
+ * LMDB doesn't expose page positions, so split_c() can't read split keys
+ * from branch pages. Instead the database is treated as a sequence of
+ * segments, each beginning with a real key, and the number of records in a
+ * segment is found by seeking into it with MDB_SET_RANGE at keys
+ * interpolated between its first and last keys, then counting a few keys
+ * from each. Segments holding too many records are divided again, so
+ * clusters of similar keys are examined more closely. Only a bounded number
+ * of seeks are made, regardless of the size of the database.
+ */
+
+/** Number of pieces a segment is divided into by interpolated probes. */
+#define SPLIT_FANOUT 16
+
+/** Keys counted from the start of each piece before its number of records
+ * is estimated from their density instead. */
+#define SPLIT_SAMPLE 32
+
+/** Segments estimate_c() may divide, bounding its cost to roughly
+ * ESTIMATE_BUDGET * SPLIT_FANOUT seeks. */
+#define ESTIMATE_BUDGET 32
+
+/** Fraction of the database above which estimate_c() divides segments not
+ * holding either bound, while its budget allows. */
+#define ESTIMATE_PARTS 64
+
+/** Records counted from the start of a range before it is estimated. */
+#define ESTIMATE_EXACT (SPLIT_FANOUT * SPLIT_SAMPLE)
+
+/** Bytes following a segment's common prefix that form the coordinate keys
+ * are interpolated by. Small enough to be represented exactly by a double. */
+#define SPLIT_WIDTH 6
+
+/**
+ * A run of keys beginning with `lo` and ending before the following
+ * segment's `lo`, or at the end of the database.
+ */
+struct split_seg {
+    MDB_val lo;
+    /** Records in the segment if `exact` is set, otherwise an estimate
+     * that is only meaningful relative to those of other segments. */
+    double mass;
+    /** Records counted from `lo`, a lower bound for `mass`. */
+    double counted;
+    /** `mass`, scaled with those of every other estimated segment so the
+     * total is the number of records in the database. */
+    double share;
+    /** If nonzero, `mass` was counted, and the segment holds no more than
+     * SPLIT_SAMPLE keys. */
+    int exact;
+    /** If positive, the segment can't usefully be divided further. While
+     * split_model() chooses segments to divide, -1 marks one holding a key
+     * whose rank is wanted. */
+    int done;
+};
+
+struct split_ctx {
+    MDB_cursor *curs;
+    MDB_txn *txn;
+    MDB_dbi dbi;
+    unsigned int flags;
+    /** MDB_NEXT_NODUP for dupsort databases, so each key is visited once. */
+    MDB_cursor_op next;
+    /** Last key in the database. */
+    MDB_val last;
+    /** Storage for interpolated keys. */
+    unsigned char *buf;
+};
+
+/**
+ * Describes how keys of a segment map to coordinates: `width` bytes
+ * following the `prefix` bytes shared by its first and last keys, read in
+ * the database's key order.
+ */
+struct split_frame {
+    size_t prefix;
+    size_t width;
+};
+
+/**
+ * Return byte `i` of `key`, counting from the end for MDB_REVERSEKEY, or 0
+ * beyond the end of the key.
+ */
+static unsigned char split_byte(struct split_ctx *ctx, const MDB_val *key,
+                                size_t i)
+{
+    const unsigned char *p = key->mv_data;
+
+    if(i >= key->mv_size) {
+        return 0;
+    }
+    return p[(ctx->flags & MDB_REVERSEKEY) ? key->mv_size - 1 - i : i];
+}
+
+static void split_frame_init(struct split_ctx *ctx, struct split_frame *fr,
+                             const MDB_val *lo, const MDB_val *hi)
+{
+    size_t max = mdb_env_get_maxkeysize(mdb_txn_env(ctx->txn));
+    size_t len = lo->mv_size < hi->mv_size ? lo->mv_size : hi->mv_size;
+
+    for(fr->prefix = 0; fr->prefix < len; fr->prefix++) {
+        if(split_byte(ctx, lo, fr->prefix) != split_byte(ctx, hi, fr->prefix)) {
+            break;
+        }
+    }
+    fr->width = max - fr->prefix;
+    if(fr->width > SPLIT_WIDTH) {
+        fr->width = SPLIT_WIDTH;
+    }
+}
+
+static double split_coord(struct split_ctx *ctx, struct split_frame *fr,
+                          const MDB_val *key)
+{
+    double x = 0;
+    size_t i;
+
+    if(ctx->flags & MDB_INTEGERKEY) {
+        if(key->mv_size == sizeof(unsigned int)) {
+            unsigned int u;
+            memcpy(&u, key->mv_data, sizeof u);
+            return (double) u;
+        } else if(key->mv_size == sizeof(size_t)) {
+            size_t u;
+            memcpy(&u, key->mv_data, sizeof u);
+            return (double) u;
+        }
+    }
+    for(i = 0; i < fr->width; i++) {
+        x = (x * 256) + split_byte(ctx, key, fr->prefix + i);
+    }
+    return x;
+}
+
+/**
+ * Set `probe` to the key at coordinate `x` within the segment beginning
+ * with `lo`.
+ */
+static void split_probe(struct split_ctx *ctx, struct split_frame *fr,
+                        const MDB_val *lo, double x, MDB_val *probe)
+{
+    uint64_t v = (uint64_t) x;
+    size_t size;
+    size_t i;
+
+    probe->mv_data = ctx->buf;
+    if((ctx->flags & MDB_INTEGERKEY) && lo->mv_size == sizeof(unsigned int)) {
+        unsigned int u = (unsigned int) v;
+        memcpy(ctx->buf, &u, sizeof u);
+        probe->mv_size = sizeof u;
+        return;
+    } else if((ctx->flags & MDB_INTEGERKEY) && lo->mv_size == sizeof(size_t)) {
+        size_t u = (size_t) v;
+        memcpy(ctx->buf, &u, sizeof u);
+        probe->mv_size = sizeof u;
+        return;
+    }
+
+    size = fr->prefix + fr->width;
+    for(i = 0; i < size; i++) {
+        unsigned char c;
+        if(i < fr->prefix) {
+            c = split_byte(ctx, lo, i);
+        } else {
+            c = (unsigned char) (v >> (8 * (size - 1 - i)));
+        }
+        ctx->buf[(ctx->flags & MDB_REVERSEKEY) ? size - 1 - i : i] = c;
+    }
+    probe->mv_size = size;
+}
+
+/**
+ * Store the number of records having the current key of `ctx->curs` in
+ * `*weight`.
+ */
+static int split_weight(struct split_ctx *ctx, double *weight)
+{
+    size_t dups = 1;
+    int rc = 0;
+
+    if(ctx->flags & MDB_DUPSORT) {
+        rc = mdb_cursor_count(ctx->curs, &dups);
+    }
+    *weight = (double) dups;
+    return rc;
+}
+
+/**
+ * Return nonzero if `rc` and `key`, the result of moving `ctx->curs`,
+ * indicate the cursor has left the segment ending before `hi`.
+ */
+static int split_past(struct split_ctx *ctx, int rc, MDB_val *key,
+                      const MDB_val *hi)
+{
+    return rc == MDB_NOTFOUND ||
+           (! rc && hi && mdb_cmp(ctx->txn, ctx->dbi, key, hi) >= 0);
+}
+
+/**
+ * Divide `seg`, which ends before `hi`, or at the end of the database if
+ * `hi` is NULL, into at most SPLIT_FANOUT segments stored in `out`, setting
+ * `*count` to their number.
+ */
+static int split_refine(struct split_ctx *ctx, struct split_seg *seg,
+                        const MDB_val *hi, struct split_seg *out,
+                        size_t *count)
+{
+    struct split_frame fr;
+    struct split_frame piece;
+    struct split_seg *sub;
+    MDB_val key;
+    MDB_val val;
+    MDB_val end;
+    MDB_val seen;
+    MDB_val probe;
+    double lo;
+    double span;
+    double x;
+    double w;
+    size_t keys;
+    size_t j = 1;
+    int have_probe;
+    int capped;
+    int done = 0;
+    int rc;
+
+    /* Interpolate between the first and last keys actually present. */
+    if(hi) {
+        key = *hi;
+        if((rc = mdb_cursor_get(ctx->curs, &key, &val, MDB_SET_KEY)) ||
+           (rc = mdb_cursor_get(ctx->curs, &key, &val, MDB_PREV))) {
+            return rc;
+        }
+        end = key;
+    } else {
+        end = ctx->last;
+    }
+    split_frame_init(ctx, &fr, &seg->lo, &end);
+    lo = split_coord(ctx, &fr, &seg->lo);
+    span = split_coord(ctx, &fr, &end) - lo;
+
+    key = seg->lo;
+    if((rc = mdb_cursor_get(ctx->curs, &key, &val, MDB_SET_KEY))) {
+        return rc;
+    }
+
+    for(*count = 0; ! done; ) {
+        sub = &out[(*count)++];
+        sub->lo = key;
+
+        /* Find the next probe beyond the current key. */
+        for(have_probe = 0; ! have_probe && j < SPLIT_FANOUT; j++) {
+            x = floor(lo + ((span + 1) * j / SPLIT_FANOUT));
+            if(x > lo + span) {
+                x = lo + span;
+            }
+            if(x > lo) {
+                split_probe(ctx, &fr, &seg->lo, x, &probe);
+                have_probe = mdb_cmp(ctx->txn, ctx->dbi, &probe, &key) > 0;
+            }
+        }
+
+        /* Count keys until reaching the probe, the end of the segment, or
+         * SPLIT_SAMPLE keys. */
+        sub->counted = 0;
+        capped = 0;
+        for(keys = 1; ; keys++) {
+            if((rc = split_weight(ctx, &w))) {
+                return rc;
+            }
+            sub->counted += w;
+            rc = mdb_cursor_get(ctx->curs, &key, &val, ctx->next);
+            if(split_past(ctx, rc, &key, hi)) {
+                done = 1;
+                break;
+            } else if(rc) {
+                return rc;
+            } else if(have_probe &&
+                      mdb_cmp(ctx->txn, ctx->dbi, &key, &probe) >= 0) {
+                break;
+            } else if(keys == SPLIT_SAMPLE) {
+                capped = 1;
+                break;
+            }
+        }
+
+        sub->exact = sub->done = ! capped;
+        sub->mass = sub->counted;
+        if(! capped) {
+            continue;
+        }
+
+        /* Extrapolate from the density of the keys counted, measured in the
+         * piece's own frame, which resolves its keys more finely. */
+        seen = key;
+        if(have_probe) {
+            key = probe;
+            rc = mdb_cursor_get(ctx->curs, &key, &val, MDB_SET_RANGE);
+            if(split_past(ctx, rc, &key, hi)) {
+                done = 1;
+            } else if(rc) {
+                return rc;
+            }
+        } else {
+            done = 1;
+        }
+        split_frame_init(ctx, &piece, &sub->lo, done ? &end : &key);
+        x = split_coord(ctx, &piece, &sub->lo);
+        w = split_coord(ctx, &piece, done ? &end : &key) - x + done;
+        x = split_coord(ctx, &piece, &seen) - x;
+        sub->mass *= w / (x > 1 ? x : 1);
+    }
+
+    if(*count == 1) {
+        out[0].done = 1;
+    }
+    return 0;
+}
+
+/**
+ * Set the `share` of each of `segs`, given the database holds `entries`
+ * records. Estimates are scaled together rather than each piece's being
+ * scaled to its parent's, so an estimate made early with a coarse view of
+ * the database doesn't limit those made later by dividing it.
+ */
+static void split_share(struct split_seg *segs, size_t nsegs, size_t entries)
+{
+    double known = 0;
+    double guess = 0;
+    double scale = 0;
+    size_t i;
+
+    for(i = 0; i < nsegs; i++) {
+        if(segs[i].exact) {
+            known += segs[i].mass;
+        } else {
+            guess += segs[i].mass;
+        }
+    }
+    if(guess > 0 && entries > known) {
+        scale = (entries - known) / guess;
+    }
+    for(i = 0; i < nsegs; i++) {
+        segs[i].share = segs[i].mass * (segs[i].exact ? 1 : scale);
+        if(segs[i].share < segs[i].counted) {
+            segs[i].share = segs[i].counted;
+        }
+    }
+}
+
+static int split_cmp_share(const void *a, const void *b)
+{
+    double x = *(const double *)a;
+    double y = *(const double *)b;
+    return (x < y) - (x > y);
+}
+
+/**
+ * Return the share above which segments of `segs` should be divided, so
+ * that no more than `budget` are, largest first.
+ */
+static int split_limit(struct split_seg *segs, size_t nsegs, size_t budget,
+                       double *limit)
+{
+    double *shares;
+    size_t count = 0;
+    size_t i;
+
+    for(i = 0; i < nsegs; i++) {
+        count += ! segs[i].done && segs[i].share > *limit;
+    }
+    if(count <= budget) {
+        return 0;
+    }
+    if(! ((shares = malloc(sizeof *shares * count)))) {
+        return ENOMEM;
+    }
+    for(count = 0, i = 0; i < nsegs; i++) {
+        if(! segs[i].done && segs[i].share > *limit) {
+            shares[count++] = segs[i].share;
+        }
+    }
+    qsort(shares, count, sizeof *shares, split_cmp_share);
+    *limit = shares[budget];
+    if(*limit == shares[budget - 1]) {
+        /* Admit every tie, leaving the caller to stop at `budget`. */
+        *limit = nextafter(*limit, 0);
+    }
+    free(shares);
+    return 0;
+}
+
+/**
+ * Set `*key` to the key holding record `offset` of the exact segment `seg`.
+ */
+static int split_walk(struct split_ctx *ctx, struct split_seg *seg,
+                      double offset, MDB_val *key)
+{
+    MDB_val val;
+    double w;
+    int rc;
+
+    *key = seg->lo;
+    rc = mdb_cursor_get(ctx->curs, key, &val, MDB_SET_KEY);
+    while(! rc) {
+        if((rc = split_weight(ctx, &w)) || offset < w) {
+            break;
+        }
+        offset -= w;
+        rc = mdb_cursor_get(ctx->curs, key, &val, ctx->next);
+    }
+    return rc;
+}
+
+/**
+ * Prepare `ctx` for examining the database of `curs`, storing its first key
+ * in `*first`. Returns MDB_NOTFOUND if the database is empty.
+ */
+static int split_init(struct split_ctx *ctx, MDB_cursor *curs, MDB_val *first)
+{
+    MDB_val val;
+    int rc;
+
+    ctx->curs = curs;
+    ctx->txn = mdb_cursor_txn(curs);
+    ctx->dbi = mdb_cursor_dbi(curs);
+    ctx->buf = NULL;
+    if((rc = mdb_dbi_flags(ctx->txn, ctx->dbi, &ctx->flags))) {
+        return rc;
+    }
+    ctx->next = (ctx->flags & MDB_DUPSORT) ? MDB_NEXT_NODUP : MDB_NEXT;
+    if((rc = mdb_cursor_get(curs, &ctx->last, &val, MDB_LAST)) ||
+       (rc = mdb_cursor_get(curs, first, &val, MDB_FIRST))) {
+        return rc;
+    }
+    ctx->buf = malloc(mdb_env_get_maxkeysize(mdb_txn_env(ctx->txn)) +
+                      sizeof(size_t));
+    return ctx->buf ? 0 : ENOMEM;
+}
+
+/**
+ * Return the index of the last of `segs` beginning at or before `key`, or
+ * `nsegs` if `key` is before the first.
+ */
+static size_t split_find(struct split_ctx *ctx, struct split_seg *segs,
+                         size_t nsegs, const MDB_val *key)
+{
+    size_t i = nsegs;
+
+    while(i && mdb_cmp(ctx->txn, ctx->dbi, &segs[i - 1].lo, key) > 0) {
+        i--;
+    }
+    return i ? i - 1 : nsegs;
+}
+
+/**
+ * Divide the database beginning with `first`, which holds `entries`
+ * records, into segments stored in a new array `*segsp` of `*nsegsp`
+ * elements. The largest segments are divided until none holds more than
+ * `goal` records or `budget` segments have been divided, but those holding
+ * any of the `nkeys` keys in `keys` are always divided first.
+ */
+static int split_model(struct split_ctx *ctx, const MDB_val *first,
+                       size_t entries, size_t budget, double goal,
+                       const MDB_val *keys, size_t nkeys,
+                       struct split_seg **segsp, size_t *nsegsp)
+{
+    struct split_seg *segs;
+    struct split_seg *next;
+    size_t nsegs = 1;
+    size_t bound;
+    size_t grow;
+    size_t used;
+    size_t want;
+    size_t k;
+    size_t i;
+    double limit;
+    int rc = 0;
+
+    if(! ((segs = malloc(sizeof *segs)))) {
+        return ENOMEM;
+    }
+    segs[0].lo = *first;
+    segs[0].mass = (double) entries;
+    segs[0].counted = 0;
+    segs[0].exact = segs[0].done = 0;
+
+    /* Repeatedly divide the largest segments, within a fixed budget. */
+    for(;;) {
+        split_share(segs, nsegs, entries);
+        for(k = 0; k < nkeys; k++) {
+            i = split_find(ctx, segs, nsegs, &keys[k]);
+            if(i < nsegs && ! segs[i].done) {
+                segs[i].done = -1;
+            }
+        }
+        for(bound = 0, i = 0; i < nsegs; i++) {
+            bound += segs[i].done < 0;
+        }
+        if(bound > budget) {
+            bound = budget;
+        }
+        limit = goal;
+        if(budget > bound) {
+            if((rc = split_limit(segs, nsegs, budget - bound, &limit))) {
+                break;
+            }
+        } else {
+            limit = HUGE_VAL;
+        }
+        for(grow = bound, i = 0; i < nsegs; i++) {
+            grow += ! segs[i].done && segs[i].share > limit;
+        }
+        if(grow > budget) {
+            grow = budget;
+        }
+        if(! grow) {
+            break;
+        }
+        next = malloc(sizeof *next * (nsegs + (grow * (SPLIT_FANOUT - 1))));
+        if(! next) {
+            rc = ENOMEM;
+            break;
+        }
+        for(used = 0, i = 0; i < nsegs; i++) {
+            if(segs[i].done < 0) {
+                want = bound > 0;
+                bound -= want;
+                segs[i].done = 0;
+            } else {
+                want = ! segs[i].done && segs[i].share > limit && grow > bound;
+            }
+            if(want && grow) {
+                rc = split_refine(ctx, &segs[i],
+                                  (i + 1 < nsegs) ? &segs[i + 1].lo : NULL,
+                                  &next[used], &k);
+                if(rc) {
+                    break;
+                }
+                used += k;
+                grow--;
+                budget--;
+            } else {
+                next[used++] = segs[i];
+            }
+        }
+        if(rc) {
+            free(next);
+            break;
+        }
+        free(segs);
+        segs = next;
+        nsegs = used;
+    }
+
+    if(rc) {
+        free(segs);
+        return rc;
+    }
+    *segsp = segs;
+    *nsegsp = nsegs;
+    return 0;
+}
+
+/**
+ * Find up to `n - 1` keys dividing the database of `curs`, which holds
+ * `entries` records, into `n` ranges of roughly equal numbers of records,
+ * storing them in `points` and their number in `*count`. Keys are returned
+ * in order, none is repeated, and the database's first key is never
+ * returned. Ranges are exact if every segment examined could be counted.
+ *
+ * Allocates, and must be called with the GIL released. Returns 0 on
+ * success, otherwise an mdb error or ENOMEM.
+ */
+static int split_c(MDB_cursor *curs, size_t entries, size_t n,
+                   MDB_val *points, size_t *count)
+{
+    struct split_ctx ctx;
+    struct split_seg *segs = NULL;
+    size_t nsegs;
+    size_t k;
+    size_t i;
+    MDB_val key;
+    MDB_val prev;
+    double total;
+    double cum;
+    double target;
+    int rc;
+
+    *count = 0;
+    if((rc = split_init(&ctx, curs, &key)) ||
+       (rc = split_model(&ctx, &key, entries, (16 * n) + 64,
+                         (double) entries / (8.0 * n), NULL, 0,
+                         &segs, &nsegs))) {
+        goto out;
+    }
+
+    for(total = 0, i = 0; i < nsegs; i++) {
+        total += segs[i].share;
+    }
+    prev = segs[0].lo;
+    cum = 0;
+    for(i = 0, k = 1; k < n; k++) {
+        target = floor(total * k / n);
+        while((i + 1) < nsegs && (cum + segs[i].share) <= target) {
+            cum += segs[i++].share;
+        }
+        if(segs[i].exact) {
+            if((rc = split_walk(&ctx, &segs[i], target - cum, &key))) {
+                goto out;
+            }
+        } else if((i + 1) < nsegs && (target - cum) >= (segs[i].share / 2)) {
+            key = segs[i + 1].lo;
+        } else {
+            key = segs[i].lo;
+        }
+        /* Values of a dupsort database may repeat a key. */
+        if(mdb_cmp(ctx.txn, ctx.dbi, &key, &prev) > 0) {
+            points[(*count)++] = key;
+            prev = key;
+        }
+    }
+
+out:
+    free(segs);
+    free(ctx.buf);
+    return rc;
+}
+
+/**
+ * Store in `*rank` the estimated number of records of the database modelled
+ * by `segs` whose keys sort before `key`, or at or before it if `inclusive`.
+ * Within a segment that was counted, records are counted again; otherwise
+ * the segment's share is interpolated at the key's coordinate.
+ */
+static int estimate_rank(struct split_ctx *ctx, struct split_seg *segs,
+                         size_t nsegs, const MDB_val *key, int inclusive,
+                         double *rank)
+{
+    struct split_frame fr;
+    MDB_val cur;
+    MDB_val val;
+    MDB_val end;
+    double lo;
+    double span;
+    double w;
+    size_t c;
+    size_t i;
+    int cmp;
+    int rc;
+
+    *rank = 0;
+    if((c = split_find(ctx, segs, nsegs, key)) == nsegs) {
+        return 0;
+    }
+    for(i = 0; i < c; i++) {
+        *rank += segs[i].share;
+    }
+
+    if(segs[c].exact) {
+        cur = segs[c].lo;
+        rc = mdb_cursor_get(ctx->curs, &cur, &val, MDB_SET_KEY);
+        while(! rc) {
+            cmp = mdb_cmp(ctx->txn, ctx->dbi, &cur, key);
+            if(cmp > 0 || (cmp == 0 && ! inclusive)) {
+                break;
+            }
+            if((rc = split_weight(ctx, &w))) {
+                return rc;
+            }
+            *rank += w;
+            rc = mdb_cursor_get(ctx->curs, &cur, &val, ctx->next);
+        }
+        return rc == MDB_NOTFOUND ? 0 : rc;
+    }
+
+    end = (c + 1 < nsegs) ? segs[c + 1].lo : ctx->last;
+    split_frame_init(ctx, &fr, &segs[c].lo, &end);
+    lo = split_coord(ctx, &fr, &segs[c].lo);
+    span = split_coord(ctx, &fr, &end) - lo + (c + 1 == nsegs);
+    if(mdb_cmp(ctx->txn, ctx->dbi, key, &end) > 0) {
+        /* Beyond the last key, where coordinates aren't meaningful. */
+        *rank += segs[c].share;
+        return 0;
+    } else if(span > 0) {
+        w = (split_coord(ctx, &fr, key) - lo) / span;
+        *rank += segs[c].share * (w < 0 ? 0 : (w < 1 ? w : 1));
+    }
+    if(inclusive) {
+        cur = *key;
+        rc = mdb_cursor_get(ctx->curs, &cur, &val, MDB_SET_KEY);
+        if(! rc) {
+            if((rc = split_weight(ctx, &w))) {
+                return rc;
+            }
+            *rank += w;
+        } else if(rc != MDB_NOTFOUND) {
+            return rc;
+        }
+    }
+    return 0;
+}
+
+/**
+ * Estimate the number of records of the database of `curs`, which holds
+ * `entries` records, from `start` to `stop`, either of which may be NULL to
+ * mean the start or end of the database, storing it in `*result`. Only the
+ * segments holding `start` and `stop` are divided until they can be
+ * counted; the remaining budget improves estimates of the largest.
+ *
+ * Allocates, and must be called with the GIL released. Returns 0 on
+ * success, otherwise an mdb error or ENOMEM.
+ */
+static int estimate_c(MDB_cursor *curs, size_t entries, const MDB_val *start,
+                      int start_inclusive, const MDB_val *stop,
+                      int stop_inclusive, double *result)
+{
+    struct split_ctx ctx;
+    struct split_seg *segs = NULL;
+    MDB_val keys[2];
+    MDB_val first;
+    size_t nkeys = 0;
+    size_t nsegs;
+    size_t i;
+    double lo = 0;
+    double hi = 0;
+    double total = 0;
+    int rc;
+
+    *result = 0;
+    if(start) {
+        keys[nkeys++] = *start;
+    }
+    if(stop) {
+        keys[nkeys++] = *stop;
+    }
+    if((rc = split_init(&ctx, curs, &first))) {
+        goto out;
+    }
+    if((rc = split_model(&ctx, &first, entries, ESTIMATE_BUDGET,
+                         (double) entries / ESTIMATE_PARTS, keys, nkeys,
+                         &segs, &nsegs))) {
+        goto out;
+    }
+    if(start &&
+       (rc = estimate_rank(&ctx, segs, nsegs, start, ! start_inclusive, &lo))) {
+        goto out;
+    }
+    if(stop &&
+       (rc = estimate_rank(&ctx, segs, nsegs, stop, stop_inclusive, &hi))) {
+        goto out;
+    }
+    /* Shares may not sum exactly to `entries`, so scale ranks by it. */
+    for(i = 0; i < nsegs; i++) {
+        total += segs[i].share;
+    }
+    if(! stop) {
+        hi = total;
+    }
+    if(hi > lo) {
+        *result = floor(((hi - lo) * entries / total) + 0.5);
+    }
+
+out:
+    free(segs);
+    free(ctx.buf);
+    return rc == MDB_NOTFOUND ? 0 : rc;
+}
+
+#endif /* !LMDB_SPLIT_H */
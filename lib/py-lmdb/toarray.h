@@ -0,0 +1,66 @@
+/*
+ * Copyright 2013 The py-lmdb authors, all rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted only as authorized by the OpenLDAP
+ * Public License.
+ *
+ * A copy of this license is available in the file LICENSE in the
+ * top-level directory of the distribution or, alternatively, at
+ * <http://www.OpenLDAP.org/license.html>.
+ *
+ * OpenLDAP is a registered trademark of the OpenLDAP Foundation.
+ *
+ * Individual files and/or contributed packages may be copyright by
+ * other parties and/or subject to additional restrictions.
+ *
+ * This work also contains materials derived from public sources.
+ *
+ * Additional information about OpenLDAP can be obtained at
+ * <http://www.openldap.org/>.
+ */
+
+#ifndef LMDB_TOARRAY_H
+#define LMDB_TOARRAY_H
+
+#include <string.h>
+
+/**
+ * Copy up to `max` records into `out`, starting with the record `key` and
+ * `val` at which `curs` is positioned and advancing using MDB_NEXT. The first
+ * `key_size` bytes of each record are taken from the key and the following
+ * `val_size` bytes from the value; either may be 0 to skip that half. Each key
+ * and value copied must be exactly the expected size.
+ *
+ * Must be called with the GIL released. Stores the number of records copied
+ * in `*done` and returns the MDB_cursor_get() result that stopped the copy,
+ * or MDB_BAD_VALSIZE if a record was the wrong size. On return `curs`, `key`
+ * and `val` describe the first record not copied.
+ */
+static int to_array_c(MDB_cursor *curs, MDB_val *key, MDB_val *val,
+                      char *out, size_t key_size, size_t val_size,
+                      size_t max, size_t *done)
+{
+    size_t n = 0;
+    int rc = 0;
+
+    while(n < max) {
+        if((key_size && key->mv_size != key_size) ||
+           (val_size && val->mv_size != val_size)) {
+            rc = MDB_BAD_VALSIZE;
+            break;
+        }
+        memcpy(out, key->mv_data, key_size);
+        out += key_size;
+        memcpy(out, val->mv_data, val_size);
+        out += val_size;
+        n++;
+        if((rc = mdb_cursor_get(curs, key, val, MDB_NEXT))) {
+            break;
+        }
+    }
+    *done = n;
+    return rc;
+}
+
+#endif /* !LMDB_TOARRAY_H */
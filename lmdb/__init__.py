@@ -50,6 +50,9 @@ except ImportError:
     from lmdb.cffi import __all__
     from lmdb.cffi import __doc__
 
+from lmdb.batcher import WriteBatcher
+__all__ = __all__ + ['WriteBatcher']
+
 __version__ = '0.92'
 
 # Hack to support Python v2.5 'python -mlmdb'
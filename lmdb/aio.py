@@ -0,0 +1,312 @@
+#
+# Copyright 2013 The py-lmdb authors, all rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted only as authorized by the OpenLDAP
+# Public License.
+#
+# A copy of this license is available in the file LICENSE in the
+# top-level directory of the distribution or, alternatively, at
+# <http://www.OpenLDAP.org/license.html>.
+#
+# OpenLDAP is a registered trademark of the OpenLDAP Foundation.
+#
+# Individual files and/or contributed packages may be copyright by
+# other parties and/or subject to additional restrictions.
+#
+# This work also contains materials derived from public sources.
+#
+# Additional information about OpenLDAP can be obtained at
+# <http://www.openldap.org/>.
+#
+
+"""
+asyncio wrappers that keep LMDB calls off the event loop.
+
+Any LMDB call may block on a page fault, or on the write lock, so every call
+is made in a thread. Read transactions run in a bounded pool of reader
+threads, which is possible since :py:func:`lmdb.open` always uses
+``MDB_NOTLS``. A write transaction must be used only by the thread that began
+it, so all write transactions run on a single dedicated writer thread, one at
+a time.
+
+Each ``await`` costs a thread handoff, so prefer methods covering many
+records, such as :py:meth:`AsyncTransaction.getmulti`,
+:py:meth:`AsyncTransaction.putmulti`, batched cursor iteration, or
+:py:meth:`AsyncTransaction.run`.
+
+Requires Python 3.7.
+"""
+
+from __future__ import absolute_import
+import asyncio
+import concurrent.futures
+import functools
+
+import lmdb
+
+__all__ = ['AsyncEnvironment', 'AsyncTransaction', 'AsyncCursor']
+
+#: Default number of records fetched per thread handoff by cursor iterators.
+BATCH = 256
+
+
+class AsyncEnvironment(object):
+    """
+    Wrap an :py:class:`lmdb.Environment` for use from asyncio coroutines.
+
+        `env`:
+            Environment to wrap. It remains owned by the caller.
+
+        `max_workers`:
+            Size of the reader thread pool, limiting the number of
+            read calls that may run concurrently. Defaults to the
+            :py:class:`concurrent.futures.ThreadPoolExecutor` default.
+
+    ::
+
+        aenv = lmdb.aio.AsyncEnvironment(lmdb.open('/path/to/env'))
+        async with aenv.begin(write=True) as txn:
+            await txn.put(b'key', b'value')
+    """
+    def __init__(self, env, max_workers=None):
+        self.env = env
+        self._readers = concurrent.futures.ThreadPoolExecutor(max_workers)
+        self._writer = concurrent.futures.ThreadPoolExecutor(1)
+        # Created on first use, as asyncio.Lock binds to the running loop on
+        # older Pythons.
+        self._write_lock = None
+
+    def begin(self, db=None, write=False):
+        """Return an :py:class:`AsyncTransaction`, which begins when used as
+        an asynchronous context manager, or when awaited::
+
+            async with aenv.begin() as txn:
+                ...
+
+            txn = await aenv.begin(write=True)
+
+        Beginning a write transaction waits for any other write transaction
+        begun through this wrapper to finish."""
+        return AsyncTransaction(self, db, write)
+
+    def close(self):
+        """Stop the reader and writer threads after calls in progress
+        complete. The wrapped environment is not closed."""
+        self._readers.shutdown()
+        self._writer.shutdown()
+
+
+class AsyncTransaction(object):
+    """
+    A :py:class:`lmdb.Transaction` whose methods are coroutines, running on
+    the reader or writer threads of an :py:class:`AsyncEnvironment`.
+
+    Used as an asynchronous context manager, the transaction is committed
+    when the block exits normally, or aborted if it raised an exception.
+    Calls on one transaction run one at a time, in the order made. A
+    transaction that is discarded without being committed or aborted is
+    aborted when it is garbage collected, releasing the write lock, but until
+    then blocks other writers, so prefer the context manager.
+    """
+    def __init__(self, aenv, db, write):
+        self.aenv = aenv
+        self.write = write
+        self.txn = None
+        self._db = db
+        self._lock = None
+        self._held = False
+        self._loop = None
+        self._executor = aenv._writer if write else aenv._readers
+
+    def __del__(self):
+        # An abandoned write transaction would otherwise hold the write lock
+        # forever. The abort runs on the writer thread ahead of any later
+        # transaction, and the lock is released on the loop's thread.
+        if self._held:
+            self._held = False
+            try:
+                if self.txn is not None:
+                    self._executor.submit(self.txn.abort)
+                self._loop.call_soon_threadsafe(self.aenv._write_lock.release)
+            except RuntimeError:
+                pass  # Executor shut down or loop closed.
+
+    def __await__(self):
+        return self._begin().__await__()
+
+    async def __aenter__(self):
+        return await self._begin()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if self.txn is not None:
+            if exc_type:
+                await self.abort()
+            else:
+                await self.commit()
+
+    async def _begin(self):
+        if self.txn is not None:
+            return self
+        self._lock = asyncio.Lock()
+        self._loop = asyncio.get_running_loop()
+        if self.write:
+            aenv = self.aenv
+            if aenv._write_lock is None:
+                aenv._write_lock = asyncio.Lock()
+            await aenv._write_lock.acquire()
+            self._held = True
+        try:
+            self.txn = await self._run(functools.partial(self.aenv.env.begin,
+                db=self._db, write=self.write))
+        except:
+            self._release()
+            raise
+        return self
+
+    def _release(self):
+        if self._held:
+            self._held = False
+            self.aenv._write_lock.release()
+
+    async def _run(self, func):
+        return await self._loop.run_in_executor(self._executor, func)
+
+    async def _call(self, func, *args, **kwargs):
+        if self.txn is None:
+            raise lmdb.Error('Transaction has not begun')
+        if isinstance(func, str):
+            func = getattr(self.txn, func)
+        async with self._lock:
+            return await self._run(functools.partial(func, *args, **kwargs))
+
+    async def _finish(self, name):
+        if self.txn is None:
+            return
+        try:
+            await self._call(name)
+        finally:
+            self.txn = None
+            self._release()
+
+    async def commit(self):
+        """Commit the transaction, as for :py:meth:`Transaction.commit`."""
+        await self._finish('commit')
+
+    async def abort(self):
+        """Abort the transaction, as for :py:meth:`Transaction.abort`."""
+        await self._finish('abort')
+
+    async def run(self, func, *args, **kwargs):
+        """Call `func(txn, *args, **kwargs)` on the transaction's thread,
+        where `txn` is the underlying :py:class:`lmdb.Transaction`, and
+        return its result. Use this to make many calls with a single thread
+        handoff."""
+        return await self._call(func, self.txn, *args, **kwargs)
+
+    async def get(self, key, default=None, db=None):
+        """As :py:meth:`Transaction.get`."""
+        return await self._call('get', key, default, db=db)
+
+    async def getmulti(self, keys, default=None, db=None,
+                       sorted_lookup=False):
+        """As :py:meth:`Transaction.getmulti`."""
+        return await self._call('getmulti', keys, default, db=db,
+                                sorted_lookup=sorted_lookup)
+
+    async def put(self, key, value, dupdata=True, overwrite=True,
+                  append=False, db=None):
+        """As :py:meth:`Transaction.put`."""
+        return await self._call('put', key, value, dupdata=dupdata,
+                                overwrite=overwrite, append=append, db=db)
+
+    async def putmulti(self, items, dupdata=True, overwrite=True,
+                       append=False, db=None):
+        """As :py:meth:`Cursor.putmulti`, using a new cursor on `db`."""
+        return await self.run(lambda txn: txn.cursor(db).putmulti(items,
+            dupdata=dupdata, overwrite=overwrite, append=append))
+
+    async def replace(self, key, value, db=None):
+        """As :py:meth:`Transaction.replace`."""
+        return await self._call('replace', key, value, db=db)
+
+    async def pop(self, key, db=None):
+        """As :py:meth:`Transaction.pop`."""
+        return await self._call('pop', key, db=db)
+
+    async def delete(self, key, value=b'', db=None):
+        """As :py:meth:`Transaction.delete`."""
+        return await self._call('delete', key, value, db=db)
+
+    async def cursor(self, db=None):
+        """Return an :py:class:`AsyncCursor` on `db`."""
+        return AsyncCursor(self, await self._call('cursor', db=db))
+
+
+class AsyncCursor(object):
+    """
+    A :py:class:`lmdb.Cursor` whose methods are coroutines, and whose
+    iterators are asynchronous iterators fetching `batch` records per thread
+    handoff::
+
+        curs = await txn.cursor()
+        async for key, value in curs.iter_prefix(b'user:'):
+            ...
+    """
+    def __init__(self, atxn, cursor):
+        self.atxn = atxn
+        self.cursor = cursor
+
+    async def _call(self, name, *args, **kwargs):
+        return await self.atxn._call(getattr(self.cursor, name),
+                                     *args, **kwargs)
+
+    async def _iter(self, name, batch, *args):
+        it = await self._call(name, *args, batch=batch or BATCH)
+        while True:
+            items = await self.atxn._call(next, it, None)
+            if items is None:
+                break
+            for item in items:
+                yield item
+
+    async def first(self):
+        """As :py:meth:`Cursor.first`."""
+        return await self._call('first')
+
+    async def last(self):
+        """As :py:meth:`Cursor.last`."""
+        return await self._call('last')
+
+    async def set_key(self, key):
+        """As :py:meth:`Cursor.set_key`."""
+        return await self._call('set_key', key)
+
+    async def set_range(self, key):
+        """As :py:meth:`Cursor.set_range`."""
+        return await self._call('set_range', key)
+
+    async def item(self):
+        """As :py:meth:`Cursor.item`."""
+        return await self._call('item')
+
+    def iternext(self, keys=True, values=True, batch=None):
+        """As :py:meth:`Cursor.iternext`."""
+        return self._iter('iternext', batch, keys, values)
+
+    def iterprev(self, keys=True, values=True, batch=None):
+        """As :py:meth:`Cursor.iterprev`."""
+        return self._iter('iterprev', batch, keys, values)
+
+    def iter_range(self, start=None, stop=None, inclusive=(True, False),
+                   reverse=False, limit=None, keys=True, values=True,
+                   batch=None):
+        """As :py:meth:`Cursor.iter_range`."""
+        return self._iter('iter_range', batch, start, stop, inclusive,
+                          reverse, limit, keys, values)
+
+    def iter_prefix(self, prefix, keys=True, values=True, strip_prefix=False,
+                    batch=None):
+        """As :py:meth:`Cursor.iter_prefix`."""
+        return self._iter('iter_prefix', batch, prefix, keys, values,
+                          strip_prefix)
@@ -0,0 +1,220 @@
+#
+# Copyright 2013 The py-lmdb authors, all rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted only as authorized by the OpenLDAP
+# Public License.
+#
+# A copy of this license is available in the file LICENSE in the
+# top-level directory of the distribution or, alternatively, at
+# <http://www.OpenLDAP.org/license.html>.
+#
+# OpenLDAP is a registered trademark of the OpenLDAP Foundation.
+#
+# Individual files and/or contributed packages may be copyright by
+# other parties and/or subject to additional restrictions.
+#
+# This work also contains materials derived from public sources.
+#
+# Additional information about OpenLDAP can be obtained at
+# <http://www.openldap.org/>.
+#
+
+"""
+Group commit of writes submitted by many threads.
+"""
+
+from __future__ import absolute_import
+import collections
+import threading
+import time
+
+try:
+    from concurrent.futures import Future
+except ImportError:  # Python 2 without the 'futures' backport.
+    Future = None
+
+__all__ = ['WriteBatcher']
+
+_Op = collections.namedtuple('_Op', 'future method args kwargs')
+
+
+class WriteBatcher(object):
+    """
+    Combine writes submitted by any number of threads into shared write
+    transactions, applied and committed by a single writer thread.
+
+    LMDB permits only one write transaction at a time, so when many threads
+    each make small writes in transactions of their own, most of their time
+    is spent waiting for, and paying for, separate commits. Instead,
+    :py:meth:`put` and :py:meth:`delete` queue an operation and immediately
+    return a :py:class:`concurrent.futures.Future`. The writer thread applies
+    queued operations in submission order, committing once per batch, and
+    resolves each future with the result the equivalent
+    :py:class:`Transaction` method returned once its batch is committed.
+
+    A batch is committed `max_delay_ms` milliseconds after its first operation
+    was taken, or as soon as `max_ops` operations are pending. Provided the
+    environment was opened with `sync=True`, as it is by default, a resolved
+    future's write is durable.
+
+    If an operation raises an exception, such as :py:exc:`BadValsizeError`,
+    its future receives the exception, and the rest of its batch is applied
+    in a fresh transaction without it. If the commit fails, every future of
+    the batch receives the exception. Should the writer thread be interrupted
+    by an exception not derived from :py:exc:`Exception`, such as
+    :py:exc:`KeyboardInterrupt`, the batch is abandoned, every unresolved
+    future receives the exception, and the batcher is closed.
+
+    Call :py:meth:`close`, or use the batcher as a context manager, to commit
+    any pending operations and stop the writer thread. The writer thread is a
+    daemon, so pending operations are lost if the program exits without
+    closing the batcher.
+
+        `env`:
+            :py:class:`Environment` to write to.
+
+        `max_delay_ms`:
+            Longest time an operation may wait for others to join its batch.
+
+        `max_ops`:
+            Largest number of operations committed in one transaction.
+
+    Requires Python 3.2 or the ``futures`` package.
+
+    ::
+
+        >>> with lmdb.WriteBatcher(env, max_delay_ms=2) as batcher:
+        ...     fut = batcher.put(b'key', b'value')
+        ...     fut.result()
+        True
+    """
+    def __init__(self, env, max_delay_ms=10, max_ops=1000):
+        if Future is None:
+            raise ImportError('WriteBatcher requires concurrent.futures')
+        self.env = env
+        self.max_delay = max_delay_ms / 1000.0
+        self.max_ops = max(1, max_ops)
+        self._queue = collections.deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run,
+                                        name='lmdb.WriteBatcher')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, _1, _2, _3):
+        self.close()
+
+    def _submit(self, method, args, kwargs):
+        fut = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError('cannot submit to a closed WriteBatcher')
+            self._queue.append(_Op(fut, method, args, kwargs))
+            if len(self._queue) == 1 or len(self._queue) >= self.max_ops:
+                self._cond.notify()
+        return fut
+
+    def put(self, key, value, dupdata=True, overwrite=True, append=False,
+            db=None):
+        """Queue :py:meth:`Transaction.put`, returning a future resolved
+        with its result."""
+        return self._submit('put', (key, value),
+            dict(dupdata=dupdata, overwrite=overwrite, append=append, db=db))
+
+    def delete(self, key, value=b'', db=None):
+        """Queue :py:meth:`Transaction.delete`, returning a future resolved
+        with its result."""
+        return self._submit('delete', (key, value), dict(db=db))
+
+    def close(self):
+        """Commit any pending operations, then stop the writer thread.
+        Further calls to :py:meth:`put` or :py:meth:`delete` raise
+        :py:exc:`RuntimeError`. Repeat calls have no effect."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _take(self):
+        """Wait for a batch of operations, returning an empty list once
+        closed and idle."""
+        with self._cond:
+            while not (self._queue or self._closed):
+                self._cond.wait()
+            deadline = time.time() + self.max_delay
+            while len(self._queue) < self.max_ops and not self._closed:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            count = min(len(self._queue), self.max_ops)
+            batch = [self._queue.popleft() for _ in range(count)]
+        # Skip operations cancelled while queued.
+        return [op for op in batch if op.future.set_running_or_notify_cancel()]
+
+    def _apply(self, batch):
+        while batch:
+            results = []
+            try:
+                txn = self.env.begin(write=True)
+            except Exception as e:
+                for op in batch:
+                    op.future.set_exception(e)
+                return
+            try:
+                for op in batch:
+                    method = getattr(txn, op.method)
+                    results.append(method(*op.args, **op.kwargs))
+            except Exception as e:
+                txn.abort()
+                batch[len(results)].future.set_exception(e)
+                del batch[len(results)]
+                continue
+            except BaseException:
+                txn.abort()
+                raise
+            try:
+                txn.commit()
+            except Exception as e:
+                for op in batch:
+                    op.future.set_exception(e)
+                return
+            for op, result in zip(batch, results):
+                op.future.set_result(result)
+            return
+
+    def _fail(self, batch, exc):
+        """Close the batcher after the writer thread was interrupted by
+        `exc`, failing the futures of `batch` and of every queued operation
+        with it."""
+        with self._cond:
+            self._closed = True
+            queued = list(self._queue)
+            self._queue.clear()
+        for op in batch:
+            if not op.future.done():
+                op.future.set_exception(exc)
+        for op in queued:
+            if op.future.set_running_or_notify_cancel():
+                op.future.set_exception(exc)
+
+    def _run(self):
+        while True:
+            batch = self._take()
+            if batch:
+                try:
+                    self._apply(batch)
+                except BaseException as e:
+                    # The futures carry the exception; the thread just stops.
+                    self._fail(batch, e)
+                    return
+            else:
+                with self._cond:
+                    if self._closed and not self._queue:
+                        return
@@ -0,0 +1,238 @@
+#
+# Copyright 2013 The py-lmdb authors, all rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted only as authorized by the OpenLDAP
+# Public License.
+#
+# A copy of this license is available in the file LICENSE in the
+# top-level directory of the distribution or, alternatively, at
+# <http://www.OpenLDAP.org/license.html>.
+#
+# OpenLDAP is a registered trademark of the OpenLDAP Foundation.
+#
+# Individual files and/or contributed packages may be copyright by
+# other parties and/or subject to additional restrictions.
+#
+# This work also contains materials derived from public sources.
+#
+# Additional information about OpenLDAP can be obtained at
+# <http://www.openldap.org/>.
+#
+
+"""
+Bulk loading of unsorted records using an external merge sort.
+
+Records are sorted in memory in runs of bounded size, which are spilled to
+temporary files, then merged and stored in key order, using `append=True`
+where possible so LMDB fills each page completely rather than splitting pages
+as random inserts do.
+"""
+
+from __future__ import absolute_import
+import heapq
+import io
+import itertools
+import operator
+import struct
+import sys
+import tempfile
+
+import lmdb
+
+__all__ = ['load']
+
+#: Run file record header: key length, value length.
+_HEADER = struct.Struct('=IQ')
+
+#: Approximate memory used by each buffered record besides its contents.
+_RECORD_OVERHEAD = (2 * sys.getsizeof(b'')) + sys.getsizeof((None, None))
+
+#: Records passed to each Cursor.putmulti() call.
+_BATCH = 4096
+
+#: Most runs merged at once. Each open run has a buffer of
+#: memory_limit / _FAN_IN bytes.
+_FAN_IN = 64
+
+
+def _sort_run(run, dupsort):
+    """Sort a run in place, dropping records the database would store only
+    once: all but the last value for each key, or repeated key/value pairs of
+    a dupsort database."""
+    if dupsort:
+        run.sort()
+        same = operator.eq
+    else:
+        run.sort(key=operator.itemgetter(0))
+        same = lambda a, b: a[0] == b[0]
+    run[:-1] = [a for a, b in zip(run, itertools.islice(run, 1, None))
+                if not same(a, b)]
+
+
+def _spill(run, tmpdir, buffering):
+    fp = tempfile.TemporaryFile('w+b', buffering, dir=tmpdir)
+    pack = _HEADER.pack
+    for key, value in run:
+        fp.write(pack(len(key), len(value)))
+        fp.write(key)
+        fp.write(value)
+    fp.flush()
+    return fp
+
+
+def _read_run(fp, seq, dupsort):
+    """Yield records from a spilled run, decorated for heapq.merge() so that
+    equal keys are ordered by value for dupsort databases, and by run
+    otherwise."""
+    fp.seek(0)
+    read = fp.read
+    size = _HEADER.size
+    unpack = _HEADER.unpack
+    while True:
+        header = read(size)
+        if not header:
+            break
+        key_len, value_len = unpack(header)
+        key = read(key_len)
+        value = read(value_len)
+        yield (key, value, seq) if dupsort else (key, seq, value)
+
+
+def _iter_run(run, seq, dupsort):
+    for key, value in run:
+        yield (key, value, seq) if dupsort else (key, seq, value)
+
+
+def _merge(runs, dupsort):
+    """Yield the merged `(key, value)` pairs of several sorted runs, keeping
+    the last value of keys appearing in several runs."""
+    merged = heapq.merge(*runs)
+    if dupsort:
+        last = None
+        for key, value, _ in merged:
+            if (key, value) != last:
+                last = (key, value)
+                yield last
+    else:
+        for key, group in itertools.groupby(merged, operator.itemgetter(0)):
+            for rec in group:
+                pass
+            yield key, rec[2]
+
+
+def _compact(files, levels, dupsort, tmpdir, buffering, final):
+    """Merge groups of spilled runs into larger runs, so no more than
+    _FAN_IN runs are ever merged at once.
+
+    While loading, `_FAN_IN` consecutive runs of the same `levels` entry are
+    merged into one of the next level, so each record is rewritten once per
+    level. If `final`, the newest runs are merged until few enough remain to
+    be merged together with the run held in memory. Runs stay in the order
+    they were produced, so the last value of each key is still stored."""
+    while True:
+        if final:
+            n = min(_FAN_IN, len(files) - _FAN_IN + 2)
+            if n < 2:
+                break
+        elif len(files) >= _FAN_IN and len(set(levels[-_FAN_IN:])) == 1:
+            n = _FAN_IN
+        else:
+            break
+        group = files[-n:]
+        runs = [_read_run(fp, seq, dupsort) for seq, fp in enumerate(group)]
+        fp = _spill(_merge(runs, dupsort), tmpdir, buffering)
+        for old in group:
+            old.close()
+        files[-n:] = [fp]
+        levels[-n:] = [max(levels[-n:]) + 1]
+
+
+def load(env, db, iterable, memory_limit=64 << 20, tmpdir=None):
+    """Store `(key, value)` pairs from `iterable`, which may be in any order,
+    into a database in a single write transaction, returning a tuple
+    `(consumed, added)` as for :py:meth:`Cursor.putmulti`.
+
+    Records are sorted in runs using up to approximately `memory_limit` bytes
+    of memory, runs that do not fit are spilled to temporary files, and the
+    runs are then merged and stored in key order. At most 64 runs are merged
+    at once, each read through a buffer of `memory_limit / 64` bytes, so very
+    large inputs are merged in several passes. If a key appears more than
+    once, the last value given is stored, except in `dupsort=True` databases,
+    which store every distinct value.
+
+    When the database is empty, is not `dupsort=True`, and its keys use the
+    default bytestring order, records are stored using `append=True`, so that
+    pages are completely filled and never split. Otherwise records are stored
+    using ordinary puts, still benefiting from being visited in key order.
+
+        `env`:
+            :py:class:`Environment` to load into.
+
+        `db`:
+            Database to load into, or ``None`` for the main database.
+
+        `iterable`:
+            Iterable of `(key, value)` bytestring pairs.
+
+        `memory_limit`:
+            Approximate size in bytes of the largest run sorted in memory.
+
+        `tmpdir`:
+            Directory for spilled runs, defaulting to the :py:mod:`tempfile`
+            default.
+
+    ::
+
+        >>> env = lmdb.open('/path/to/new.lmdb', map_size=200 << 30)
+        >>> lmdb.bulk.load(env, None, unsorted_pairs())
+        (1000000, 1000000)
+    """
+    if db is None:
+        db = env.open_db(None)
+
+    with env.begin(write=True, db=db) as txn:
+        flags = db.flags(txn)
+        dupsort = flags['dupsort']
+        # MDB_APPEND refuses a key equal to the last, so can't add
+        # duplicates.
+        append = not (txn.stat(db)['entries'] or dupsort or
+                      flags['reverse_key'] or flags['integerkey'])
+
+        buffering = max(io.DEFAULT_BUFFER_SIZE, memory_limit // _FAN_IN)
+        consumed = 0
+        files = []
+        levels = []
+        try:
+            run = []
+            size = 0
+            for key, value in iterable:
+                run.append((key, value))
+                consumed += 1
+                size += len(key) + len(value) + _RECORD_OVERHEAD
+                if size >= memory_limit:
+                    _sort_run(run, dupsort)
+                    files.append(_spill(run, tmpdir, buffering))
+                    levels.append(0)
+                    _compact(files, levels, dupsort, tmpdir, buffering, False)
+                    run = []
+                    size = 0
+            _sort_run(run, dupsort)
+            _compact(files, levels, dupsort, tmpdir, buffering, True)
+            runs = [_read_run(fp, seq, dupsort)
+                    for seq, fp in enumerate(files)]
+            runs.append(_iter_run(run, len(runs), dupsort))
+
+            added = 0
+            curs = txn.cursor()
+            records = _merge(runs, dupsort)
+            while True:
+                batch = list(itertools.islice(records, _BATCH))
+                if not batch:
+                    break
+                _, n = curs.putmulti(batch, append=append)
+                added += n
+        finally:
+            for fp in files:
+                fp.close()
+    return consumed, added
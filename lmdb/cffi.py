@@ -29,6 +29,7 @@ Please see https://lmdb.readthedocs.io/
 from __future__ import absolute_import
 from __future__ import with_statement
 
+import errno
 import inspect
 import os
 import sys
@@ -95,6 +96,9 @@ BytesType = getattr(__builtin__, 'bytes', str)
 O_0755 = int('0755', 8)
 O_0111 = int('0111', 8)
 EMPTY_BYTES = UnicodeType().encode()
+_GIL_POLICIES = ('always', 'never', 'adaptive')
+# Indexed by enum preload_mode.
+_PRELOAD_MODES = ('madvise', 'touch', 'none')
 
 
 # Used to track context across CFFI callbcks.
@@ -194,6 +198,7 @@ _CFFI_CDEF = '''
     int mdb_get(MDB_txn *txn, MDB_dbi dbi, MDB_val *key, MDB_val *data);
     int mdb_cursor_open(MDB_txn *txn, MDB_dbi dbi, MDB_cursor **cursor);
     void mdb_cursor_close(MDB_cursor *cursor);
+    int mdb_cursor_renew(MDB_txn *txn, MDB_cursor *cursor);
     int mdb_cursor_del(MDB_cursor *cursor, unsigned int flags);
     int mdb_cursor_count(MDB_cursor *cursor, size_t *countp);
     int mdb_cursor_get(MDB_cursor *cursor, MDB_val *key, MDB_val*data, int op);
@@ -202,6 +207,7 @@ _CFFI_CDEF = '''
     int mdb_reader_list(MDB_env *env, MDB_msg_func *func, void *ctx);
     int mdb_reader_check(MDB_env *env, int *dead);
     int mdb_dbi_flags(MDB_txn *txn, MDB_dbi dbi, unsigned int *flags);
+    int mdb_cmp(MDB_txn *txn, MDB_dbi dbi, const MDB_val *a, const MDB_val *b);
 
     #define MDB_VERSION_MAJOR ...
     #define MDB_VERSION_MINOR ...
@@ -274,12 +280,83 @@ _CFFI_CDEF = '''
     static int pymdb_cursor_put(MDB_cursor *cursor,
                                 char *key_s, size_t keylen,
                                 char *val_s, size_t vallen, int flags);
+    static int pymdb_getmulti(MDB_cursor *cursor,
+                              char *keys_s, size_t *key_sizes, size_t count,
+                              int sorted, MDB_val *keys, MDB_val *vals,
+                              size_t *order, size_t *done);
+    enum preload_mode {
+        PRELOAD_MADVISE,
+        PRELOAD_TOUCH,
+        PRELOAD_NONE
+    };
+    static int preload_set_mode(MDB_env *env, int mode);
+    static int preload_mode(MDB_env *env);
+    #define ITER_BOUND_REACHED ...
+    #define PUTMULTI_CHUNK ...
+    #define ESTIMATE_EXACT ...
+    struct iter_bound {
+        MDB_val stop;
+        int inclusive;
+        int prefix;
+        size_t strip;
+        ...;
+    };
+    static int iter_batch_c(MDB_cursor *curs, MDB_cursor_op op, int advance,
+                            MDB_val *key, MDB_val *val, MDB_val *keys,
+                            MDB_val *vals, size_t batch,
+                            struct iter_bound *bound, size_t *count);
+    static int to_array_c(MDB_cursor *curs, MDB_val *key, MDB_val *val,
+                          char *out, size_t key_size, size_t val_size,
+                          size_t max, size_t *done);
+    static int prefetch_c(MDB_cursor *curs, MDB_val *key, MDB_val *val,
+                          struct iter_bound *bound, int overflow,
+                          size_t *pages);
+    static int split_c(MDB_cursor *curs, size_t entries, size_t n,
+                       MDB_val *points, size_t *count);
+    static int estimate_c(MDB_cursor *curs, size_t entries,
+                          const MDB_val *start, int start_inclusive,
+                          const MDB_val *stop, int stop_inclusive,
+                          double *result);
+    static int delete_range_c(MDB_cursor *curs, MDB_val *key, MDB_val *val,
+                              struct iter_bound *bound, char *scratch,
+                              size_t *count);
+    static int putmulti_c(MDB_cursor *curs, MDB_val *keys, MDB_val *vals,
+                          char *buf, size_t key_size, size_t val_size,
+                          size_t count, unsigned int flags, size_t *done,
+                          size_t *added);
+    static int pymdb_putmulti(MDB_cursor *cursor,
+                              char *keys_s, size_t *key_sizes,
+                              char *vals_s, size_t *val_sizes, size_t count,
+                              unsigned int flags, MDB_val *keys, MDB_val *vals,
+                              size_t *done, size_t *added);
+    static int pymdb_putmulti_dup(MDB_cursor *cursor,
+                                  char *key_s, size_t keylen, char *buf,
+                                  size_t item_size, size_t count,
+                                  size_t *added);
+    static int pymdb_incr_many(MDB_txn *txn, MDB_dbi dbi, char *keys_s,
+                               size_t *key_sizes, MDB_val *keys,
+                               int64_t *deltas, size_t count, int width,
+                               int is_signed, int big_endian,
+                               uint64_t *results, size_t *done);
+    static int pymdb_cas(MDB_txn *txn, MDB_dbi dbi, char *key_s,
+                         size_t keylen, char *val_s, size_t vallen,
+                         int has_val, char *exp_s, size_t explen,
+                         int has_exp);
 '''
 
 _CFFI_VERIFY = '''
     #include <sys/stat.h>
     #include "lmdb.h"
     #include "preload.h"
+    #include "getmulti.h"
+    #include "toarray.h"
+    #include "iterbatch.h"
+    #include "putmulti.h"
+    #include "delrange.h"
+    #include "incr.h"
+    #include "cas.h"
+    #include "prefetch.h"
+    #include "split.h"
 
     // Helpers below inline MDB_vals. Avoids key alloc/dup on CPython, where
     // CFFI will use PyString_AS_STRING when passed as an argument.
@@ -288,7 +365,8 @@ _CFFI_VERIFY = '''
     {
         MDB_val key = {keylen, key_s};
         int rc = mdb_get(txn, dbi, &key, val_out);
-        preload(rc, val_out->mv_data, val_out->mv_size);
+        preload(preload_mode(mdb_txn_env(txn)), rc,
+                val_out->mv_data, val_out->mv_size);
         return rc;
     }
 
@@ -323,7 +401,8 @@ _CFFI_VERIFY = '''
         MDB_val tmp_data = {data_len, data_s};
         int rc = mdb_cursor_get(cursor, &tmp_key, &tmp_data, op);
         if(! rc) {
-            preload(rc, tmp_data.mv_data, tmp_data.mv_size);
+            preload(preload_mode(mdb_txn_env(mdb_cursor_txn(cursor))), rc,
+                    tmp_data.mv_data, tmp_data.mv_size);
             *key = tmp_key;
             *data = tmp_data;
         }
@@ -337,6 +416,88 @@ _CFFI_VERIFY = '''
         MDB_val tmpval = {vallen, val_s};
         return mdb_cursor_put(cursor, &tmpkey, &tmpval, flags);
     }
+
+    // Unpack `count` keys stored end-to-end in `keys_s` into `keys`, then
+    // look them up using getmulti_c(). If `sorted`, `order` must have room
+    // for 2*count indices.
+    static int pymdb_getmulti(MDB_cursor *cursor,
+                              char *keys_s, size_t *key_sizes, size_t count,
+                              int sorted, MDB_val *keys, MDB_val *vals,
+                              size_t *order, size_t *done)
+    {
+        size_t i;
+
+        for(i = 0; i < count; i++) {
+            keys[i].mv_size = key_sizes[i];
+            keys[i].mv_data = keys_s;
+            keys_s += key_sizes[i];
+            order[i] = i;
+        }
+        if(! sorted) {
+            return getmulti_c(cursor, keys, vals, NULL, count, done);
+        }
+        getmulti_sort(cursor, keys, order, order + count, count);
+        return getmulti_c(cursor, keys, vals, order, count, done);
+    }
+
+    // Unpack `count` keys and values stored end-to-end in `keys_s` and
+    // `vals_s` into `keys` and `vals`, then store them using putmulti_c().
+    static int pymdb_putmulti(MDB_cursor *cursor,
+                              char *keys_s, size_t *key_sizes,
+                              char *vals_s, size_t *val_sizes, size_t count,
+                              unsigned int flags, MDB_val *keys, MDB_val *vals,
+                              size_t *done, size_t *added)
+    {
+        size_t i;
+
+        for(i = 0; i < count; i++) {
+            keys[i].mv_size = key_sizes[i];
+            keys[i].mv_data = keys_s;
+            keys_s += key_sizes[i];
+            vals[i].mv_size = val_sizes[i];
+            vals[i].mv_data = vals_s;
+            vals_s += val_sizes[i];
+        }
+        return putmulti_c(cursor, keys, vals, NULL, 0, 0, count, flags,
+                          done, added);
+    }
+
+    static int pymdb_putmulti_dup(MDB_cursor *cursor,
+                                  char *key_s, size_t keylen, char *buf,
+                                  size_t item_size, size_t count,
+                                  size_t *added)
+    {
+        MDB_val tmpkey = {keylen, key_s};
+        return putmulti_dup_c(cursor, &tmpkey, buf, item_size, count, added);
+    }
+
+    static int pymdb_incr_many(MDB_txn *txn, MDB_dbi dbi, char *keys_s,
+                               size_t *key_sizes, MDB_val *keys,
+                               int64_t *deltas, size_t count, int width,
+                               int is_signed, int big_endian,
+                               uint64_t *results, size_t *done)
+    {
+        size_t i;
+        for(i = 0; i < count; i++) {
+            keys[i].mv_size = key_sizes[i];
+            keys[i].mv_data = keys_s;
+            keys_s += key_sizes[i];
+        }
+        return incr_many_c(txn, dbi, keys, deltas, count, width, is_signed,
+                           big_endian, results, done);
+    }
+
+    static int pymdb_cas(MDB_txn *txn, MDB_dbi dbi, char *key_s,
+                         size_t keylen, char *val_s, size_t vallen,
+                         int has_val, char *exp_s, size_t explen,
+                         int has_exp)
+    {
+        MDB_val key = {keylen, key_s};
+        MDB_val val = {vallen, val_s};
+        MDB_val expected = {explen, exp_s};
+        return cas_c(txn, dbi, &key, has_val ? &val : NULL,
+                     has_exp ? &expected : NULL);
+    }
 '''
 
 if not lmdb._reading_docs():
@@ -534,6 +695,38 @@ def _mvstr(mv):
     """Convert a MDB_val cdata to Python bytes."""
     return _ffi.buffer(mv.mv_data, mv.mv_size)[:]
 
+def _bufcopy(buf):
+    """Return a bytes copy of the buffer `buf`, or `buf` if it is empty or
+    ``None``. Iterators keep a copy of their bound, since it may be a
+    bytearray resized or modified while iterating."""
+    return buf and _ffi.buffer(_ffi.from_buffer(buf))[:]
+
+def _iter_bound(stop, inclusive, prefix=False, strip_prefix=False):
+    """Return a `struct iter_bound` cdata for the key `stop`, or NULL if
+    `stop` is empty, along with an object that must be kept alive while the
+    bound is in use."""
+    if not stop:
+        return _ffi.NULL, None
+    stop_buf = _ffi.from_buffer(stop)
+    bound = _ffi.new('struct iter_bound *')
+    bound.stop.mv_data = stop_buf
+    bound.stop.mv_size = len(stop_buf)
+    bound.inclusive = inclusive
+    bound.prefix = prefix
+    if strip_prefix:
+        bound.strip = len(stop_buf)
+    return bound, stop_buf
+
+def _incr_check(width):
+    if width not in (1, 2, 4, 8):
+        raise ValueError('width must be 1, 2, 4 or 8')
+
+def _incr_error(what, rc):
+    """Return the exception for an incr_c() error `rc`."""
+    if rc == errno.ERANGE:
+        return OverflowError('%s: result out of range' % (what,))
+    return _error(what, rc)
+
 def enable_drop_gil():
     """Deprecated."""
 
@@ -674,12 +867,66 @@ class Environment(object):
             and must ensure that no readers are using old transactions while a
             writer is active. The simplest approach is to use an exclusive lock
             so that no readers may be active at all when a writer begins.
+
+        `gil`:
+            When the GIL is released around record operations: getting,
+            putting and deleting records, moving cursors and renewing read
+            transactions. Releasing it lets other threads run should the call
+            fault in a page from disk, but costs more than the call itself
+            when pages are resident, and many threads doing so contend for the
+            GIL.
+
+            ``'always'``
+                Release the GIL around every LMDB call.
+
+            ``'never'``
+                Hold the GIL for record operations. Suits databases resident
+                in memory.
+
+            ``'adaptive'``
+                As ``'never'``, except that a value large enough to reside on
+                overflow pages, that `mincore()` reports is not entirely
+                resident, is faulted in with the GIL released before being
+                copied. Faults taken while searching the tree still hold the
+                GIL, so prefer ``'always'`` for databases much larger than
+                memory.
+
+            The GIL is always released for calls that may wait on disk or on
+            another thread, such as beginning a write transaction,
+            :py:meth:`Transaction.commit`, :py:meth:`sync`, and
+            :py:meth:`copy`, and for calls covering many records, such as
+            :py:meth:`Transaction.getmulti` and batched iteration. The policy
+            only applies to the CPython extension, as CFFI always releases
+            the GIL.
+
+        `preload`:
+            How a value is faulted in with the GIL released, before it is
+            copied, so that other threads may run while it is read from disk.
+
+            ``'madvise'``
+                Request a value spanning several pages from the kernel at
+                once, using `madvise()` with ``MADV_POPULATE_READ`` where
+                supported, or otherwise ``MADV_WILLNEED`` followed by touching
+                each page, so that cold pages are read in parallel.
+
+            ``'touch'``
+                Touch each page of the value in turn, taking one fault at a
+                time.
+
+            ``'none'``
+                Don't preload; any faults are taken while copying the value,
+                with the GIL held. Suits databases resident in memory.
     """
     def __init__(self, path, map_size=10485760, subdir=True,
             readonly=False, metasync=True, sync=True, map_async=False,
             mode=O_0755, create=True, readahead=True, writemap=False,
             meminit=True, max_readers=126, max_dbs=0, max_spare_txns=1,
-            lock=True):
+            lock=True, gil='always', preload='madvise'):
+        if gil not in _GIL_POLICIES:
+            raise ValueError("gil must be 'always', 'never' or 'adaptive'.")
+        if preload not in _PRELOAD_MODES:
+            raise ValueError("preload must be 'madvise', 'touch' or 'none'.")
+        self._gil = gil
         self._max_spare_txns = max_spare_txns
         self._spare_txns = []
 
@@ -691,6 +938,10 @@ class Environment(object):
         self._env = envpp[0]
         self._deps = set()
 
+        rc = _lib.preload_set_mode(self._env, _PRELOAD_MODES.index(preload))
+        if rc:
+            raise _error("mdb_env_set_userctx", rc)
+
         self.set_mapsize(map_size)
 
         rc = _lib.mdb_env_set_maxreaders(self._env, max_readers)
@@ -970,6 +1221,8 @@ class Environment(object):
             'writemap': bool(flags & _lib.MDB_WRITEMAP),
             'meminit': not (flags & _lib.MDB_NOMEMINIT),
             'lock':  not (flags & _lib.MDB_NOLOCK),
+            'gil': self._gil,
+            'preload': _PRELOAD_MODES[_lib.preload_mode(self._env)],
         }
 
     def max_key_size(self):
@@ -1109,6 +1362,9 @@ class Environment(object):
             with self.begin(write=not self.readonly) as txn:
                 db = _Database(self, txn, key, reverse_key, dupsort, create,
                                integerkey, integerdup, dupfixed)
+                # The handle is discarded unless the transaction really
+                # commits, so don't let a read-only one be cached as a spare.
+                txn._write = True
         self._dbs[key] = db
         return db
 
@@ -1116,6 +1372,94 @@ class Environment(object):
         """Shortcut for :py:class:`lmdb.Transaction`"""
         return Transaction(self, db, parent, write, buffers)
 
+    def get(self, key, default=None, db=None):
+        """Return the value of `key` in a read transaction of its own, or
+        `default` if it is not found, as for :py:meth:`Transaction.get`.
+
+        A temporary :py:class:`Transaction` is begun and aborted within the
+        call. It renews a spare from the freelist (see `max_spare_txns`)
+        rather than allocating an LMDB transaction when one is available, and
+        returns it there before returning, so repeated calls reuse it.
+
+            `db`:
+                Named database to operate on. If unspecified, defaults to the
+                environment's main database.
+        """
+        txn = Transaction(self, db)
+        try:
+            return txn.get(key, default)
+        finally:
+            txn.abort()
+
+    def read_session(self, db=None, buffers=False):
+        """Return a read-only :py:class:`Transaction` that is reused rather
+        than discarded: each ``with`` block renews its snapshot using
+        `mdb_txn_renew()`, and leaving the block, :py:meth:`commit
+        <Transaction.commit>` or :py:meth:`abort <Transaction.abort>` only
+        reset it using `mdb_txn_reset()`, invalidating any cursors. Its reader
+        slot is kept throughout, so the cost of each use is just the renewal.
+        Outside a ``with`` block the session can't be used.
+
+        Like any transaction, a session must be used by one thread at a time,
+        so a server would typically keep one per thread, for example in a
+        :py:class:`threading.local`.
+
+        `db` and `buffers` are as for :py:class:`Transaction`.
+
+        ::
+
+            >>> session = env.read_session()
+            >>> def handle(request):
+            ...     with session as txn:
+            ...         return txn.get(request.key)
+        """
+        txn = Transaction(self, db, buffers=buffers)
+        txn._session = True
+        txn._reset_txn()
+        return txn
+
+    def prefetch(self, db=None, start=None, stop=None, include_overflow=True):
+        """Warm the pages holding the records of `db` from `start` up to but
+        excluding `stop`, so that later reads of the range don't wait for
+        the disk, returning the approximate number of pages warmed. Either
+        bound may be ``None`` to mean the start or end of the database.
+
+        The range is walked in a read transaction of its own with the GIL
+        released, faulting in the branch and leaf pages that cover it. Values
+        stored on overflow pages are not read, but requested from the kernel
+        using `madvise(MADV_WILLNEED)`, so they are read in the background,
+        in parallel. Unlike ``python -mlmdb warm``, which reads the entire
+        environment, only the pages holding the range are touched.
+
+            `db`:
+                Named database to warm. If unspecified, defaults to the
+                environment's main database.
+
+            `include_overflow`:
+                If ``False``, only the branch and leaf pages are warmed, which
+                is much cheaper when a range holds large values that won't be
+                read.
+
+        To warm in the background, call from a thread::
+
+            >>> threading.Thread(target=env.prefetch,
+            ...                  kwargs=dict(start=b'tenant42:',
+            ...                              stop=b'tenant42;')).start()
+        """
+        db = db or self._db
+        pages = _ffi.new('size_t *')
+        with Transaction(self, db) as txn:
+            with Cursor(db, txn) as curs:
+                curs._range_start(start, stop, True, False, False)
+                if not curs._valid:
+                    return 0
+                bound, _stop_buf = _iter_bound(stop, False)
+                rc = _lib.prefetch_c(curs._cur, curs._key, curs._val, bound,
+                                     include_overflow, pages)
+                if rc and rc != _lib.MDB_NOTFOUND:
+                    raise _error("mdb_cursor_get", rc)
+        return pages[0]
+
 
 class _Database(object):
     """Internal database handle."""
@@ -1225,6 +1569,11 @@ class Transaction(object):
     _txn = _invalid
     _parent = None
     _write = False
+    # Read sessions are reset rather than released by commit() and abort().
+    _session = False
+    _reset = False
+    # Released by reset(), so renew() may be called.
+    _renewable = False
 
     # Mutations occurred since transaction start. Required to know when Cursor
     # key/value must be refreshed.
@@ -1275,16 +1624,22 @@ class Transaction(object):
                 self._txn = txnpp[0]
 
     def _invalidate(self):
+        self._session = False
         if self._txn:
             self.abort()
+        self._reset = False
+        self._renewable = False
         self.env._deps.discard(self)
         self._parent = None
         self._env = _invalid
 
     def __del__(self):
+        self._session = False
         self.abort()
 
     def __enter__(self):
+        if self._session and self._reset:
+            self._renew_txn()
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
@@ -1316,6 +1671,49 @@ class Transaction(object):
             raise _error('mdb_stat', rc)
         return self.env._convert_stat(st)
 
+    def split_points(self, n, db=None):
+        """Return up to `n - 1` keys that divide the database into `n` ranges
+        holding roughly equal numbers of records, suitable for fanning a full
+        scan out across several processes, each using
+        :py:meth:`Cursor.iter_range` within its own read transaction.
+
+        The cost doesn't grow with the size of the database. LMDB doesn't
+        expose its branch pages, so the database is instead examined by a
+        bounded number of seeks to keys interpolated between known keys,
+        counting a few keys following each, and seeking more closely where
+        keys are found to cluster. The total number of records is taken
+        from :py:meth:`stat`. Ranges are exact for small databases, and
+        otherwise most even when keys are spread evenly through the key
+        space, such as timestamps, counters or hashes.
+
+        Fewer keys are returned if the database is small or, for
+        `dupsort=True`, if a key's values span more than one range. The
+        database's first key is never returned.
+
+            `db`:
+                Named database to operate on. If unspecified, defaults to the
+                database given to the :py:class:`Transaction` constructor.
+
+        ::
+
+            >>> points = txn.split_points(4)
+            >>> bounds = list(zip([None] + points, points + [None]))
+            >>> pool.map(scan_range, bounds)
+        """
+        db = db or self._db
+        entries = self.stat(db)['entries']
+        if n < 2 or entries < 2:
+            return []
+        # More ranges than records would only repeat keys.
+        n = min(n, entries)
+        points = _ffi.new('MDB_val[]', n - 1)
+        count = _ffi.new('size_t *')
+        with Cursor(db, self) as curs:
+            rc = _lib.split_c(curs._cur, entries, n, points, count)
+            if rc:
+                raise _error("mdb_cursor_get", rc)
+            return [_mvstr(points[i]) for i in range(count[0])]
+
     def drop(self, db, delete=True):
         """Delete all keys in a named database and optionally delete the named
         database itself. Deleting the named database causes it to become
@@ -1345,15 +1743,75 @@ class Transaction(object):
             self._invalidate()
             return True
 
+    def _reset_txn(self):
+        if not self._reset:
+            _lib.mdb_txn_reset(self._txn)
+            self._reset = True
+            # Force cursors to refresh, failing until renewed, rather than
+            # return keys and values from the released snapshot.
+            self._mutations += 1
+
+    def reset(self):
+        """Release the snapshot of a read-only transaction, keeping the
+        transaction, its reader slot and its cursors for reuse by
+        :py:meth:`renew`. Until renewed, the transaction and its cursors
+        raise an exception if used.
+
+        Equivalent to `mdb_txn_reset()
+        <http://symas.com/mdb/doc/group__mdb.html#ga02b06706f8a66249769503c4e88c56cd>`_
+
+        ::
+
+            >>> txn = env.begin()
+            >>> curs = txn.cursor()
+            >>> while True:
+            ...     request = queue.get()
+            ...     txn.renew()
+            ...     handle(request, curs)
+            ...     txn.reset()
+        """
+        if self._write:
+            msg = 'Only read-only transactions can be reset.'
+            raise _error(msg, _lib.EINVAL)
+        self._reset_txn()
+        self._renewable = True
+
+    def renew(self):
+        """Take a new snapshot for a transaction released by :py:meth:`reset`,
+        also renewing its cursors, which become unpositioned. A transaction
+        that was not reset, or was committed or aborted since, raises
+        :py:exc:`InvalidParameterError`.
+
+        Equivalent to `mdb_txn_renew()
+        <http://symas.com/mdb/doc/group__mdb.html#ga6c6f917959517ede1c504cf7c720ce6d>`_
+        """
+        if not self._renewable:
+            msg = 'Transaction must be reset before renewing.'
+            raise _error(msg, _lib.EINVAL)
+        self._renew_txn()
+
+    def _renew_txn(self):
+        rc = _lib.mdb_txn_renew(self._txn)
+        if rc:
+            raise _error("mdb_txn_renew", rc)
+        self._reset = False
+        self._renewable = False
+        self._mutations += 1
+        for curs in list(self._deps):
+            curs.renew(self)
+
     def commit(self):
         """Commit the pending transaction.
 
         Equivalent to `mdb_txn_commit()
         <http://symas.com/mdb/doc/group__mdb.html#ga846fbd6f46105617ac9f4d76476f6597>`_
         """
+        self._renewable = False
         while self._deps:
             self._deps.pop()._invalidate()
-        if self._write or not self._cache_spare():
+        if self._session:
+            self._reset_txn()
+        elif self._write or not self._cache_spare():
             rc = _lib.mdb_txn_commit(self._txn)
             self._txn = _invalid
             if rc:
@@ -1369,9 +1827,13 @@ class Transaction(object):
         Equivalent to `mdb_txn_abort()
         <http://symas.com/mdb/doc/group__mdb.html#ga73a5938ae4c3239ee11efa07eb22b882>`_
         """
+        self._renewable = False
         if self._txn:
             while self._deps:
                 self._deps.pop()._invalidate()
+            if self._session:
+                self._reset_txn()
+                return
             if self._write or not self._cache_spare():
                 rc = _lib.mdb_txn_abort(self._txn)
                 self._txn = _invalid
@@ -1395,6 +1857,29 @@ class Transaction(object):
             raise _error("mdb_cursor_get", rc)
         return self._to_py(self._val)
 
+    def getmulti(self, keys, default=None, db=None, sorted_lookup=False):
+        """Fetch the first value matching each key in the iterable `keys`,
+        returning a list of values in the same order as `keys`. `default` is
+        substituted for any key that does not exist.
+
+        This is equivalent to calling :py:meth:`get` once for each key,
+        except the lookups are performed in a single call to the native
+        library, which is much faster when many keys must be fetched.
+
+            `db`:
+                Named database to operate on. If unspecified, defaults to the
+                database given to the :py:class:`Transaction` constructor.
+
+            `sorted_lookup`:
+                If ``True``, visit the keys in database order rather than the
+                order given, looking up repeated keys only once. The result
+                is still returned in the order of `keys`. This improves page
+                locality for large random batches, at the cost of sorting
+                them first.
+        """
+        with Cursor(db or self._db, self) as curs:
+            return curs.getmulti(keys, default, sorted_lookup)
+
     def put(self, key, value, dupdata=True, overwrite=True, append=False,
             db=None):
         """Store a record, returning ``True`` if it was written, or ``False``
@@ -1444,6 +1929,45 @@ class Transaction(object):
             raise _error("mdb_put", rc)
         return True
 
+    def put_if(self, key, value, expected=None, db=None):
+        """Atomically replace the value of `key` with `value` only if its
+        current value equals `expected`, returning ``True`` if it was
+        replaced. If `expected` is ``None``, `key` must not exist, and is
+        created. The key is found using a single cursor positioning step and
+        compared and overwritten within the native library, so optimistic
+        concurrency needs no separate :py:meth:`get`.
+
+            `db`:
+                Named database to operate on. If unspecified, defaults to the
+                database given to the :py:class:`Transaction` constructor.
+                For databases opened with `dupsort=True`, `expected` names
+                one of the key's values, which is replaced by `value`.
+
+        ::
+
+            >>> old = txn.get(b'config')
+            >>> if not txn.put_if(b'config', update(old), old):
+            ...     retry()
+        """
+        return self._cas(key, value, expected, db, 'put_if')
+
+    def _cas(self, key, value, expected, db, what):
+        has_val = value is not None
+        has_exp = expected is not None
+        if not has_val:
+            value = EMPTY_BYTES
+        if not has_exp:
+            expected = EMPTY_BYTES
+        self._mutations += 1
+        rc = _lib.pymdb_cas(self._txn, (db or self._db)._dbi,
+                            key, len(key), value, len(value), has_val,
+                            expected, len(expected), has_exp)
+        if rc:
+            if rc == _lib.MDB_NOTFOUND:
+                return False
+            raise _error(what, rc)
+        return True
+
     def replace(self, key, value, db=None):
         """Use a temporary cursor to invoke :py:meth:`Cursor.replace`.
 
@@ -1489,6 +2013,192 @@ class Transaction(object):
             raise _error("mdb_del", rc)
         return True
 
+    def delete_if(self, key, expected, db=None):
+        """Atomically delete `key` only if its current value equals
+        `expected`, returning ``True`` if it was deleted. As for
+        :py:meth:`put_if`, the comparison happens within the native library.
+
+            `db`:
+                Named database to operate on. If unspecified, defaults to the
+                database given to the :py:class:`Transaction` constructor.
+                For databases opened with `dupsort=True`, only the value
+                `expected` is deleted.
+        """
+        if expected is None:
+            raise TypeError('expected argument required.')
+        return self._cas(key, None, expected, db, 'delete_if')
+
+    def delete_range(self, start=None, stop=None, inclusive=(True, False),
+                     db=None):
+        """Use a temporary cursor to invoke :py:meth:`Cursor.delete_range`.
+
+            `db`:
+                Named database to operate on. If unspecified, defaults to the
+                database given to the :py:class:`Transaction` constructor.
+        """
+        with Cursor(db or self._db, self) as curs:
+            return curs.delete_range(start, stop, inclusive)
+
+    def estimate_range(self, start=None, stop=None, inclusive=(True, False),
+                       db=None):
+        """Return an estimate of the number of records between `start` and
+        `stop`, without visiting every record. Either bound may be ``None`` to
+        mean the start or end of the database, and `inclusive` is as for
+        :py:meth:`Cursor.iter_range`. For databases opened with
+        `dupsort=True`, each value is counted.
+
+        Ranges of up to a few hundred records are counted exactly. Larger
+        ranges are estimated like :py:meth:`split_points`, by seeking to keys
+        interpolated between those already found, and counting a few records
+        from each, only examining more closely the parts of the database
+        holding `start` and `stop`. The cost is bounded by a few hundred
+        seeks regardless of the size of the range or the database, so this
+        is suitable for deciding whether iterating a range is worthwhile.
+
+        Keys are interpolated byte by byte, so estimates are usually within a
+        few percent of the database's size for keys spread evenly over their
+        bytes, such as hashes and big-endian integers, but may be far off for
+        text keys like decimal numbers of varying width.
+
+            `db`:
+                Named database to operate on. If unspecified, defaults to the
+                database given to the :py:class:`Transaction` constructor.
+
+        ::
+
+            >>> txn.estimate_range(b'2017-01', b'2017-02')
+            31
+        """
+        start_inclusive, stop_inclusive = inclusive
+        db = db or self._db
+        with Cursor(db, self) as curs:
+            curs._range_start(start, stop, start_inclusive, stop_inclusive,
+                              False)
+            if not curs._valid:
+                return 0
+            # Small ranges are counted exactly, larger ones estimated.
+            bound, _stop_buf = _iter_bound(stop, stop_inclusive)
+            count = _ffi.new('size_t *')
+            rc = _lib.iter_batch_c(curs._cur, _lib.MDB_NEXT, False, curs._key,
+                                   curs._val, _ffi.NULL, _ffi.NULL,
+                                   _lib.ESTIMATE_EXACT, bound, count)
+            if rc:
+                if rc not in (_lib.MDB_NOTFOUND, _lib.ITER_BOUND_REACHED):
+                    raise _error("mdb_cursor_get", rc)
+                return count[0]
+            entries = self.stat(db)['entries']
+            bufs = [key and _ffi.from_buffer(key) for key in (start, stop)]
+            keys = [buf and _ffi.new('MDB_val *', {'mv_size': len(buf),
+                                                   'mv_data': buf})
+                    or _ffi.NULL for buf in bufs]
+            result = _ffi.new('double *')
+            rc = _lib.estimate_c(curs._cur, entries, keys[0], start_inclusive,
+                                 keys[1], stop_inclusive, result)
+            if rc:
+                raise _error("mdb_cursor_get", rc)
+            # The range holds at least the records already counted.
+            return max(count[0], int(result[0]))
+
+    def _incr(self, keys, deltas, db, width, signed, big_endian, many):
+        _incr_check(width)
+        # Reject keys LMDB would refuse before changing any value.
+        max_key = self.env.max_key_size()
+        for i, key in enumerate(keys):
+            if not 0 < len(key) <= max_key:
+                what = 'incr_many() element #%d' % i if many else 'incr'
+                raise _error('%s: key must be 1 to %d bytes'
+                             % (what, max_key), _lib.MDB_BAD_VALSIZE)
+        count = len(keys)
+        key_sizes = _ffi.new('size_t[]', [len(k) for k in keys])
+        c_deltas = _ffi.new('int64_t[]', deltas)
+        results = _ffi.new('uint64_t[]', count)
+        done = _ffi.new('size_t *')
+        self._mutations += 1
+        rc = _lib.pymdb_incr_many(self._txn, (db or self._db)._dbi,
+                                  EMPTY_BYTES.join(keys), key_sizes,
+                                  _ffi.new('MDB_val[]', count), c_deltas,
+                                  count, width, signed, big_endian, results,
+                                  done)
+        if rc:
+            what = 'incr_many() element #%d' % done[0] if many else 'incr'
+            raise _incr_error(what, rc)
+        if signed:
+            return [v - (1 << 64) if v >> 63 else v for v in results]
+        return list(results)
+
+    def incr(self, key, delta=1, db=None, width=8, signed=True,
+             big_endian=False):
+        """Add `delta` to the fixed-width integer value of `key`, returning
+        the new value. A missing key is treated as holding 0 and is created.
+        The whole update happens in the native library, finding the key with a
+        single cursor positioning step and overwriting its value in place.
+
+            `key`:
+                Key to update. An empty key, or one longer than
+                :py:meth:`Environment.max_key_size`, raises
+                :py:exc:`BadValsizeError` as for :py:meth:`put`.
+
+            `delta`:
+                Amount to add, which may be negative. Must fit in a signed
+                64-bit integer.
+
+            `db`:
+                Named database to operate on. If unspecified, defaults to the
+                database given to the :py:class:`Transaction` constructor.
+                Databases opened with `dupsort=True` raise
+                :py:exc:`IncompatibleError`.
+
+            `width`:
+                Size in bytes of values: 1, 2, 4 or 8. An existing value of
+                any other size raises :py:exc:`BadValsizeError`.
+
+            `signed`:
+                If ``True``, values are two's complement signed integers.
+
+            `big_endian`:
+                If ``True``, values are stored most significant byte first,
+                otherwise least significant byte first.
+
+        :py:exc:`OverflowError` is raised, leaving the value unchanged, if the
+        result can't be represented in `width` bytes.
+
+        ::
+
+            >>> txn.incr(b'hits')
+            1
+            >>> txn.incr(b'hits', 10)
+            11
+            >>> struct.unpack('<q', txn.get(b'hits'))
+            (11,)
+        """
+        return self._incr([key], [delta], db, width, signed, big_endian,
+                          False)[0]
+
+    def incr_many(self, items, db=None, width=8, signed=True,
+                  big_endian=False):
+        """Apply :py:meth:`incr` to each `(key, delta)` pair of `items`, a
+        mapping such as a dict or :py:class:`collections.Counter`, or a
+        sequence of pairs, returning a list of the new values in the order
+        given. All keys are updated in a single call to the native library.
+
+        If an increment fails, the exception names its position, and the
+        earlier increments remain applied within the transaction. Keys are
+        all checked first, so an invalid key fails before any value changes.
+
+        ::
+
+            >>> txn.incr_many(collections.Counter(page_views))
+            [3, 17, 1]
+        """
+        if hasattr(items, 'items'):
+            items = items.items()
+        keys = []
+        deltas = []
+        for key, delta in items:
+            keys.append(key)
+            deltas.append(delta)
+        return self._incr(keys, deltas, db, width, signed, big_endian, True)
+
     def cursor(self, db=None):
         """Shortcut for ``lmdb.Cursor(db, self)``"""
         return Cursor(db or self._db, self)
@@ -1616,6 +2326,33 @@ class Cursor(object):
         """Close the cursor, freeing its associated resources."""
         self._invalidate()
 
+    def renew(self, txn=None):
+        """Bind the cursor to `txn`, a read-only transaction of the same
+        environment, or if ``None`` to the cursor's own transaction after it
+        was renewed, keeping the cursor for reuse rather than opening a new
+        one. The cursor becomes unpositioned. :py:meth:`Transaction.renew`
+        renews the transaction's cursors itself.
+
+        Equivalent to `mdb_cursor_renew()
+        <http://symas.com/mdb/doc/group__mdb.html#gac8b57befb68793070c85ea813df481af>`_
+        """
+        txn = txn or self.txn
+        if txn.env is not self.txn.env:
+            msg = 'Transaction belongs to another environment.'
+            raise _error(msg, _lib.EINVAL)
+        rc = _lib.mdb_cursor_renew(txn._txn, self._cur)
+        if rc:
+            raise _error("mdb_cursor_renew", rc)
+        if txn is not self.txn:
+            self.txn._deps.discard(self)
+            txn._deps.add(self)
+            self.txn = txn
+            self._txn = txn._txn
+        self._valid = False
+        self._key.mv_size = 0
+        self._val.mv_size = 0
+        self._last_mutation = txn._mutations
+
     def __enter__(self):
         return self
 
@@ -1643,7 +2380,169 @@ class Cursor(object):
             self._cursor_get(_lib.MDB_GET_CURRENT)
         return self._to_py(self._key), self._to_py(self._val)
 
-    def _iter(self, op, keys, values):
+    def _iter(self, op, keys, values, batch=None):
+        if batch:
+            return self._iter_batch(op, keys, values, batch)
+        return self._iter_single(op, keys, values)
+
+    def _iter_batch(self, op, keys, values, batch, stop=None, inclusive=True,
+                    limit=None, prefix=False, strip_prefix=False):
+        # Used for batch, bounded or limited iteration. Unless `batch` is
+        # set, yields individual results rather than lists. If `prefix`,
+        # `stop` is a prefix every key must begin with.
+        to_py = self._to_py
+        size = batch or 1
+        vals = _ffi.new('MDB_val[]', 2 * size)
+        count = _ffi.new('size_t *')
+        started = False
+
+        bound, _stop_buf = _iter_bound(stop, inclusive, prefix, strip_prefix)
+
+        while self._valid and limit != 0:
+            # Must refresh `key` and `val` following mutation.
+            if self._last_mutation != self.txn._mutations:
+                if not self._cursor_get(_lib.MDB_GET_CURRENT):
+                    break
+            n = size if limit is None else min(size, limit)
+            rc = _lib.iter_batch_c(self._cur, op, started, self._key,
+                                   self._val, vals, vals + size, n, bound,
+                                   count)
+            started = True
+            self._valid = rc in (0, _lib.ITER_BOUND_REACHED)
+            self._last_mutation = self.txn._mutations
+            if rc == _lib.ITER_BOUND_REACHED:
+                limit = 0
+            elif limit is not None:
+                limit -= count[0]
+            if not self._valid:
+                self._key.mv_size = 0
+                self._val.mv_size = 0
+                if rc != _lib.MDB_NOTFOUND:
+                    raise _error("mdb_cursor_get", rc)
+
+            n = count[0]
+            if not values:
+                out = [to_py(vals[i]) for i in range(n)]
+            elif not keys:
+                out = [to_py(vals[size + i]) for i in range(n)]
+            else:
+                out = [(to_py(vals[i]), to_py(vals[size + i]))
+                       for i in range(n)]
+            if not out:
+                break
+            elif batch:
+                yield out
+            else:
+                yield out[0]
+
+    def _cmp_key(self, key):
+        """Compare the current key to `key` using the database's order."""
+        key_buf = _ffi.from_buffer(key)  # hold ref
+        mv = _ffi.new('MDB_val *')
+        mv.mv_data = key_buf
+        mv.mv_size = len(key_buf)
+        return _lib.mdb_cmp(self._txn, self._dbi, self._key, mv)
+
+    def iter_prefix(self, prefix, keys=True, values=True, strip_prefix=False,
+                    batch=None):
+        """Return a forward iterator over the keys beginning with `prefix`.
+        The cursor is moved to the first such key, and iteration ends in the
+        native library on reaching the first key that does not begin with
+        `prefix`, on which the cursor is left positioned.
+
+        Raises :py:class:`IncompatibleError` for databases opened with
+        `reverse_key=True` or `integerkey=True`, since keys sharing a prefix
+        are only adjacent in the default key order.
+
+            `strip_prefix`:
+                If ``True``, yield keys with `prefix` removed. This avoids
+                creating each full key only to slice it.
+
+            `keys`, `values`, `batch`:
+                As for :py:meth:`iternext`.
+
+        ::
+
+            >>> for row, value in curs.iter_prefix(b'tenant1/table1/',
+            ...                                    strip_prefix=True):
+            ...     print(row, value)
+        """
+        if self.db._flags & (_lib.MDB_REVERSEKEY | _lib.MDB_INTEGERKEY):
+            raise _error('Cursor.iter_prefix', _lib.MDB_INCOMPATIBLE)
+        prefix = _bufcopy(prefix)
+        if not prefix:
+            self.first()
+        else:
+            self.set_range(prefix)
+        return self._iter_batch(_lib.MDB_NEXT, keys, values, batch, prefix,
+                                prefix=True, strip_prefix=strip_prefix)
+
+    def iter_range(self, start=None, stop=None, inclusive=(True, False),
+                   reverse=False, limit=None, keys=True, values=True,
+                   batch=None):
+        """Return an iterator over the keys between `start` and `stop`, as
+        ordered by the database. Either bound may be ``None`` to mean the
+        start or end of the database. Comparison against the end of the range
+        happens in the native library, so no objects are created for keys
+        outside the range.
+
+        The cursor is repositioned at the start of the range, or the end if
+        `reverse` is ``True``. When the iterator is exhausted by reaching the
+        far bound, the cursor is left positioned on the first key beyond it.
+
+            `inclusive`:
+                Pair of booleans indicating whether keys equal to `start` and
+                `stop` respectively lie within the range. The default is the
+                half-open range ``[start, stop)``.
+
+            `reverse`:
+                If ``True``, iterate the same range from its end towards its
+                start.
+
+            `limit`:
+                Maximum number of results to return.
+
+            `keys`, `values`, `batch`:
+                As for :py:meth:`iternext`.
+
+        ::
+
+            >>> # Readings for one day, newest first.
+            >>> for key, value in curs.iter_range(b'2017-10-17',
+            ...                                   b'2017-10-18',
+            ...                                   reverse=True):
+            ...     print(key, value)
+        """
+        start_inclusive, stop_inclusive = inclusive
+        self._range_start(start, stop, start_inclusive, stop_inclusive,
+                          reverse)
+        if not reverse:
+            return self._iter_batch(_lib.MDB_NEXT, keys, values, batch,
+                                    _bufcopy(stop), stop_inclusive, limit)
+        return self._iter_batch(_lib.MDB_PREV, keys, values, batch,
+                                _bufcopy(start), start_inclusive, limit)
+
+    def _range_start(self, start, stop, start_inclusive, stop_inclusive,
+                     reverse):
+        # Position on the first record of the range, or its last record if
+        # `reverse`. May leave the cursor beyond the far end of the range.
+        if not reverse:
+            if not start:
+                self.first()
+            elif self.set_range(start) and not start_inclusive and \
+                    not self._cmp_key(start):
+                self.next_nodup()
+        elif not stop:
+            self.last()
+        elif not self.set_range(stop):
+            self.last()
+        elif stop_inclusive and not self._cmp_key(stop):
+            if self.db._flags & _lib.MDB_DUPSORT:
+                self.last_dup()
+        else:
+            self.prev()
+
+    def _iter_single(self, op, keys, values):
         if not values:
             get = self.key
         elif not keys:
@@ -1667,7 +2566,7 @@ class Cursor(object):
             if rc != _lib.MDB_NOTFOUND:
                 raise _error("mdb_cursor_get", rc)
 
-    def iternext(self, keys=True, values=True):
+    def iternext(self, keys=True, values=True, batch=None):
         """Return a forward iterator that yields the current element before
         calling :py:meth:`next`, repeating until the end of the database is
         reached. As a convenience, :py:class:`Cursor` implements the iterator
@@ -1681,13 +2580,26 @@ class Cursor(object):
 
         If the cursor is not yet positioned, it is moved to the first key in
         the database, otherwise iteration proceeds from the current position.
+
+            `batch`:
+                If given, yield lists of up to `batch` results rather than
+                individual results. Each list is collected in a single call to
+                the native library, greatly reducing per-record overhead for
+                large scans. On each step the cursor is positioned on the
+                final element of the list. The other iteration methods accept
+                `batch` with the same meaning.
+
+            ::
+
+                >>> for items in cursor.iternext(batch=1000):
+                ...     index.update(items)
         """
         if not self._valid:
             self.first()
-        return self._iter(_lib.MDB_NEXT, keys, values)
+        return self._iter(_lib.MDB_NEXT, keys, values, batch)
     __iter__ = iternext
 
-    def iternext_dup(self, keys=False, values=True):
+    def iternext_dup(self, keys=False, values=True, batch=None):
         """Return a forward iterator that yields the current value
         ("duplicate") of the current key before calling :py:meth:`next_dup`,
         repeating until the last value of the current key is reached.
@@ -1702,9 +2614,9 @@ class Cursor(object):
                 for idx, data in enumerate(cursor.iternext_dup()):
                     print("%d'th value for 'foo': %s" % (idx, data))
         """
-        return self._iter(_lib.MDB_NEXT_DUP, keys, values)
+        return self._iter(_lib.MDB_NEXT_DUP, keys, values, batch)
 
-    def iternext_nodup(self, keys=True, values=False):
+    def iternext_nodup(self, keys=True, values=False, batch=None):
         """Return a forward iterator that yields the current value
         ("duplicate") of the current key before calling :py:meth:`next_nodup`,
         repeating until the end of the database is reached.
@@ -1721,9 +2633,77 @@ class Cursor(object):
         """
         if not self._valid:
             self.first()
-        return self._iter(_lib.MDB_NEXT_NODUP, keys, values)
+        return self._iter(_lib.MDB_NEXT_NODUP, keys, values, batch)
+
+    def iternext_multiple(self):
+        """Return a forward iterator that yields the values ("duplicates") of
+        the current key one page at a time, each as a single buffer holding
+        the fixed-size values end-to-end, starting from the current value and
+        repeating until the last value of the current key is reached. On each
+        step the cursor is positioned on the final value of the page.
 
-    def iterprev(self, keys=True, values=True):
+        Only meaningful for databases opened with `dupfixed=True`. For keys
+        with many small values this is much faster than
+        :py:meth:`iternext_dup`, since one object is created per page rather
+        than per value.
+
+        .. code-block:: python
+
+            import array
+
+            if cursor.set_key(b'postings'):
+                ids = array.array('Q')
+                for page in cursor.iternext_multiple():
+                    ids.frombytes(page)
+
+        Equivalent to `mdb_cursor_get()
+        <http://symas.com/mdb/doc/group__mdb.html#ga48df35fb102536b32dfbb801a47b4cb0>`_
+        with `MDB_GET_MULTIPLE
+        <http://symas.com/mdb/doc/group__mdb.html#ga1206b2af8b95e7f6b0ef6b28708c9127>`_
+        followed by `MDB_NEXT_MULTIPLE`.
+        """
+        op = _lib.MDB_GET_MULTIPLE
+        page = _ffi.new('MDB_val *')
+        while True:
+            # Must refresh `key` and `val` following mutation.
+            if self._last_mutation != self.txn._mutations:
+                self._cursor_get(_lib.MDB_GET_CURRENT)
+            if not self._valid:
+                return
+
+            # MDB_GET_MULTIPLE leaves `page` untouched when the key has only
+            # one value, so start with the current value. All values of a
+            # dupfixed database share its size.
+            page[0] = self._val[0]
+            size = self._val.mv_size
+            rc = _lib.mdb_cursor_get(self._cur, self._key, page, op)
+            self._last_mutation = self.txn._mutations
+            if rc:
+                self._valid = False
+                self._key.mv_size = 0
+                self._val.mv_size = 0
+                if rc != _lib.MDB_NOTFOUND:
+                    raise _error("mdb_cursor_get", rc)
+                return
+
+            # LMDB always returns the whole page containing the new position;
+            # skip values preceding the current one, or following the
+            # previous one.
+            start = _ffi.cast('char *', page.mv_data)
+            first = _ffi.cast('char *', self._val.mv_data)
+            if op == _lib.MDB_NEXT_MULTIPLE:
+                first += size
+            if start < first < start + page.mv_size:
+                page.mv_size -= first - start
+                page.mv_data = first
+            # LMDB leaves the cursor on the final value of the page.
+            self._val.mv_data = _ffi.cast('char *', page.mv_data) + \
+                                    (page.mv_size - size)
+            self._val.mv_size = size
+            yield self._to_py(page)
+            op = _lib.MDB_NEXT_MULTIPLE
+
+    def iterprev(self, keys=True, values=True, batch=None):
         """Return a reverse iterator that yields the current element before
         calling :py:meth:`prev`, until the start of the database is reached.
 
@@ -1738,18 +2718,18 @@ class Cursor(object):
         """
         if not self._valid:
             self.last()
-        return self._iter(_lib.MDB_PREV, keys, values)
+        return self._iter(_lib.MDB_PREV, keys, values, batch)
 
-    def iterprev_dup(self, keys=False, values=True):
+    def iterprev_dup(self, keys=False, values=True, batch=None):
         """Return a reverse iterator that yields the current value
         ("duplicate") of the current key before calling :py:meth:`prev_dup`,
         repeating until the first value of the current key is reached.
 
         Only meaningful for databases opened with `dupsort=True`.
         """
-        return self._iter(_lib.MDB_PREV_DUP, keys, values)
+        return self._iter(_lib.MDB_PREV_DUP, keys, values, batch)
 
-    def iterprev_nodup(self, keys=True, values=False):
+    def iterprev_nodup(self, keys=True, values=False, batch=None):
         """Return a reverse iterator that yields the current value
         ("duplicate") of the current key before calling :py:meth:`prev_nodup`,
         repeating until the start of the database is reached.
@@ -1761,7 +2741,7 @@ class Cursor(object):
         """
         if not self._valid:
             self.last()
-        return self._iter(_lib.MDB_PREV_NODUP, keys, values)
+        return self._iter(_lib.MDB_PREV_NODUP, keys, values, batch)
 
     def _cursor_get(self, op):
         rc = _lib.mdb_cursor_get(self._cur, self._key, self._val, op)
@@ -1922,7 +2902,7 @@ class Cursor(object):
         with `MDB_NEXT_NODUP
         <http://symas.com/mdb/doc/group__mdb.html#ga1206b2af8b95e7f6b0ef6b28708c9127>`_
         """
-        return self._cursor_get(_lib.MDB_PREV_NODUP)
+        return self._cursor_get(_lib.MDB_NEXT_NODUP)
 
     def set_key(self, key):
         """Seek exactly to `key`, returning ``True`` on success or ``False`` if
@@ -1961,6 +2941,122 @@ class Cursor(object):
             return self.value()
         return default
 
+    def getmulti(self, keys, default=None, sorted_lookup=False):
+        """Equivalent to calling :py:meth:`get` for each key in the iterable
+        `keys`, returning a list of the results in the same order as `keys`.
+        `default` is substituted for any key that does not exist. On return
+        the cursor is positioned as if :py:meth:`get` was last called with the
+        final key visited.
+
+        All lookups are performed in a single call to the native library,
+        avoiding per-key argument parsing and GIL release overhead.
+
+            `sorted_lookup`:
+                If ``True``, visit the keys in database order rather than the
+                order given, looking up repeated keys only once. Consecutive
+                keys that share a leaf page then avoid a search from the root
+                of the tree. The final key visited is the greatest key.
+        """
+        keys = list(keys)
+        count = len(keys)
+        vals = _ffi.new('MDB_val[]', count or 1)
+        keyvals = _ffi.new('MDB_val[]', count or 1)
+        sizes = _ffi.new('size_t[]', [len(key) for key in keys] or 1)
+        order = _ffi.new('size_t[]', 2 * count or 1)
+        done = _ffi.new('size_t *')
+        rc = _lib.pymdb_getmulti(self._cur, EMPTY_BYTES.join(keys), sizes,
+                                 count, sorted_lookup, keyvals, vals, order,
+                                 done)
+        last = order[count - 1] if count else 0
+        self._valid = bool(count and not rc and vals[last].mv_data)
+        self._last_mutation = self.txn._mutations
+        if self._valid:
+            self._key[0] = keyvals[last]
+            self._val[0] = vals[last]
+        else:
+            self._key.mv_size = 0
+            self._val.mv_size = 0
+        if rc:
+            raise _error("mdb_cursor_get() element #%d" % (done[0],), rc)
+
+        to_py = self._to_py
+        return [to_py(val) if val.mv_data else default
+                for val in vals[0:count]]
+
+    def to_array(self, buf, keys=False, values=True, limit=None):
+        """Copy fixed-size records into the writable buffer `buf`, such as an
+        :py:class:`array.array`, :py:class:`bytearray` or contiguous NumPy
+        array, returning the number of records copied. The copy starts from
+        the current record and proceeds as :py:meth:`iternext` would, stopping
+        when `buf` is full, `limit` records have been copied, or the end of
+        the database is reached. Nothing is copied if the cursor is not
+        positioned.
+
+        On return the cursor is positioned on the first record that was not
+        copied, so repeated calls fill successive chunks of the database,
+        until 0 is returned.
+
+        The size of the current record decides the size of every record. A
+        record of any other size causes :py:exc:`BadValsizeError`, leaving
+        the cursor positioned on it. This is intended for `integerkey=True`
+        or `dupfixed=True` databases, or those with fixed-size values.
+
+            `keys`:
+                If ``True``, copy each record's key, followed by its value if
+                `values` is also ``True``.
+
+            `values`:
+                If ``True``, copy each record's value. If both `keys` and
+                `values` are ``False``, keys are copied.
+
+            `limit`:
+                Maximum number of records to copy.
+
+        ::
+
+            >>> import array
+            >>> arr = array.array('Q', [0]) * 1000000
+            >>> curs = txn.cursor(db=ids_db)
+            >>> curs.first()
+            True
+            >>> count = curs.to_array(arr, keys=True, values=False)
+            >>> del arr[count:]
+        """
+        if not values:
+            keys = True
+        if limit is None:
+            limit = int(_ffi.cast('size_t', -1))
+
+        # Must refresh `key` and `val` following mutation.
+        if self._last_mutation != self.txn._mutations:
+            self._cursor_get(_lib.MDB_GET_CURRENT)
+        if not self._valid:
+            return 0
+
+        view = memoryview(buf)
+        if view.readonly:
+            raise BufferError('Object is not writable.')
+        nbytes = getattr(view, 'nbytes', len(view) * view.itemsize)
+
+        # The first record decides the size of every record.
+        key_size = self._key.mv_size if keys else 0
+        val_size = self._val.mv_size if values else 0
+        if key_size + val_size:
+            limit = min(limit, nbytes // (key_size + val_size))
+
+        done = _ffi.new('size_t *')
+        rc = _lib.to_array_c(self._cur, self._key, self._val,
+                             _ffi.from_buffer(buf), key_size, val_size,
+                             limit, done)
+        self._valid = (not rc) or rc == _lib.MDB_BAD_VALSIZE
+        self._last_mutation = self.txn._mutations
+        if not self._valid:
+            self._key.mv_size = 0
+            self._val.mv_size = 0
+        if rc and rc != _lib.MDB_NOTFOUND:
+            raise _error("to_array() record #%d" % (done[0],), rc)
+        return done[0]
+
     def set_range(self, key):
         """Seek to the first key greater than or equal to `key`, returning
         ``True`` on success, or ``False`` to indicate key was past end of
@@ -2020,6 +3116,64 @@ class Cursor(object):
             v = rc == 0
         return v
 
+    def delete_range(self, start=None, stop=None, inclusive=(True, False)):
+        """Delete the records between `start` and `stop` in a single call to
+        the native library, returning the number of records deleted. Either
+        bound may be ``None`` to mean the start or end of the database, and
+        `inclusive` is as for :py:meth:`iter_range`. For databases opened
+        with `dupsort=True`, every value of each key in the range is deleted,
+        and each value is counted.
+
+        If neither bound is given, the database is emptied using
+        `mdb_drop()
+        <http://symas.com/mdb/doc/group__mdb.html#gab966fab3840fc54a6571dfb32b00f2db>`_,
+        which frees its pages without visiting each record, and the number of
+        records it contained is returned. The main database is an exception:
+        it also holds a record for each named database, so its records are
+        always deleted individually, and the records of named databases are
+        skipped, leaving those databases intact and uncounted.
+
+        On return the cursor is positioned on the first record following the
+        range, or unpositioned if there is none.
+
+        ::
+
+            >>> # Expire everything before today.
+            >>> txn.delete_range(stop=b'2017-10-18')
+            1503642
+        """
+        start_inclusive, stop_inclusive = inclusive
+        # The main database may also hold the records of named databases,
+        # which mdb_drop() would delete along with their contents.
+        if not (start or stop or self.db is self.txn.env._db):
+            entries = self.txn.stat(self.db)['entries']
+            rc = _lib.mdb_drop(self.txn._txn, self.db._dbi, 0)
+            self.txn._mutations += 1
+            self._valid = False
+            self._key.mv_size = 0
+            self._val.mv_size = 0
+            if rc:
+                raise _error("mdb_drop", rc)
+            return entries
+
+        self._range_start(start, stop, start_inclusive, stop_inclusive, False)
+        if not self._valid:
+            return 0
+        bound, _stop_buf = _iter_bound(stop, stop_inclusive)
+        count = _ffi.new('size_t *')
+        scratch = _ffi.new('char[]', self.txn.env.max_key_size())
+        rc = _lib.delete_range_c(self._cur, self._key, self._val, bound,
+                                 scratch, count)
+        self.txn._mutations += 1
+        self._last_mutation = self.txn._mutations
+        self._valid = not rc
+        if rc:
+            self._key.mv_size = 0
+            self._val.mv_size = 0
+            if rc != _lib.MDB_NOTFOUND:
+                raise _error("mdb_cursor_del", rc)
+        return count[0]
+
     def count(self):
         """Return the number of values ("duplicates") for the current key.
 
@@ -2082,18 +3236,33 @@ class Cursor(object):
         self._cursor_get(_lib.MDB_GET_CURRENT)
         return True
 
-    def putmulti(self, items, dupdata=True, overwrite=True, append=False):
+    def putmulti(self, items=None, dupdata=True, overwrite=True,
+                 append=False, keys=None, values=None, key_size=0,
+                 value_size=0):
         """Invoke :py:meth:`put` for each `(key, value)` 2-tuple from the
         iterable `items`. Elements must be exactly 2-tuples, they may not be of
         any other type, or tuple subclass.
 
+        Alternatively, records may be given without creating a tuple for each
+        one, either as two parallel sequences `keys` and `values`, or as
+        fixed-size records packed end-to-end in the buffer `items`, such as
+        one filled by :py:meth:`to_array`, by specifying `key_size`.
+
+        The iterable is consumed in chunks of 1024 records, so it may be of
+        any length. When every key and value of a chunk is a bytestring, the
+        GIL is released once for the whole chunk rather than once per record,
+        leaving other threads free to run during large loads, as it is for a
+        buffer of packed records. If reading the iterable fails, the records
+        preceding the failure are stored before the exception is raised.
+
         Returns a tuple `(consumed, added)`, where `consumed` is the number of
         elements read from the iterable, and `added` is the number of new
         entries added to the database. `added` may be less than `consumed` when
         `overwrite=False`.
 
             `items`:
-                Iterable to read records from.
+                Iterable to read records from, or a buffer of packed records
+                if `key_size` is given.
 
             `dupdata`:
                 If ``True`` and database was opened with `dupsort=True`, add
@@ -2111,6 +3280,28 @@ class Cursor(object):
                 If ``True``, append records to the end of the database without
                 comparing their order first. Appending a key that is not
                 greater than the highest existing key will cause corruption.
+
+            `keys`:
+                Sequence of keys to store, in place of `items`.
+
+            `values`:
+                Sequence of values to store, the same length as `keys`.
+
+            `key_size`:
+                If nonzero, `items` is a buffer of records, each consisting
+                of a key of `key_size` bytes followed by a value of
+                `value_size` bytes.
+
+            `value_size`:
+                Size of each value packed in `items`.
+
+        ::
+
+            >>> curs.putmulti(keys=[b'a', b'b'], values=[b'1', b'2'])
+            (2, 2)
+            >>> curs.putmulti(struct.pack('>4I', 3, 30, 4, 40), key_size=4,
+            ...               value_size=4)
+            (2, 2)
         """
         flags = 0
         if not dupdata:
@@ -2120,20 +3311,124 @@ class Cursor(object):
         if append:
             flags |= _lib.MDB_APPEND
 
-        added = 0
-        skipped = 0
-        for key, value in items:
-            rc = _lib.pymdb_cursor_put(self._cur, key, len(key),
-                                       value, len(value), flags)
+        if key_size:
+            # Packed records are stored in a single call to the native
+            # library.
+            buf = _ffi.from_buffer(items)
+            size = key_size + value_size
+            if len(buf) % size:
+                raise ValueError('buffer length must be a multiple of %d'
+                                 % (size,))
+            done = _ffi.new('size_t *')
+            added = _ffi.new('size_t *')
+            rc = _lib.putmulti_c(self._cur, _ffi.NULL, _ffi.NULL, buf,
+                                 key_size, value_size, len(buf) // size,
+                                 flags, done, added)
             self.txn._mutations += 1
-            added += 1
             if rc:
-                if rc == _lib.MDB_KEYEXIST:
-                    skipped += 1
-                else:
-                    raise _error("mdb_cursor_put", rc)
+                raise _error("mdb_cursor_put() element #%d" % (done[0],), rc)
+            self._cursor_get(_lib.MDB_GET_CURRENT)
+            return done[0], added[0]
+
+        if keys is not None or values is not None:
+            if keys is None or values is None or items is not None:
+                raise TypeError('keys and values must be given together, '
+                                'without items.')
+            if len(keys) != len(values):
+                raise ValueError('keys and values must be the same length')
+            records = zip(keys, values)
+        else:
+            records = iter(items)
+
+        # The iterable is consumed in chunks, each stored in a single call to
+        # the native library.
+        consumed = 0
+        added = 0
+        more = True
+        while more:
+            more = False
+            keys = []
+            values = []
+            try:
+                for key, value in records:
+                    keys.append(key)
+                    values.append(value)
+                    if len(keys) == _lib.PUTMULTI_CHUNK:
+                        more = True
+                        break
+            finally:
+                # Records preceding a bad element are still stored.
+                done, n = self._putmulti_chunk(keys, values, flags, consumed)
+                consumed += done
+                added += n
+        self._cursor_get(_lib.MDB_GET_CURRENT)
+        return consumed, added
+
+    def _putmulti_chunk(self, keys, values, flags, consumed):
+        """Store one chunk of :py:meth:`putmulti` records, returning the
+        tuple `(consumed, added)` for the chunk."""
+        count = len(keys)
+        if not count:
+            return 0, 0
+        done = _ffi.new('size_t *')
+        added = _ffi.new('size_t *')
+        rc = _lib.pymdb_putmulti(self._cur,
+            EMPTY_BYTES.join(keys),
+            _ffi.new('size_t[]', [len(key) for key in keys]),
+            EMPTY_BYTES.join(values),
+            _ffi.new('size_t[]', [len(value) for value in values]),
+            count, flags, _ffi.new('MDB_val[]', count),
+            _ffi.new('MDB_val[]', count), done, added)
+        self.txn._mutations += 1
+        if rc:
+            raise _error("mdb_cursor_put() element #%d"
+                         % (consumed + done[0],), rc)
+        return done[0], added[0]
+
+    def putmulti_dup(self, key, buf, item_size):
+        """Store each of the fixed-size values packed end-to-end in the buffer
+        `buf` as a duplicate of `key`, in a single call to `mdb_cursor_put()
+        <http://symas.com/mdb/doc/group__mdb.html#ga1f83ccb40011837ff37cc32be01ad91e>`_
+        using ``MDB_MULTIPLE``, releasing the GIL once. The database must have
+        been opened with `dupsort=True` and `dupfixed=True`. Values that
+        already exist are skipped.
+
+        Returns a tuple `(consumed, added)`, where `consumed` is the number of
+        values read from `buf`, and `added` is the number of new values added
+        to the database.
+
+            `key`:
+                Bytestring key to store values under.
+
+            `buf`:
+                Buffer containing the values, such as a :py:class:`bytes`
+                object or :py:class:`array.array`, with a length that is a
+                multiple of `item_size`.
+
+            `item_size`:
+                Size of each value in bytes.
+
+        ::
+
+            >>> postings = array.array('I', [1, 5, 9])
+            >>> curs.putmulti_dup(b'word', postings, postings.itemsize)
+            (3, 3)
+        """
+        if not item_size:
+            raise TypeError('buf and item_size must be given.')
+        buf = _ffi.from_buffer(buf)
+        if len(buf) % item_size:
+            raise ValueError('buffer length must be a multiple of %d'
+                             % (item_size,))
+        count = len(buf) // item_size
+        added = _ffi.new('size_t *')
+        rc = _lib.pymdb_putmulti_dup(self._cur, key, len(key), buf,
+                                     item_size, count, added)
+        self.txn._mutations += 1
+        if rc:
+            raise _error("mdb_cursor_put", rc)
         self._cursor_get(_lib.MDB_GET_CURRENT)
-        return added, added-skipped
+        return count, added[0]
 
     def replace(self, key, val):
         """Store a record, returning its previous value if one existed. Returns
@@ -44,6 +44,15 @@
 
 #include "lmdb.h"
 #include "preload.h"
+#include "getmulti.h"
+#include "toarray.h"
+#include "iterbatch.h"
+#include "putmulti.h"
+#include "delrange.h"
+#include "incr.h"
+#include "cas.h"
+#include "prefetch.h"
+#include "split.h"
 
 
 /* Comment out for copious debug. */
@@ -209,6 +218,8 @@ struct EnvObject {
     DbObject *main_db;
     /**  1 if env opened read-only; transactions must always be read-only. */
     int readonly;
+    /** GIL release policy for record operations; enum gil_policy. */
+    int gil;
 
     /** Max free txns to keep on free_txn list. */
     int max_spare_txns;
@@ -216,6 +227,21 @@ struct EnvObject {
     struct TransObject *spare_txns;
 };
 
+/** EnvObject.gil values, in the order of gil_names. */
+enum gil_policy {
+    /** Release the GIL around every LMDB call. */
+    GIL_ALWAYS,
+    /** Hold the GIL for record operations. */
+    GIL_NEVER,
+    /** Hold the GIL for record operations, unless a result isn't resident. */
+    GIL_ADAPTIVE
+};
+
+static const char *const gil_names[] = {"always", "never", "adaptive", NULL};
+
+/** Names of enum preload_mode values, in order. */
+static const char *const preload_names[] = {"madvise", "touch", "none", NULL};
+
 /** TransObject.flags bitfield values. */
 enum trans_flags {
     /** Buffers should be yielded by get. */
@@ -223,7 +249,11 @@ enum trans_flags {
     /** Transaction can be can go on freelist instead of deallocation. */
     TRANS_RDONLY        = 2,
     /** Transaction is spare, ready for mdb_txn_renew() */
-    TRANS_SPARE         = 4
+    TRANS_SPARE         = 4,
+    /** Read session; __enter__ renews it after commit() or abort(). */
+    TRANS_SESSION       = 8,
+    /** Released by reset(), so renew() may be called. */
+    TRANS_RESET         = 16
 };
 
 /** lmdb.Transaction */
@@ -285,8 +315,19 @@ struct IterObject {
     int started;
     /** Operation used to advance cursor. */
     MDB_cursor_op op;
-    /** Iterator value function, should be item(), key(), or value(). */
+    /** Iterator value function, should be item(), key(), or value(). Unused
+     * when `op` is MDB_NEXT_MULTIPLE. */
     IterValFunc val_func;
+    /** If nonzero, next() returns lists of up to this many results. */
+    size_t batch;
+    /** If nonzero, iteration ends at the first key beyond `bound`. */
+    int bounded;
+    struct iter_bound bound;
+    /** Copy of the bound key owned by the iterator, which `bound.stop`
+     * points into. */
+    PyObject *stop_obj;
+    /** Number of results left to return, or (size_t)-1 for no limit. */
+    size_t remaining;
 };
 
 
@@ -607,6 +648,57 @@ val_from_buffer(MDB_val *val, PyObject *buf)
     out = (e); \
     Py_END_ALLOW_THREADS
 
+/*
+ * Like UNLOCKED(), for a record operation on `envobj` that does not wait on
+ * locks or I/O other than page faults. Unless the environment's gil policy is
+ * "always", the GIL is kept, as releasing and retaking it costs more than the
+ * call itself when pages are resident, and causes contention between threads.
+ */
+#define RECORD_UNLOCKED(envobj, out, e) \
+    do { \
+        if((envobj)->gil == GIL_ALWAYS) { \
+            UNLOCKED(out, e) \
+        } else { \
+            out = (e); \
+        } \
+    } while(0)
+
+/*
+ * Like RECORD_UNLOCKED(), for a read `e` whose result `val` is to be copied,
+ * taking any faults for `val` with the GIL released under the "always" policy
+ * as preload() describes. Under "adaptive", the GIL is released only to
+ * preload a `val` large enough to reside on overflow pages, that
+ * preload_resident() reports is not entirely resident.
+ */
+#define READ_UNLOCKED(envobj, out, e, val) \
+    do { \
+        if((envobj)->gil == GIL_ALWAYS) { \
+            Py_BEGIN_ALLOW_THREADS \
+            out = (e); \
+            preload(preload_mode((envobj)->env), out, \
+                    (val)->mv_data, (val)->mv_size); \
+            Py_END_ALLOW_THREADS \
+        } else { \
+            out = (e); \
+            preload_adaptive(envobj, out, val); \
+        } \
+    } while(0)
+
+static void
+preload_adaptive(EnvObject *env, int rc, MDB_val *val)
+{
+    int mode;
+
+    /* Smaller values share the leaf page faulted in by the lookup. */
+    if(env->gil == GIL_ADAPTIVE && (! rc) && val->mv_size > 1024 &&
+       ((mode = preload_mode(env->env)) != PRELOAD_NONE) &&
+       (! preload_resident(val->mv_data, val->mv_size))) {
+        Py_BEGIN_ALLOW_THREADS
+        preload(mode, rc, val->mv_data, val->mv_size);
+        Py_END_ALLOW_THREADS
+    }
+}
+
 
 /* ---------------- */
 /* Argument parsing */
@@ -614,6 +706,26 @@ val_from_buffer(MDB_val *val, PyObject *buf)
 
 #define OFFSET(k, y) offsetof(struct k, y)
 #define SPECSIZE() (sizeof(argspec) / sizeof(argspec[0]))
+
+/*
+ * Frequently called methods use METH_FASTCALL where the interpreter supports
+ * it, avoiding an argument tuple per call. They are declared with FAST_ARGS,
+ * parse with PARSE_FAST() and are registered with METH_FAST, so each is
+ * written once for either convention.
+ */
+#if PY_VERSION_HEX >= 0x03070000
+#   define HAVE_FASTCALL
+#   define METH_FAST (METH_FASTCALL|METH_KEYWORDS)
+#   define FAST_ARGS PyObject *const *args, Py_ssize_t nargs, PyObject *kwnames
+#   define PARSE_FAST(valid, out) \
+        parse_fastargs(valid, SPECSIZE(), argspec, &cache, \
+                       args, nargs, kwnames, out)
+#else
+#   define METH_FAST (METH_VARARGS|METH_KEYWORDS)
+#   define FAST_ARGS PyObject *args, PyObject *kwds
+#   define PARSE_FAST(valid, out) \
+        parse_args(valid, SPECSIZE(), argspec, &cache, args, kwds, out)
+#endif
 enum arg_type {
     ARG_DB,     /** DbObject*               */
     ARG_TRANS,  /** TransObject*            */
@@ -807,6 +919,70 @@ parse_args(int valid, int specsize, const struct argspec *argspec,
     return 0;
 }
 
+#ifdef HAVE_FASTCALL
+/**
+ * Like parse_args() for METH_FASTCALL methods, taking positional arguments
+ * from a C array and keyword names from `kwnames`, so no argument tuple or
+ * keyword dict is built per call. A call passing only positional arguments
+ * never consults the keyword cache.
+ */
+static int NOINLINE
+parse_fastargs(int valid, int specsize, const struct argspec *argspec,
+               PyObject **cache, PyObject *const *args, Py_ssize_t nargs,
+               PyObject *kwnames, void *out)
+{
+    unsigned set = 0;
+    Py_ssize_t nkw;
+    Py_ssize_t i;
+
+    if(! valid) {
+        err_invalid();
+        return -1;
+    }
+
+    if(nargs > specsize) {
+        type_error("too many positional arguments.");
+        return -1;
+    }
+    for(i = 0; i < nargs; i++) {
+        if(parse_arg(argspec + i, args[i], out)) {
+            return -1;
+        }
+        set |= 1 << i;
+    }
+
+    if(! kwnames) {
+        return 0;
+    }
+    if((! *cache) && make_arg_cache(specsize, argspec, cache)) {
+        return -1;
+    }
+
+    nkw = PyTuple_GET_SIZE(kwnames);
+    for(i = 0; i < nkw; i++) {
+        PyObject *pkey = PyTuple_GET_ITEM(kwnames, i);
+        PyObject *specidx;
+        int j;
+
+        if(! ((specidx = PyDict_GetItem(*cache, pkey)))) {
+            type_error("unrecognized keyword argument");
+            return -1;
+        }
+
+        j = READ_ID(specidx);
+        if(set & (1 << j)) {
+            PyErr_Format(PyExc_TypeError, "duplicate argument: %U", pkey);
+            return -1;
+        }
+
+        if(parse_arg(argspec + j, args[nargs + i], out)) {
+            return -1;
+        }
+    }
+    return 0;
+}
+#endif
+
 /**
  * Return 1 if `db` is associated with the given `env`, otherwise raise an
  * exception. Used to prevent DBIs from unrelated envs from being mixed
@@ -866,7 +1042,7 @@ make_trans(EnvObject *env, DbObject *db, TransObject *parent, int write, int buf
         env->max_spare_txns++;
         self->flags &= ~TRANS_SPARE;
         _Py_NewReference(self);
-        UNLOCKED(rc, mdb_txn_renew(self->txn));
+        RECORD_UNLOCKED(env, rc, mdb_txn_renew(self->txn));
 
         if(rc) {
             mdb_txn_abort(self->txn);
@@ -930,7 +1106,8 @@ make_cursor(DbObject *db, TransObject *trans)
     }
 
     self = PyObject_New(CursorObject, &PyCursor_Type);
-    UNLOCKED(rc, mdb_cursor_open(trans->txn, db->dbi, &self->curs));
+    RECORD_UNLOCKED(trans->env, rc,
+                    mdb_cursor_open(trans->txn, db->dbi, &self->curs));
     if(rc) {
         PyObject_Del(self);
         return err_set("mdb_cursor_open", rc);
@@ -1177,6 +1354,36 @@ env_close(EnvObject *self)
     Py_RETURN_NONE;
 }
 
+/**
+ * Store in `out` the index of `obj` within the NULL-terminated `names`,
+ * returning 0 on success or raising ValueError with `msg` and returning -1 if
+ * `obj` is not one of them.
+ */
+static int
+parse_name(PyObject *obj, const char *const *names, const char *msg, int *out)
+{
+    int i;
+
+    for(i = 0; names[i]; i++) {
+        PyObject *name = PyUnicode_FromString(names[i]);
+        int rc;
+
+        if(! name) {
+            return -1;
+        }
+        rc = PyObject_RichCompareBool(obj, name, Py_EQ);
+        Py_DECREF(name);
+        if(rc == -1) {
+            return -1;
+        } else if(rc) {
+            *out = i;
+            return 0;
+        }
+    }
+    PyErr_SetString(PyExc_ValueError, msg);
+    return -1;
+}
+
 /**
  * Environment() -> new object.
  */
@@ -1200,7 +1407,10 @@ env_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
         int max_dbs;
         int max_spare_txns;
         int lock;
-    } arg = {NULL, 10485760, 1, 0, 1, 1, 0, 0755, 1, 1, 0, 1, 126, 0, 1, 1};
+        PyObject *gil;
+        PyObject *preload;
+    } arg = {NULL, 10485760, 1, 0, 1, 1, 0, 0755, 1, 1, 0, 1, 126, 0, 1, 1,
+             NULL, NULL};
 
     static const struct argspec argspec[] = {
         {"path", ARG_OBJ, OFFSET(env_new, path)},
@@ -1218,7 +1428,9 @@ env_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
         {"max_readers", ARG_INT, OFFSET(env_new, max_readers)},
         {"max_dbs", ARG_INT, OFFSET(env_new, max_dbs)},
         {"max_spare_txns", ARG_INT, OFFSET(env_new, max_spare_txns)},
-        {"lock", ARG_BOOL, OFFSET(env_new, lock)}
+        {"lock", ARG_BOOL, OFFSET(env_new, lock)},
+        {"gil", ARG_OBJ, OFFSET(env_new, gil)},
+        {"preload", ARG_OBJ, OFFSET(env_new, preload)}
     };
 
     PyObject *fspath_obj = NULL;
@@ -1227,6 +1439,8 @@ env_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     int flags;
     int rc;
     int mode;
+    int gil = GIL_ALWAYS;
+    int preload = PRELOAD_MADVISE;
 
     static PyObject *cache = NULL;
     if(parse_args(1, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
@@ -1236,6 +1450,14 @@ env_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     if(! arg.path) {
         return type_error("'path' argument required");
     }
+    if(arg.gil && parse_name(arg.gil, gil_names,
+            "gil must be 'always', 'never' or 'adaptive'.", &gil)) {
+        return NULL;
+    }
+    if(arg.preload && parse_name(arg.preload, preload_names,
+            "preload must be 'madvise', 'touch' or 'none'.", &preload)) {
+        return NULL;
+    }
 
     if(! ((self = PyObject_New(EnvObject, type)))) {
         return NULL;
@@ -1247,12 +1469,18 @@ env_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     self->env = NULL;
     self->max_spare_txns = arg.max_spare_txns;
     self->spare_txns = NULL;
+    self->gil = gil;
 
     if((rc = mdb_env_create(&self->env))) {
         err_set("mdb_env_create", rc);
         goto fail;
     }
 
+    if((rc = preload_set_mode(self->env, preload))) {
+        err_set("mdb_env_set_userctx", rc);
+        goto fail;
+    }
+
     if((rc = mdb_env_set_mapsize(self->env, arg.map_size))) {
         err_set("mdb_env_set_mapsize", rc);
         goto fail;
@@ -1343,7 +1571,7 @@ fail:
  * Environment.begin()
  */
 static PyObject *
-env_begin(EnvObject *self, PyObject *args, PyObject *kwds)
+env_begin(EnvObject *self, FAST_ARGS)
 {
     struct env_begin {
         DbObject *db;
@@ -1360,12 +1588,62 @@ env_begin(EnvObject *self, PyObject *args, PyObject *kwds)
     };
 
     static PyObject *cache = NULL;
-    if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
+    if(PARSE_FAST(self->valid, &arg)) {
         return NULL;
     }
     return make_trans(self, arg.db, arg.parent, arg.write, arg.buffers);
 }
 
+/**
+ * Environment.get() -> result
+ */
+static PyObject *
+env_get(EnvObject *self, FAST_ARGS)
+{
+    struct env_get {
+        MDB_val key;
+        PyObject *default_;
+        DbObject *db;
+    } arg = {{0, 0}, Py_None, self->main_db};
+
+    static const struct argspec argspec[] = {
+        {"key", ARG_BUF, OFFSET(env_get, key)},
+        {"default", ARG_OBJ, OFFSET(env_get, default_)},
+        {"db", ARG_DB, OFFSET(env_get, db)}
+    };
+    TransObject *txn;
+    PyObject *ret;
+    MDB_val val;
+    int rc;
+
+    static PyObject *cache = NULL;
+    if(PARSE_FAST(self->valid, &arg)) {
+        return NULL;
+    }
+    if(! arg.key.mv_data) {
+        return type_error("key must be given.");
+    }
+    /* Usually renews a spare transaction rather than allocating one. */
+    if(! ((txn = (TransObject *) make_trans(self, arg.db, NULL, 0, 0)))) {
+        return NULL;
+    }
+
+    READ_UNLOCKED(self, rc, mdb_get(txn->txn, arg.db->dbi, &arg.key, &val),
+                  &val);
+
+    if(! rc) {
+        ret = obj_from_val(&val, 0);
+    } else if(rc == MDB_NOTFOUND) {
+        Py_INCREF(arg.default_);
+        ret = arg.default_;
+    } else {
+        ret = err_set("mdb_get", rc);
+    }
+    /* Resets the transaction and returns it to the freelist. */
+    Py_DECREF((PyObject *)txn);
+    return ret;
+}
+
 /**
  * Environment.copy()
  */
@@ -1497,6 +1775,8 @@ static PyObject *
 env_flags(EnvObject *self)
 {
     PyObject *dct;
+    PyObject *gil;
+    PyObject *preload;
     unsigned int flags;
     int rc;
 
@@ -1519,6 +1799,19 @@ env_flags(EnvObject *self)
     PyDict_SetItemString(dct, "writemap", py_bool(flags & MDB_WRITEMAP));
     PyDict_SetItemString(dct, "meminit", py_bool(!(flags & MDB_NOMEMINIT)));
     PyDict_SetItemString(dct, "lock", py_bool(!(flags & MDB_NOLOCK)));
+    if(! ((gil = PyUnicode_FromString(gil_names[self->gil])))) {
+        Py_DECREF(dct);
+        return NULL;
+    }
+    PyDict_SetItemString(dct, "gil", gil);
+    Py_DECREF(gil);
+    preload = PyUnicode_FromString(preload_names[preload_mode(self->env)]);
+    if(! preload) {
+        Py_DECREF(dct);
+        return NULL;
+    }
+    PyDict_SetItemString(dct, "preload", preload);
+    Py_DECREF(preload);
     return dct;
 }
 
@@ -1634,6 +1927,74 @@ env_path(EnvObject *self)
     return PyUnicode_FromString(path);
 }
 
+static int
+cursor_range_start(CursorObject *self, MDB_val *start, MDB_val *stop,
+                   int start_inclusive, int stop_inclusive, int reverse);
+
+/**
+ * Environment.prefetch() -> int
+ */
+static PyObject *
+env_prefetch(EnvObject *self, PyObject *args, PyObject *kwds)
+{
+    struct env_prefetch {
+        DbObject *db;
+        PyObject *start;
+        PyObject *stop;
+        int include_overflow;
+    } arg = {self->main_db, Py_None, Py_None, 1};
+
+    static const struct argspec argspec[] = {
+        {"db", ARG_DB, OFFSET(env_prefetch, db)},
+        {"start", ARG_OBJ, OFFSET(env_prefetch, start)},
+        {"stop", ARG_OBJ, OFFSET(env_prefetch, stop)},
+        {"include_overflow", ARG_BOOL, OFFSET(env_prefetch, include_overflow)}
+    };
+    struct iter_bound bound = {{0, 0}, 0, 0, 0};
+    MDB_val start = {0, 0};
+    CursorObject *cursor;
+    TransObject *txn;
+    PyObject *ret;
+    size_t pages = 0;
+    int rc;
+
+    static PyObject *cache = NULL;
+    if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
+        return NULL;
+    }
+    if(arg.start != Py_None && val_from_buffer(&start, arg.start)) {
+        return NULL;
+    }
+    if(arg.stop != Py_None && val_from_buffer(&bound.stop, arg.stop)) {
+        return NULL;
+    }
+
+    if(! ((txn = (TransObject *) make_trans(self, arg.db, NULL, 0, 0)))) {
+        return NULL;
+    }
+    if(! ((cursor = (CursorObject *) make_cursor(arg.db, txn)))) {
+        Py_DECREF((PyObject *)txn);
+        return NULL;
+    }
+    ret = NULL;
+    if(! cursor_range_start(cursor, &start, &bound.stop, 1, 0, 0)) {
+        rc = 0;
+        if(cursor->positioned) {
+            UNLOCKED(rc, prefetch_c(cursor->curs, &cursor->key, &cursor->val,
+                                    bound.stop.mv_size ? &bound : NULL,
+                                    arg.include_overflow, &pages));
+        }
+        if(rc && rc != MDB_NOTFOUND) {
+            err_set("mdb_cursor_get", rc);
+        } else {
+            ret = PyLong_FromSize_t(pages);
+        }
+    }
+    Py_DECREF((PyObject *)cursor);
+    Py_DECREF((PyObject *)txn);
+    return ret;
+}
+
 static const struct dict_field mdb_stat_fields[] = {
     {TYPE_UINT, "psize",          offsetof(MDB_stat, ms_psize)},
     {TYPE_UINT, "depth",          offsetof(MDB_stat, ms_depth)},
@@ -1781,6 +2142,38 @@ env_sync(EnvObject *self, PyObject *args)
     Py_RETURN_NONE;
 }
 
+/**
+ * Environment.read_session() -> Transaction
+ */
+static PyObject *
+env_read_session(EnvObject *self, PyObject *args, PyObject *kwds)
+{
+    struct env_read_session {
+        DbObject *db;
+        int buffers;
+    } arg = {self->main_db, 0};
+
+    static const struct argspec argspec[] = {
+        {"db", ARG_DB, OFFSET(env_read_session, db)},
+        {"buffers", ARG_BOOL, OFFSET(env_read_session, buffers)}
+    };
+    TransObject *txn;
+
+    static PyObject *cache = NULL;
+    if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
+        return NULL;
+    }
+    if(! ((txn = (TransObject *) make_trans(self, arg.db, NULL, 0,
+                                            arg.buffers)))) {
+        return NULL;
+    }
+    /* Start in the reset state; __enter__ renews it. */
+    mdb_txn_reset(txn->txn);
+    txn->flags |= TRANS_SPARE | TRANS_SESSION;
+    txn->valid = 0;
+    return (PyObject *)txn;
+}
+
 /**
  * Environment.__enter__()
  */
@@ -1802,17 +2195,20 @@ static PyObject *env_exit(EnvObject *self, PyObject *args)
 static struct PyMethodDef env_methods[] = {
     {"__enter__", (PyCFunction)env_enter, METH_NOARGS},
     {"__exit__", (PyCFunction)env_exit, METH_VARARGS},
-    {"begin", (PyCFunction)env_begin, METH_VARARGS|METH_KEYWORDS},
+    {"begin", (PyCFunction)env_begin, METH_FAST},
     {"close", (PyCFunction)env_close, METH_NOARGS},
     {"copy", (PyCFunction)env_copy, METH_VARARGS|METH_KEYWORDS},
     {"copyfd", (PyCFunction)env_copyfd, METH_VARARGS|METH_KEYWORDS},
+    {"get", (PyCFunction)env_get, METH_FAST},
     {"info", (PyCFunction)env_info, METH_NOARGS},
     {"flags", (PyCFunction)env_flags, METH_NOARGS},
     {"max_key_size", (PyCFunction)env_max_key_size, METH_NOARGS},
     {"max_readers", (PyCFunction)env_max_readers, METH_NOARGS},
     {"open_db", (PyCFunction)env_open_db, METH_VARARGS|METH_KEYWORDS},
     {"path", (PyCFunction)env_path, METH_NOARGS},
+    {"prefetch", (PyCFunction)env_prefetch, METH_VARARGS|METH_KEYWORDS},
     {"stat", (PyCFunction)env_stat, METH_NOARGS},
+    {"read_session", (PyCFunction)env_read_session, METH_VARARGS|METH_KEYWORDS},
     {"readers", (PyCFunction)env_readers, METH_NOARGS},
     {"reader_check", (PyCFunction)env_reader_check, METH_NOARGS},
     {"set_mapsize", (PyCFunction)env_reader_set_mapsize,
@@ -1933,7 +2329,8 @@ cursor_count(CursorObject *self)
         return err_invalid();
     }
 
-    UNLOCKED(rc, mdb_cursor_count(self->curs, &count));
+    RECORD_UNLOCKED(self->trans->env, rc,
+                    mdb_cursor_count(self->curs, &count));
     if(rc) {
         return err_set("mdb_cursor_count", rc);
     }
@@ -1952,10 +2349,9 @@ _cursor_get_c(CursorObject *self, enum MDB_cursor_op op)
 {
     int rc;
 
-    Py_BEGIN_ALLOW_THREADS;
-    rc = mdb_cursor_get(self->curs, &self->key, &self->val, op);
-    preload(rc, self->val.mv_data, self->val.mv_size);
-    Py_END_ALLOW_THREADS;
+    READ_UNLOCKED(self->trans->env, rc,
+                  mdb_cursor_get(self->curs, &self->key, &self->val, op),
+                  &self->val);
 
     self->positioned = rc == 0;
     self->last_mutation = self->trans->mutations;
@@ -1972,6 +2368,71 @@ _cursor_get_c(CursorObject *self, enum MDB_cursor_op op)
     return 0;
 }
 
+/**
+ * Convert the iterable `keys` into a newly allocated array of MDB_vals, storing
+ * the array in `*out` and its length in `*count`. Returns a new reference to
+ * the sequence the array points into, which must be kept alive until the array
+ * is no longer needed. On failure set an exception and return NULL.
+ */
+static PyObject *
+getmulti_keys(PyObject *keys, MDB_val **out, Py_ssize_t *count)
+{
+    PyObject *seq;
+    MDB_val *vals;
+    Py_ssize_t i;
+
+    if(! ((seq = PySequence_Fast(keys, "keys must be iterable")))) {
+        return NULL;
+    }
+
+    *count = PySequence_Fast_GET_SIZE(seq);
+    if(! ((vals = PyMem_Malloc(sizeof(MDB_val) * (*count + 1))))) {
+        Py_DECREF(seq);
+        PyErr_NoMemory();
+        return NULL;
+    }
+
+    for(i = 0; i < *count; i++) {
+        if(val_from_buffer(vals + i, PySequence_Fast_GET_ITEM(seq, i))) {
+            PyMem_Free(vals);
+            Py_DECREF(seq);
+            return NULL;
+        }
+    }
+    *out = vals;
+    return seq;
+}
+
+/**
+ * Convert the `count` results produced by getmulti_c() into a new list,
+ * substituting `default_` for missing keys.
+ */
+static PyObject *
+getmulti_result(MDB_val *vals, size_t count, PyObject *default_,
+                int as_buffer)
+{
+    PyObject *list;
+    size_t i;
+
+    if(! ((list = PyList_New(count)))) {
+        return NULL;
+    }
+    for(i = 0; i < count; i++) {
+        PyObject *val;
+        if(vals[i].mv_data) {
+            if(! ((val = obj_from_val(vals + i, as_buffer)))) {
+                Py_DECREF(list);
+                return NULL;
+            }
+        } else {
+            val = default_;
+            Py_INCREF(val);
+        }
+        PyList_SET_ITEM(list, i, val);
+    }
+    return list;
+}
+
 /**
  * Wrap _cursor_get_c() to return True or False depending on whether the
  * Cursor's final state is positioned.
@@ -1992,7 +2453,7 @@ _cursor_get(CursorObject *self, enum MDB_cursor_op op)
  * Cursor.delete(dupdata=False) -> bool
  */
 static PyObject *
-cursor_delete(CursorObject *self, PyObject *args, PyObject *kwds)
+cursor_delete(CursorObject *self, FAST_ARGS)
 {
     struct cursor_delete {
         int dupdata;
@@ -2004,7 +2465,7 @@ cursor_delete(CursorObject *self, PyObject *args, PyObject *kwds)
     int res;
 
     static PyObject *cache = NULL;
-    if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
+    if(PARSE_FAST(self->valid, &arg)) {
         return NULL;
     }
 
@@ -2015,7 +2476,8 @@ cursor_delete(CursorObject *self, PyObject *args, PyObject *kwds)
         DEBUG("deleting key '%.*s'",
               (int) self->key.mv_size,
               (char*) self->key.mv_data)
-        UNLOCKED(rc, mdb_cursor_del(self->curs, flags));
+        RECORD_UNLOCKED(self->trans->env, rc,
+                        mdb_cursor_del(self->curs, flags));
         self->trans->mutations++;
         if(rc) {
             return err_set("mdb_cursor_del", rc);
@@ -2051,7 +2513,7 @@ cursor_value(CursorObject *self);
  * Cursor.get() -> result
  */
 static PyObject *
-cursor_get(CursorObject *self, PyObject *args, PyObject *kwds)
+cursor_get(CursorObject *self, FAST_ARGS)
 {
     struct cursor_get {
         MDB_val key;
@@ -2064,7 +2526,7 @@ cursor_get(CursorObject *self, PyObject *args, PyObject *kwds)
     };
 
     static PyObject *cache = NULL;
-    if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
+    if(PARSE_FAST(self->valid, &arg)) {
         return NULL;
     }
 
@@ -2084,42 +2546,234 @@ cursor_get(CursorObject *self, PyObject *args, PyObject *kwds)
 }
 
 /**
- * Cursor.item() -> (key, value)
+ * Shared between Cursor.getmulti() and Transaction.getmulti(). If `cursor` is
+ * NULL, a temporary MDB cursor is opened on `txn` and `dbi`, avoiding the
+ * cost of a CursorObject, otherwise `cursor` is left positioned on the final
+ * key visited. In either case the GIL is released only once.
  */
 static PyObject *
-cursor_item(CursorObject *self)
+do_getmulti(CursorObject *cursor, MDB_txn *txn, MDB_dbi dbi,
+            PyObject *keys_obj, PyObject *default_, int sorted,
+            int as_buffer)
 {
-    int as_buffer;
-    PyObject *key;
-    PyObject *val;
-    PyObject *tup;
+    PyObject *seq;
+    PyObject *ret;
+    MDB_cursor *curs;
+    MDB_val *keys;
+    MDB_val *vals = NULL;
+    size_t *order = NULL;
+    Py_ssize_t count;
+    size_t done;
+    size_t last;
+    size_t i;
+    int open_rc = 0;
+    int rc = 0;
 
-    if(! self->valid) {
-        return err_invalid();
-    }
-    /* Must refresh `key` and `val` following mutation. */
-    if(self->last_mutation != self->trans->mutations &&
-       _cursor_get_c(self, MDB_GET_CURRENT)) {
+    if(! ((seq = getmulti_keys(keys_obj, &keys, &count)))) {
         return NULL;
     }
+    if(! ((vals = PyMem_Malloc(sizeof(MDB_val) * (count + 1))))) {
+        ret = PyErr_NoMemory();
+        goto out;
+    }
+    if(sorted) {
+        /* Second half is scratch space for getmulti_sort(). */
+        if(! ((order = PyMem_Malloc(sizeof(size_t) * 2 * (count + 1))))) {
+            ret = PyErr_NoMemory();
+            goto out;
+        }
+        for(i = 0; i < (size_t) count; i++) {
+            order[i] = i;
+        }
+    }
 
-    as_buffer = self->trans->flags & TRANS_BUFFERS;
-    key = obj_from_val(&self->key, as_buffer);
-    val = obj_from_val(&self->val, as_buffer);
-    tup = PyTuple_New(2);
-    if(tup && key && val) {
-        PyTuple_SET_ITEM(tup, 0, key);
-        PyTuple_SET_ITEM(tup, 1, val);
-        return tup;
+    Py_BEGIN_ALLOW_THREADS
+    if(cursor) {
+        curs = cursor->curs;
+    } else {
+        open_rc = mdb_cursor_open(txn, dbi, &curs);
     }
-    Py_CLEAR(key);
-    Py_CLEAR(val);
-    Py_CLEAR(tup);
-    return NULL;
+    if(! open_rc) {
+        if(order) {
+            getmulti_sort(curs, keys, order, order + count, count);
+        }
+        rc = getmulti_c(curs, keys, vals, order, count, &done);
+        if(! cursor) {
+            mdb_cursor_close(curs);
+        }
+    }
+    Py_END_ALLOW_THREADS
+
+    if(cursor) {
+        /* Leave the cursor where the final lookup did. */
+        last = order ? order[count - 1] : (size_t) count - 1;
+        cursor->positioned = (! rc) && count && vals[last].mv_data;
+        cursor->last_mutation = cursor->trans->mutations;
+        if(cursor->positioned) {
+            cursor->key = keys[last];
+            cursor->val = vals[last];
+        } else {
+            cursor->key.mv_size = 0;
+            cursor->val.mv_size = 0;
+        }
+    }
+
+    if(open_rc) {
+        ret = err_set("mdb_cursor_open", open_rc);
+    } else if(rc) {
+        ret = err_format(rc, "mdb_cursor_get() element #%d", (int) done);
+    } else {
+        ret = getmulti_result(vals, count, default_, as_buffer);
+    }
+
+out:
+    PyMem_Free(order);
+    PyMem_Free(vals);
+    PyMem_Free(keys);
+    Py_DECREF(seq);
+    return ret;
 }
 
 /**
- * Cursor.key() -> result
+ * Cursor.getmulti() -> list
+ */
+static PyObject *
+cursor_getmulti(CursorObject *self, PyObject *args, PyObject *kwds)
+{
+    struct cursor_getmulti {
+        PyObject *keys;
+        PyObject *default_;
+        int sorted_lookup;
+    } arg = {NULL, Py_None, 0};
+
+    static const struct argspec argspec[] = {
+        {"keys", ARG_OBJ, OFFSET(cursor_getmulti, keys)},
+        {"default", ARG_OBJ, OFFSET(cursor_getmulti, default_)},
+        {"sorted_lookup", ARG_BOOL, OFFSET(cursor_getmulti, sorted_lookup)}
+    };
+
+    static PyObject *cache = NULL;
+    if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
+        return NULL;
+    }
+    if(! arg.keys) {
+        return type_error("keys must be given.");
+    }
+    return do_getmulti(self, NULL, 0, arg.keys, arg.default_,
+                       arg.sorted_lookup, self->trans->flags & TRANS_BUFFERS);
+}
+
+/**
+ * Cursor.to_array() -> int
+ */
+static PyObject *
+cursor_to_array(CursorObject *self, PyObject *args, PyObject *kwds)
+{
+    struct cursor_to_array {
+        PyObject *buf;
+        int keys;
+        int values;
+        size_t limit;
+    } arg = {NULL, 0, 1, (size_t) -1};
+
+    static const struct argspec argspec[] = {
+        {"buf", ARG_OBJ, OFFSET(cursor_to_array, buf)},
+        {"keys", ARG_BOOL, OFFSET(cursor_to_array, keys)},
+        {"values", ARG_BOOL, OFFSET(cursor_to_array, values)},
+        {"limit", ARG_SIZE, OFFSET(cursor_to_array, limit)}
+    };
+    Py_buffer view;
+    size_t key_size;
+    size_t val_size;
+    size_t max;
+    size_t done;
+    int rc;
+
+    static PyObject *cache = NULL;
+    if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
+        return NULL;
+    }
+    if(! arg.buf) {
+        return type_error("buf must be given.");
+    }
+    if(! arg.values) {
+        arg.keys = 1;
+    }
+
+    /* Must refresh `key` and `val` following mutation. */
+    if(self->last_mutation != self->trans->mutations &&
+       _cursor_get_c(self, MDB_GET_CURRENT)) {
+        return NULL;
+    }
+    if(! self->positioned) {
+        return PyLong_FromUnsignedLongLong(0);
+    }
+
+    if(PyObject_GetBuffer(arg.buf, &view, PyBUF_WRITABLE)) {
+        return NULL;
+    }
+
+    /* The first record decides the size of every record. */
+    key_size = arg.keys ? self->key.mv_size : 0;
+    val_size = arg.values ? self->val.mv_size : 0;
+    max = arg.limit;
+    if((key_size + val_size) && (view.len / (key_size + val_size)) < max) {
+        max = view.len / (key_size + val_size);
+    }
+
+    UNLOCKED(rc, to_array_c(self->curs, &self->key, &self->val, view.buf,
+                            key_size, val_size, max, &done));
+    PyBuffer_Release(&view);
+
+    self->positioned = (! rc) || rc == MDB_BAD_VALSIZE;
+    self->last_mutation = self->trans->mutations;
+    if(! self->positioned) {
+        self->key.mv_size = 0;
+        self->val.mv_size = 0;
+    }
+    if(rc && rc != MDB_NOTFOUND) {
+        return err_format(rc, "to_array() record #%d", (int) done);
+    }
+    return PyLong_FromUnsignedLongLong(done);
+}
+
+/**
+ * Cursor.item() -> (key, value)
+ */
+static PyObject *
+cursor_item(CursorObject *self)
+{
+    int as_buffer;
+    PyObject *key;
+    PyObject *val;
+    PyObject *tup;
+
+    if(! self->valid) {
+        return err_invalid();
+    }
+    /* Must refresh `key` and `val` following mutation. */
+    if(self->last_mutation != self->trans->mutations &&
+       _cursor_get_c(self, MDB_GET_CURRENT)) {
+        return NULL;
+    }
+
+    as_buffer = self->trans->flags & TRANS_BUFFERS;
+    key = obj_from_val(&self->key, as_buffer);
+    val = obj_from_val(&self->val, as_buffer);
+    tup = PyTuple_New(2);
+    if(tup && key && val) {
+        PyTuple_SET_ITEM(tup, 0, key);
+        PyTuple_SET_ITEM(tup, 1, val);
+        return tup;
+    }
+    Py_CLEAR(key);
+    Py_CLEAR(val);
+    Py_CLEAR(tup);
+    return NULL;
+}
+
+/**
+ * Cursor.key() -> result
  */
 static PyObject *
 cursor_key(CursorObject *self)
@@ -2207,6 +2861,283 @@ cursor_prev_nodup(CursorObject *self)
     return _cursor_get(self, MDB_PREV_NODUP);
 }
 
+/**
+ * Store one putmulti() element, counting it in `added` if it was new. Returns
+ * -1 with an exception set on failure.
+ */
+static int
+cursor_put_multi_one(CursorObject *self, MDB_val *key, MDB_val *val,
+                     int flags, Py_ssize_t consumed, Py_ssize_t *added)
+{
+    int rc;
+
+    RECORD_UNLOCKED(self->trans->env, rc,
+                    mdb_cursor_put(self->curs, key, val, flags));
+    self->trans->mutations++;
+    switch(rc) {
+    case MDB_SUCCESS:
+        (*added)++;
+        return 0;
+    case MDB_KEYEXIST:
+        return 0;
+    default:
+        err_format(rc, "mdb_cursor_put() element #%d", (int) consumed);
+        return -1;
+    }
+}
+
+/**
+ * Store putmulti() records with putmulti_c(), releasing the GIL once for the
+ * whole batch.
+ */
+static int
+cursor_put_multi_batch(CursorObject *self, MDB_val *keys, MDB_val *vals,
+                       char *buf, size_t key_size, size_t val_size,
+                       size_t count, int flags, Py_ssize_t *consumed,
+                       Py_ssize_t *added)
+{
+    size_t done;
+    size_t n;
+    int rc;
+
+    UNLOCKED(rc, putmulti_c(self->curs, keys, vals, buf, key_size, val_size,
+                            count, flags, &done, &n));
+    self->trans->mutations++;
+    *consumed += done;
+    *added += n;
+    if(rc) {
+        err_format(rc, "mdb_cursor_put() element #%d", (int) *consumed);
+        return -1;
+    }
+    return 0;
+}
+
+/**
+ * Store putmulti() records collected from Python objects. The GIL can only be
+ * released for the whole batch if `immutable`, i.e. they were all bytes
+ * objects, otherwise it is released around each put.
+ */
+static int
+cursor_put_multi_vals(CursorObject *self, MDB_val *keys, MDB_val *vals,
+                      size_t count, int immutable, int flags,
+                      Py_ssize_t *consumed, Py_ssize_t *added)
+{
+    size_t i;
+
+    if(immutable) {
+        return cursor_put_multi_batch(self, keys, vals, NULL, 0, 0, count,
+                                      flags, consumed, added);
+    }
+    for(i = 0; i < count; i++) {
+        if(cursor_put_multi_one(self, keys + i, vals + i, flags, *consumed,
+                                added)) {
+            return -1;
+        }
+        (*consumed)++;
+    }
+    return 0;
+}
+
+/**
+ * putmulti() of fixed-size records packed end-to-end in a buffer.
+ */
+static int
+cursor_put_multi_packed(CursorObject *self, PyObject *buf, size_t key_size,
+                        size_t val_size, int flags, Py_ssize_t *consumed,
+                        Py_ssize_t *added)
+{
+    Py_buffer view;
+    size_t size = key_size + val_size;
+    int ret;
+
+    if(PyObject_GetBuffer(buf, &view, PyBUF_SIMPLE)) {
+        return -1;
+    }
+    if(view.len % size) {
+        PyErr_Format(PyExc_ValueError,
+                     "buffer length must be a multiple of %d", (int) size);
+        ret = -1;
+    } else {
+        /* The exported buffer can't be resized or freed meanwhile. */
+        ret = cursor_put_multi_batch(self, NULL, NULL, view.buf, key_size,
+                                     val_size, view.len / size, flags,
+                                     consumed, added);
+    }
+    PyBuffer_Release(&view);
+    return ret;
+}
+
+/**
+ * Store the `count` putmulti() records collected in `mvals`, whose values
+ * begin at `mvals + PUTMULTI_CHUNK`, then drop the `nheld` references in
+ * `held` that kept them alive. An exception already set by the caller is
+ * preserved unless storing the records fails.
+ */
+static int
+cursor_put_multi_flush(CursorObject *self, MDB_val *mvals, size_t count,
+                       PyObject **held, size_t nheld, int immutable,
+                       int flags, Py_ssize_t *consumed, Py_ssize_t *added)
+{
+    PyObject *type;
+    PyObject *value;
+    PyObject *traceback;
+    size_t i;
+    int ret = 0;
+
+    PyErr_Fetch(&type, &value, &traceback);
+    if(count) {
+        ret = cursor_put_multi_vals(self, mvals, mvals + PUTMULTI_CHUNK, count,
+                                    immutable, flags, consumed, added);
+    }
+    if(ret) {
+        Py_XDECREF(type);
+        Py_XDECREF(value);
+        Py_XDECREF(traceback);
+    } else {
+        PyErr_Restore(type, value, traceback);
+    }
+    for(i = 0; i < nheld; i++) {
+        Py_DECREF(held[i]);
+    }
+    return ret;
+}
+
+/**
+ * putmulti() of parallel key and value sequences. Records are stored in
+ * chunks of PUTMULTI_CHUNK, each holding references to its elements so they
+ * stay alive even if the sequences are modified.
+ */
+static int
+cursor_put_multi_columns(CursorObject *self, PyObject *keys, PyObject *vals,
+                         int flags, Py_ssize_t *consumed, Py_ssize_t *added)
+{
+    PyObject *keys_fast;
+    PyObject *vals_fast = NULL;
+    PyObject **held = NULL;
+    MDB_val *mvals = NULL;
+    Py_ssize_t count;
+    Py_ssize_t i;
+    size_t n = 0;
+    int immutable = 1;
+    int ret = -1;
+
+    if(! ((keys_fast = PySequence_Fast(keys, "keys must be a sequence")))) {
+        return -1;
+    }
+    if(! ((vals_fast = PySequence_Fast(vals, "values must be a sequence")))) {
+        goto out;
+    }
+
+    count = PySequence_Fast_GET_SIZE(keys_fast);
+    if(count != PySequence_Fast_GET_SIZE(vals_fast)) {
+        PyErr_Format(PyExc_ValueError,
+                     "keys and values must be the same length");
+        goto out;
+    }
+    if(! ((mvals = PyMem_Malloc(sizeof(MDB_val) * 2 * PUTMULTI_CHUNK))) ||
+       ! ((held = PyMem_Malloc(sizeof(PyObject *) * 2 * PUTMULTI_CHUNK)))) {
+        PyErr_NoMemory();
+        goto out;
+    }
+    ret = 0;
+    for(i = 0; i < count && !ret; i++) {
+        PyObject *key = PySequence_Fast_GET_ITEM(keys_fast, i);
+        PyObject *val = PySequence_Fast_GET_ITEM(vals_fast, i);
+
+        if(val_from_buffer(mvals + n, key) ||
+           val_from_buffer(mvals + PUTMULTI_CHUNK + n, val)) {
+            ret = -1; /* val_from_buffer sets exception */
+        } else {
+            Py_INCREF(key);
+            Py_INCREF(val);
+            held[2 * n] = key;
+            held[2 * n + 1] = val;
+            immutable &= PyBytes_CheckExact(key) && PyBytes_CheckExact(val);
+            n++;
+        }
+        /* Records preceding a bad element are still stored. */
+        if(ret || n == PUTMULTI_CHUNK || i == count - 1) {
+            ret |= cursor_put_multi_flush(self, mvals, n, held, 2 * n,
+                                          immutable, flags, consumed, added);
+            n = 0;
+            immutable = 1;
+        }
+    }
+
+out:
+    PyMem_Free(held);
+    PyMem_Free(mvals);
+    Py_DECREF(keys_fast);
+    Py_XDECREF(vals_fast);
+    return ret;
+}
+
+/**
+ * putmulti() of an iterable of 2-tuples. The iterable is consumed in chunks
+ * of PUTMULTI_CHUNK records, so its length is not limited by memory.
+ */
+static int
+cursor_put_multi_items(CursorObject *self, PyObject *items, int flags,
+                       Py_ssize_t *consumed, Py_ssize_t *added)
+{
+    PyObject *iter;
+    PyObject *item;
+    PyObject **held = NULL;
+    MDB_val *mvals = NULL;
+    size_t n = 0;
+    int immutable = 1;
+    int done = 0;
+    int ret = -1;
+
+    if(! ((iter = PyObject_GetIter(items)))) {
+        return -1;
+    }
+    if(! ((mvals = PyMem_Malloc(sizeof(MDB_val) * 2 * PUTMULTI_CHUNK))) ||
+       ! ((held = PyMem_Malloc(sizeof(PyObject *) * PUTMULTI_CHUNK)))) {
+        PyErr_NoMemory();
+        goto out;
+    }
+    ret = 0;
+    while(! (done || ret)) {
+        if(! ((item = PyIter_Next(iter)))) {
+            ret = PyErr_Occurred() ? -1 : 0;
+            done = 1;
+        } else if(! (PyTuple_CheckExact(item) &&
+                     PyTuple_GET_SIZE(item) == 2)) {
+            PyErr_SetString(PyExc_TypeError,
+                            "putmulti() elements must be 2-tuples");
+            Py_DECREF(item);
+            ret = -1;
+        } else {
+            PyObject *key = PyTuple_GET_ITEM(item, 0);
+            PyObject *val = PyTuple_GET_ITEM(item, 1);
+
+            if(val_from_buffer(mvals + n, key) ||
+               val_from_buffer(mvals + PUTMULTI_CHUNK + n, val)) {
+                Py_DECREF(item);
+                ret = -1; /* val_from_buffer sets exception */
+            } else {
+                held[n++] = item;
+                immutable &= PyBytes_CheckExact(key) &&
+                             PyBytes_CheckExact(val);
+            }
+        }
+        /* Records preceding a bad element are still stored. */
+        if(done || ret || n == PUTMULTI_CHUNK) {
+            ret |= cursor_put_multi_flush(self, mvals, n, held, n, immutable,
+                                          flags, consumed, added);
+            n = 0;
+            immutable = 1;
+        }
+    }
+
+out:
+    PyMem_Free(held);
+    PyMem_Free(mvals);
+    Py_DECREF(iter);
+    return ret;
+}
+
 /**
  * Cursor.putmulti(iter|dict) -> (consumed, added)
  */
@@ -2218,22 +3149,26 @@ cursor_put_multi(CursorObject *self, PyObject *args, PyObject *kwds)
         int dupdata;
         int overwrite;
         int append;
-    } arg = {Py_None, 1, 1, 0};
-
-    PyObject *iter;
-    PyObject *item;
+        PyObject *keys;
+        PyObject *values;
+        size_t key_size;
+        size_t value_size;
+    } arg = {Py_None, 1, 1, 0, Py_None, Py_None, 0, 0};
 
     static const struct argspec argspec[] = {
         {"items", ARG_OBJ, OFFSET(cursor_put, items)},
         {"dupdata", ARG_BOOL, OFFSET(cursor_put, dupdata)},
         {"overwrite", ARG_BOOL, OFFSET(cursor_put, overwrite)},
-        {"append", ARG_BOOL, OFFSET(cursor_put, append)}
+        {"append", ARG_BOOL, OFFSET(cursor_put, append)},
+        {"keys", ARG_OBJ, OFFSET(cursor_put, keys)},
+        {"values", ARG_OBJ, OFFSET(cursor_put, values)},
+        {"key_size", ARG_SIZE, OFFSET(cursor_put, key_size)},
+        {"value_size", ARG_SIZE, OFFSET(cursor_put, value_size)}
     };
     int flags;
     int rc;
     Py_ssize_t consumed;
     Py_ssize_t added;
-    PyObject *ret = NULL;
 
     static PyObject *cache = NULL;
     if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
@@ -2251,59 +3186,83 @@ cursor_put_multi(CursorObject *self, PyObject *args, PyObject *kwds)
         flags |= MDB_APPEND;
     }
 
-    if(! ((iter = PyObject_GetIter(arg.items)))) {
-        return NULL;
-    }
-
     consumed = 0;
     added = 0;
-    while((item = PyIter_Next(iter))) {
-        MDB_val mkey, mval;
-        if(! (PyTuple_CheckExact(item) && PyTuple_GET_SIZE(item) == 2)) {
-            PyErr_SetString(PyExc_TypeError,
-                            "putmulti() elements must be 2-tuples");
-            Py_DECREF(item);
-            Py_DECREF(iter);
-            return NULL;
+    if(arg.keys != Py_None || arg.values != Py_None) {
+        if(arg.keys == Py_None || arg.values == Py_None ||
+           arg.items != Py_None) {
+            return type_error("keys and values must be given together, "
+                              "without items.");
         }
+        rc = cursor_put_multi_columns(self, arg.keys, arg.values, flags,
+                                      &consumed, &added);
+    } else if(arg.key_size) {
+        rc = cursor_put_multi_packed(self, arg.items, arg.key_size,
+                                     arg.value_size, flags, &consumed, &added);
+    } else {
+        rc = cursor_put_multi_items(self, arg.items, flags, &consumed, &added);
+    }
+    if(rc) {
+        return NULL;
+    }
+    return Py_BuildValue("(nn)", consumed, added);
+}
 
-        if(val_from_buffer(&mkey, PyTuple_GET_ITEM(item, 0)) ||
-           val_from_buffer(&mval, PyTuple_GET_ITEM(item, 1))) {
-            Py_DECREF(item);
-            Py_DECREF(iter);
-            return NULL; /* val_from_buffer sets exception */
-        }
+/**
+ * Cursor.putmulti_dup() -> (consumed, added)
+ */
+static PyObject *
+cursor_put_multi_dup(CursorObject *self, PyObject *args, PyObject *kwds)
+{
+    struct cursor_put_multi_dup {
+        MDB_val key;
+        PyObject *buf;
+        size_t item_size;
+    } arg = {{0, 0}, NULL, 0};
 
-        UNLOCKED(rc, mdb_cursor_put(self->curs, &mkey, &mval, flags));
-        self->trans->mutations++;
-        switch(rc) {
-        case MDB_SUCCESS:
-            added++;
-            break;
-        case MDB_KEYEXIST:
-            break;
-        default:
-            Py_DECREF(item);
-            Py_DECREF(iter);
-            return err_format(rc, "mdb_cursor_put() element #%d", consumed);
-        }
+    static const struct argspec argspec[] = {
+        {"key", ARG_BUF, OFFSET(cursor_put_multi_dup, key)},
+        {"buf", ARG_OBJ, OFFSET(cursor_put_multi_dup, buf)},
+        {"item_size", ARG_SIZE, OFFSET(cursor_put_multi_dup, item_size)}
+    };
+    Py_buffer view;
+    size_t count;
+    size_t added;
+    int rc;
 
-        Py_DECREF(item);
-        consumed++;
+    static PyObject *cache = NULL;
+    if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
+        return NULL;
+    }
+    if(! (arg.buf && arg.item_size)) {
+        return type_error("buf and item_size must be given.");
     }
 
-    Py_DECREF(iter);
-    if(! PyErr_Occurred()) {
-        ret = Py_BuildValue("(nn)", consumed, added);
+    if(PyObject_GetBuffer(arg.buf, &view, PyBUF_SIMPLE)) {
+        return NULL;
     }
-    return ret;
+    if(view.len % arg.item_size) {
+        PyBuffer_Release(&view);
+        return PyErr_Format(PyExc_ValueError,
+            "buffer length must be a multiple of %d", (int) arg.item_size);
+    }
+
+    count = view.len / arg.item_size;
+    UNLOCKED(rc, putmulti_dup_c(self->curs, &arg.key, view.buf,
+                                arg.item_size, count, &added));
+    PyBuffer_Release(&view);
+    self->trans->mutations++;
+    if(rc) {
+        return err_set("mdb_cursor_put", rc);
+    }
+    return Py_BuildValue("(nn)", (Py_ssize_t) count, (Py_ssize_t) added);
 }
 
 /**
  * Cursor.put() -> bool
  */
 static PyObject *
-cursor_put(CursorObject *self, PyObject *args, PyObject *kwds)
+cursor_put(CursorObject *self, FAST_ARGS)
 {
     struct cursor_put {
         MDB_val key;
@@ -2324,7 +3283,7 @@ cursor_put(CursorObject *self, PyObject *args, PyObject *kwds)
     int rc;
 
     static PyObject *cache = NULL;
-    if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
+    if(PARSE_FAST(self->valid, &arg)) {
         return NULL;
     }
 
@@ -2339,7 +3298,8 @@ cursor_put(CursorObject *self, PyObject *args, PyObject *kwds)
         flags |= MDB_APPEND;
     }
 
-    UNLOCKED(rc, mdb_cursor_put(self->curs, &arg.key, &arg.val, flags));
+    RECORD_UNLOCKED(self->trans->env, rc,
+                    mdb_cursor_put(self->curs, &arg.key, &arg.val, flags));
     self->trans->mutations++;
     if(rc) {
         if(rc == MDB_KEYEXIST) {
@@ -2369,7 +3329,8 @@ do_cursor_replace(CursorObject *self, MDB_val *key, MDB_val *val)
             if(! ((old = obj_from_val(&self->val, 0)))) {
                 return NULL;
             }
-            UNLOCKED(rc, mdb_cursor_del(self->curs, MDB_NODUPDATA));
+            RECORD_UNLOCKED(self->trans->env, rc,
+                            mdb_cursor_del(self->curs, MDB_NODUPDATA));
             self->trans->mutations++;
             if(rc) {
                 Py_CLEAR(old);
@@ -2382,7 +3343,8 @@ do_cursor_replace(CursorObject *self, MDB_val *key, MDB_val *val)
     } else {
         /* val is updated if MDB_KEYEXIST. */
         int flags = MDB_NOOVERWRITE;
-        UNLOCKED(rc, mdb_cursor_put(self->curs, key, val, flags));
+        RECORD_UNLOCKED(self->trans->env, rc,
+                        mdb_cursor_put(self->curs, key, val, flags));
         self->trans->mutations++;
         if(! rc) {
             Py_RETURN_NONE;
@@ -2395,7 +3357,8 @@ do_cursor_replace(CursorObject *self, MDB_val *key, MDB_val *val)
         }
     }
 
-    UNLOCKED(rc, mdb_cursor_put(self->curs, key, &newval, 0));
+    RECORD_UNLOCKED(self->trans->env, rc,
+                    mdb_cursor_put(self->curs, key, &newval, 0));
     if(rc) {
         Py_DECREF(old);
         return err_set("mdb_put", rc);
@@ -2404,25 +3367,72 @@ do_cursor_replace(CursorObject *self, MDB_val *key, MDB_val *val)
 }
 
 /**
- * Cursor.replace() -> None|result
+ * Cursor.renew()
  */
 static PyObject *
-cursor_replace(CursorObject *self, PyObject *args, PyObject *kwds)
+cursor_renew(CursorObject *self, PyObject *args, PyObject *kwds)
 {
-    struct cursor_replace {
-        MDB_val key;
-        MDB_val val;
-    } arg = {{0, 0}, {0, 0}};
+    struct cursor_renew {
+        TransObject *txn;
+    } arg = {NULL};
 
     static const struct argspec argspec[] = {
-        {"key", ARG_BUF, OFFSET(cursor_replace, key)},
-        {"value", ARG_BUF, OFFSET(cursor_replace, val)}
+        {"txn", ARG_TRANS, OFFSET(cursor_renew, txn)}
     };
+    TransObject *trans;
+    int rc;
 
     static PyObject *cache = NULL;
     if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
         return NULL;
     }
+    trans = arg.txn ? arg.txn : self->trans;
+    if(! trans->valid) {
+        return err_invalid();
+    }
+    if(trans->env != self->trans->env) {
+        return err_set("Transaction belongs to another environment.",
+                       EINVAL);
+    }
+
+    UNLOCKED(rc, mdb_cursor_renew(trans->txn, self->curs));
+    if(rc) {
+        return err_set("mdb_cursor_renew", rc);
+    }
+    if(trans != self->trans) {
+        UNLINK_CHILD(self->trans, self)
+        LINK_CHILD(trans, self)
+        Py_INCREF(trans);
+        Py_DECREF(self->trans);
+        self->trans = trans;
+    }
+    self->positioned = 0;
+    self->key.mv_size = 0;
+    self->val.mv_size = 0;
+    self->last_mutation = trans->mutations;
+    Py_RETURN_NONE;
+}
+
+/**
+ * Cursor.replace() -> None|result
+ */
+static PyObject *
+cursor_replace(CursorObject *self, FAST_ARGS)
+{
+    struct cursor_replace {
+        MDB_val key;
+        MDB_val val;
+    } arg = {{0, 0}, {0, 0}};
+
+    static const struct argspec argspec[] = {
+        {"key", ARG_BUF, OFFSET(cursor_replace, key)},
+        {"value", ARG_BUF, OFFSET(cursor_replace, val)}
+    };
+
+    static PyObject *cache = NULL;
+    if(PARSE_FAST(self->valid, &arg)) {
+        return NULL;
+    }
 
     return do_cursor_replace(self, &arg.key, &arg.val);
 }
@@ -2431,7 +3441,7 @@ cursor_replace(CursorObject *self, PyObject *args, PyObject *kwds)
  * Cursor.pop() -> None|result
  */
 static PyObject *
-cursor_pop(CursorObject *self, PyObject *args, PyObject *kwds)
+cursor_pop(CursorObject *self, FAST_ARGS)
 {
     struct cursor_pop {
         MDB_val key;
@@ -2444,7 +3454,7 @@ cursor_pop(CursorObject *self, PyObject *args, PyObject *kwds)
     int rc;
 
     static PyObject *cache = NULL;
-    if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
+    if(PARSE_FAST(self->valid, &arg)) {
         return NULL;
     }
 
@@ -2459,7 +3469,7 @@ cursor_pop(CursorObject *self, PyObject *args, PyObject *kwds)
         return NULL;
     }
 
-    UNLOCKED(rc, mdb_cursor_del(self->curs, 0));
+    RECORD_UNLOCKED(self->trans->env, rc, mdb_cursor_del(self->curs, 0));
     self->trans->mutations++;
     if(rc) {
         Py_DECREF(old);
@@ -2487,7 +3497,7 @@ cursor_set_key(CursorObject *self, PyObject *arg)
  * Cursor.set_key_dup(key, value) -> bool
  */
 static PyObject *
-cursor_set_key_dup(CursorObject *self, PyObject *args, PyObject *kwds)
+cursor_set_key_dup(CursorObject *self, FAST_ARGS)
 {
     struct cursor_set_key_dup {
         MDB_val key;
@@ -2500,7 +3510,7 @@ cursor_set_key_dup(CursorObject *self, PyObject *args, PyObject *kwds)
     };
 
     static PyObject *cache = NULL;
-    if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
+    if(PARSE_FAST(self->valid, &arg)) {
         return NULL;
     }
     self->key = arg.key;
@@ -2530,7 +3540,7 @@ cursor_set_range(CursorObject *self, PyObject *arg)
  * Cursor.set_range_dup(key, value) -> bool
  */
 static PyObject *
-cursor_set_range_dup(CursorObject *self, PyObject *args, PyObject *kwds)
+cursor_set_range_dup(CursorObject *self, FAST_ARGS)
 {
     PyObject *ret;
     struct cursor_set_range_dup {
@@ -2544,7 +3554,7 @@ cursor_set_range_dup(CursorObject *self, PyObject *args, PyObject *kwds)
     };
 
     static PyObject *cache = NULL;
-    if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
+    if(PARSE_FAST(self->valid, &arg)) {
         return NULL;
     }
 
@@ -2577,6 +3587,62 @@ cursor_value(CursorObject *self)
     return obj_from_val(&self->val, self->trans->flags & TRANS_BUFFERS);
 }
 
+/**
+ * Fetch a page of duplicates using MDB_GET_MULTIPLE or MDB_NEXT_MULTIPLE,
+ * returning it as a single buffer. LMDB leaves the cursor on the final
+ * duplicate of the page, so `val` is updated to point at it. Returns NULL
+ * without an exception set when no more duplicates remain.
+ */
+static PyObject *
+cursor_get_multiple(CursorObject *self, enum MDB_cursor_op op)
+{
+    MDB_val page;
+    char *first;
+    size_t size;
+    int rc;
+
+    /* Must refresh `key` and `val` following mutation. */
+    if(self->last_mutation != self->trans->mutations &&
+       _cursor_get_c(self, MDB_GET_CURRENT)) {
+        return NULL;
+    }
+    if(! self->positioned) {
+        return NULL;
+    }
+
+    /* MDB_GET_MULTIPLE leaves `page` untouched when the key has only one
+     * value, so start with the current value. All values of a dupfixed
+     * database share its size. */
+    page = self->val;
+    size = self->val.mv_size;
+    UNLOCKED(rc, mdb_cursor_get(self->curs, &self->key, &page, op));
+    self->last_mutation = self->trans->mutations;
+    if(rc) {
+        self->positioned = 0;
+        self->key.mv_size = 0;
+        self->val.mv_size = 0;
+        if(rc != MDB_NOTFOUND) {
+            err_set("mdb_cursor_get", rc);
+        }
+        return NULL;
+    }
+
+    /* LMDB always returns the whole page containing the new position; skip
+     * values preceding the current one, or following the previous one. */
+    first = (char *)self->val.mv_data;
+    if(op == MDB_NEXT_MULTIPLE) {
+        first += size;
+    }
+    if(first > (char *)page.mv_data &&
+       first < ((char *)page.mv_data + page.mv_size)) {
+        page.mv_size -= first - (char *)page.mv_data;
+        page.mv_data = first;
+    }
+    self->val.mv_data = (char *)page.mv_data + page.mv_size - size;
+    self->val.mv_size = size;
+    return obj_from_val(&page, self->trans->flags & TRANS_BUFFERS);
+}
+
 static PyObject *
 new_iterator(CursorObject *cursor, IterValFunc val_func, MDB_cursor_op op)
 {
@@ -2587,11 +3653,49 @@ new_iterator(CursorObject *cursor, IterValFunc val_func, MDB_cursor_op op)
         Py_INCREF(cursor);
         iter->started = 0;
         iter->op = op;
+        iter->batch = 0;
+        iter->bounded = 0;
+        iter->bound.prefix = 0;
+        iter->bound.strip = 0;
+        iter->stop_obj = NULL;
+        iter->remaining = (size_t) -1;
     }
     DEBUG("new_iterator: %#p", (void *)iter)
     return (PyObject *) iter;
 }
 
+/**
+ * Bound `iter` by a copy of `stop`, as the caller's buffer may be a bytearray
+ * that is resized or modified while iterating. Returns -1 on failure.
+ */
+static int
+iter_set_bound(IterObject *iter, MDB_val *stop)
+{
+    iter->stop_obj = PyBytes_FromStringAndSize(stop->mv_data, stop->mv_size);
+    if(! iter->stop_obj) {
+        return -1;
+    }
+    iter->bound.stop.mv_data = PyBytes_AS_STRING(iter->stop_obj);
+    iter->bound.stop.mv_size = stop->mv_size;
+    iter->bounded = 1;
+    return 0;
+}
+
+/**
+ * Return the iterator value function for the `keys` and `values` arguments
+ * accepted by the iteration methods.
+ */
+static IterValFunc
+iter_val_func(int keys, int values)
+{
+    if(! values) {
+        return cursor_key;
+    } else if(! keys) {
+        return cursor_value;
+    }
+    return cursor_item;
+}
+
 static PyObject *
 iter_from_args(CursorObject *self, PyObject *args, PyObject *kwds,
                signed int pos_op, enum MDB_cursor_op op,
@@ -2600,13 +3704,16 @@ iter_from_args(CursorObject *self, PyObject *args, PyObject *kwds,
     struct iter_from_args {
         int keys;
         int values;
-    } arg = {keys_default, values_default};
+        size_t batch;
+    } arg = {keys_default, values_default, 0};
 
     static const struct argspec argspec[] = {
         {"keys", ARG_BOOL, OFFSET(iter_from_args, keys)},
-        {"values", ARG_BOOL, OFFSET(iter_from_args, values)}
+        {"values", ARG_BOOL, OFFSET(iter_from_args, values)},
+        {"batch", ARG_SIZE, OFFSET(iter_from_args, batch)}
     };
-    void *val_func;
+    IterObject *iter;
+    IterValFunc val_func;
 
     static PyObject *cache = NULL;
     if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
@@ -2619,14 +3726,11 @@ iter_from_args(CursorObject *self, PyObject *args, PyObject *kwds,
         }
     }
 
-    if(! arg.values) {
-        val_func = cursor_key;
-    } else if(! arg.keys) {
-        val_func = cursor_value;
-    } else {
-        val_func = cursor_item;
+    val_func = iter_val_func(arg.keys, arg.values);
+    if((iter = (IterObject *) new_iterator(self, val_func, op))) {
+        iter->batch = arg.batch;
     }
-    return new_iterator(self, val_func, op);
+    return (PyObject *) iter;
 }
 
 static PyObject *
@@ -2689,6 +3793,327 @@ cursor_iterprev_nodup(CursorObject *self, PyObject *args, PyObject *kwargs)
     return iter_from_args(self, args, kwargs, MDB_LAST, MDB_PREV_NODUP, 1, 0);
 }
 
+/**
+ * Parse the `inclusive` argument accepted by range methods, a pair of
+ * booleans for the start and stop keys respectively. On failure set an
+ * exception and return -1.
+ */
+static int
+parse_inclusive(PyObject *obj, int *start_inclusive, int *stop_inclusive)
+{
+    PyObject *seq;
+
+    if(! ((seq = PySequence_Fast(obj, "inclusive must be a 2-tuple")))) {
+        return -1;
+    }
+    if(PySequence_Fast_GET_SIZE(seq) != 2) {
+        Py_DECREF(seq);
+        type_error("inclusive must be a 2-tuple");
+        return -1;
+    }
+    *start_inclusive = PyObject_IsTrue(PySequence_Fast_GET_ITEM(seq, 0));
+    *stop_inclusive = PyObject_IsTrue(PySequence_Fast_GET_ITEM(seq, 1));
+    Py_DECREF(seq);
+    if(*start_inclusive == -1 || *stop_inclusive == -1) {
+        return -1;
+    }
+    return 0;
+}
+
+/**
+ * Position the cursor on the first record of the range between `start` and
+ * `stop`, or its last record if `reverse` is nonzero. Empty keys mean the
+ * start or end of the database. The cursor may be left on a record beyond the
+ * far end of the range, which the caller must check for. On failure set an
+ * exception and return -1.
+ */
+static int
+cursor_range_start(CursorObject *self, MDB_val *start, MDB_val *stop,
+                   int start_inclusive, int stop_inclusive, int reverse)
+{
+    MDB_dbi dbi = mdb_cursor_dbi(self->curs);
+
+    if(! reverse) {
+        if(! start->mv_size) {
+            return _cursor_get_c(self, MDB_FIRST);
+        }
+        self->key = *start;
+        if(_cursor_get_c(self, MDB_SET_RANGE)) {
+            return -1;
+        }
+        if(self->positioned && (! start_inclusive) &&
+           (! mdb_cmp(self->trans->txn, dbi, &self->key, start))) {
+            return _cursor_get_c(self, MDB_NEXT_NODUP);
+        }
+        return 0;
+    }
+
+    if(! stop->mv_size) {
+        return _cursor_get_c(self, MDB_LAST);
+    }
+    self->key = *stop;
+    if(_cursor_get_c(self, MDB_SET_RANGE)) {
+        return -1;
+    }
+    if(! self->positioned) {
+        return _cursor_get_c(self, MDB_LAST);
+    }
+    if(stop_inclusive &&
+       (! mdb_cmp(self->trans->txn, dbi, &self->key, stop))) {
+        if(self->dbi_flags & MDB_DUPSORT) {
+            return _cursor_get_c(self, MDB_LAST_DUP);
+        }
+        return 0;
+    }
+    return _cursor_get_c(self, MDB_PREV);
+}
+
+/**
+ * Shared between Cursor.delete_range() and Transaction.delete_range().
+ */
+static PyObject *
+do_delete_range(CursorObject *self, PyObject *start_obj, PyObject *stop_obj,
+                PyObject *inclusive)
+{
+    struct iter_bound bound = {{0, 0}, 0, 0, 0};
+    MDB_val start = {0, 0};
+    int start_inclusive = 1;
+    MDB_txn *txn = self->trans->txn;
+    MDB_dbi dbi = mdb_cursor_dbi(self->curs);
+    size_t count = 0;
+    char *scratch;
+    MDB_stat st;
+    int rc;
+
+    if(start_obj != Py_None && val_from_buffer(&start, start_obj)) {
+        return NULL;
+    }
+    if(stop_obj != Py_None && val_from_buffer(&bound.stop, stop_obj)) {
+        return NULL;
+    }
+    if(inclusive &&
+       parse_inclusive(inclusive, &start_inclusive, &bound.inclusive)) {
+        return NULL;
+    }
+
+    /* Emptying the database frees its pages without visiting records. The
+     * main database may also hold the records of named databases, which
+     * mdb_drop() would delete along with their contents. */
+    if(! (start.mv_size || bound.stop.mv_size ||
+          dbi == self->trans->env->main_db->dbi)) {
+        UNLOCKED(rc, mdb_stat(txn, dbi, &st));
+        if(! rc) {
+            UNLOCKED(rc, mdb_drop(txn, dbi, 0));
+        }
+        self->trans->mutations++;
+        self->positioned = 0;
+        self->key.mv_size = 0;
+        self->val.mv_size = 0;
+        if(rc) {
+            return err_set("mdb_drop", rc);
+        }
+        return PyLong_FromUnsignedLongLong(st.ms_entries);
+    }
+
+    if(cursor_range_start(self, &start, &bound.stop, start_inclusive,
+                          bound.inclusive, 0)) {
+        return NULL;
+    }
+    scratch = PyMem_Malloc(mdb_env_get_maxkeysize(self->trans->env->env));
+    if(! scratch) {
+        return PyErr_NoMemory();
+    }
+    rc = 0;
+    if(self->positioned) {
+        UNLOCKED(rc, delete_range_c(self->curs, &self->key, &self->val,
+                                    bound.stop.mv_size ? &bound : NULL,
+                                    scratch, &count));
+        self->trans->mutations++;
+        self->last_mutation = self->trans->mutations;
+        self->positioned = ! rc;
+        if(rc) {
+            self->key.mv_size = 0;
+            self->val.mv_size = 0;
+        }
+    }
+    PyMem_Free(scratch);
+    if(rc && rc != MDB_NOTFOUND) {
+        return err_set("mdb_cursor_del", rc);
+    }
+    return PyLong_FromUnsignedLongLong(count);
+}
+
+/**
+ * Cursor.delete_range() -> int
+ */
+static PyObject *
+cursor_delete_range(CursorObject *self, PyObject *args, PyObject *kwds)
+{
+    struct cursor_delete_range {
+        PyObject *start;
+        PyObject *stop;
+        PyObject *inclusive;
+    } arg = {Py_None, Py_None, NULL};
+
+    static const struct argspec argspec[] = {
+        {"start", ARG_OBJ, OFFSET(cursor_delete_range, start)},
+        {"stop", ARG_OBJ, OFFSET(cursor_delete_range, stop)},
+        {"inclusive", ARG_OBJ, OFFSET(cursor_delete_range, inclusive)}
+    };
+
+    static PyObject *cache = NULL;
+    if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
+        return NULL;
+    }
+    return do_delete_range(self, arg.start, arg.stop, arg.inclusive);
+}
+
+/**
+ * Cursor.iter_range() -> Iterator
+ */
+static PyObject *
+cursor_iter_range(CursorObject *self, PyObject *args, PyObject *kwds)
+{
+    struct cursor_iter_range {
+        PyObject *start;
+        PyObject *stop;
+        PyObject *inclusive;
+        int reverse;
+        size_t limit;
+        int keys;
+        int values;
+        size_t batch;
+    } arg = {Py_None, Py_None, NULL, 0, (size_t) -1, 1, 1, 0};
+
+    static const struct argspec argspec[] = {
+        {"start", ARG_OBJ, OFFSET(cursor_iter_range, start)},
+        {"stop", ARG_OBJ, OFFSET(cursor_iter_range, stop)},
+        {"inclusive", ARG_OBJ, OFFSET(cursor_iter_range, inclusive)},
+        {"reverse", ARG_BOOL, OFFSET(cursor_iter_range, reverse)},
+        {"limit", ARG_SIZE, OFFSET(cursor_iter_range, limit)},
+        {"keys", ARG_BOOL, OFFSET(cursor_iter_range, keys)},
+        {"values", ARG_BOOL, OFFSET(cursor_iter_range, values)},
+        {"batch", ARG_SIZE, OFFSET(cursor_iter_range, batch)}
+    };
+    MDB_val start = {0, 0};
+    MDB_val stop = {0, 0};
+    int start_inclusive = 1;
+    int stop_inclusive = 0;
+    enum MDB_cursor_op op;
+    IterObject *iter;
+    MDB_val *bound;
+
+    static PyObject *cache = NULL;
+    if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
+        return NULL;
+    }
+    if(arg.start != Py_None && val_from_buffer(&start, arg.start)) {
+        return NULL;
+    }
+    if(arg.stop != Py_None && val_from_buffer(&stop, arg.stop)) {
+        return NULL;
+    }
+    if(arg.inclusive &&
+       parse_inclusive(arg.inclusive, &start_inclusive, &stop_inclusive)) {
+        return NULL;
+    }
+    if(cursor_range_start(self, &start, &stop, start_inclusive,
+                          stop_inclusive, arg.reverse)) {
+        return NULL;
+    }
+    op = arg.reverse ? MDB_PREV : MDB_NEXT;
+    bound = arg.reverse ? &start : &stop;
+
+    iter = (IterObject *) new_iterator(self,
+        iter_val_func(arg.keys, arg.values), op);
+    if(iter) {
+        iter->batch = arg.batch;
+        iter->remaining = arg.limit;
+        iter->bound.inclusive = arg.reverse ? start_inclusive : stop_inclusive;
+        if(bound->mv_size && iter_set_bound(iter, bound)) {
+            Py_DECREF((PyObject *)iter);
+            return NULL;
+        }
+    }
+    return (PyObject *) iter;
+}
+
+/**
+ * Cursor.iter_prefix() -> Iterator
+ */
+static PyObject *
+cursor_iter_prefix(CursorObject *self, PyObject *args, PyObject *kwds)
+{
+    struct cursor_iter_prefix {
+        PyObject *prefix;
+        int keys;
+        int values;
+        int strip_prefix;
+        size_t batch;
+    } arg = {NULL, 1, 1, 0, 0};
+
+    static const struct argspec argspec[] = {
+        {"prefix", ARG_OBJ, OFFSET(cursor_iter_prefix, prefix)},
+        {"keys", ARG_BOOL, OFFSET(cursor_iter_prefix, keys)},
+        {"values", ARG_BOOL, OFFSET(cursor_iter_prefix, values)},
+        {"strip_prefix", ARG_BOOL, OFFSET(cursor_iter_prefix, strip_prefix)},
+        {"batch", ARG_SIZE, OFFSET(cursor_iter_prefix, batch)}
+    };
+    MDB_val prefix;
+    IterObject *iter;
+    int rc;
+
+    static PyObject *cache = NULL;
+    if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
+        return NULL;
+    }
+    if(! arg.prefix) {
+        return type_error("prefix must be given.");
+    }
+    /* Keys sharing a prefix are only adjacent in the default key order. */
+    if(self->dbi_flags & (MDB_REVERSEKEY|MDB_INTEGERKEY)) {
+        return err_set("Cursor.iter_prefix", MDB_INCOMPATIBLE);
+    }
+    if(val_from_buffer(&prefix, arg.prefix)) {
+        return NULL;
+    }
+
+    if(prefix.mv_size) {
+        self->key = prefix;
+        rc = _cursor_get_c(self, MDB_SET_RANGE);
+    } else {
+        rc = _cursor_get_c(self, MDB_FIRST);
+    }
+    if(rc) {
+        return NULL;
+    }
+
+    iter = (IterObject *) new_iterator(self,
+        iter_val_func(arg.keys, arg.values), MDB_NEXT);
+    if(iter) {
+        iter->batch = arg.batch;
+        iter->bound.prefix = 1;
+        iter->bound.strip = arg.strip_prefix ? prefix.mv_size : 0;
+        if(prefix.mv_size && iter_set_bound(iter, &prefix)) {
+            Py_DECREF((PyObject *)iter);
+            return NULL;
+        }
+    }
+    return (PyObject *) iter;
+}
+
+/**
+ * Cursor.iternext_multiple() -> Iterator
+ */
+static PyObject *
+cursor_iternext_multiple(CursorObject *self)
+{
+    if(! self->valid) {
+        return err_invalid();
+    }
+    return new_iterator(self, NULL, MDB_NEXT_MULTIPLE);
+}
+
 /**
  * Cursor._iter_from() -> Iterator
  */
@@ -2769,14 +4194,19 @@ static struct PyMethodDef cursor_methods[] = {
     {"__exit__", (PyCFunction)cursor_exit, METH_VARARGS},
     {"close", (PyCFunction)cursor_close, METH_NOARGS},
     {"count", (PyCFunction)cursor_count, METH_NOARGS},
-    {"delete", (PyCFunction)cursor_delete, METH_VARARGS|METH_KEYWORDS},
+    {"delete", (PyCFunction)cursor_delete, METH_FAST},
+    {"delete_range", (PyCFunction)cursor_delete_range, METH_VARARGS|METH_KEYWORDS},
     {"first", (PyCFunction)cursor_first, METH_NOARGS},
     {"first_dup", (PyCFunction)cursor_first_dup, METH_NOARGS},
-    {"get", (PyCFunction)cursor_get, METH_VARARGS|METH_KEYWORDS},
+    {"get", (PyCFunction)cursor_get, METH_FAST},
+    {"getmulti", (PyCFunction)cursor_getmulti, METH_VARARGS|METH_KEYWORDS},
     {"item", (PyCFunction)cursor_item, METH_NOARGS},
+    {"iter_prefix", (PyCFunction)cursor_iter_prefix, METH_VARARGS|METH_KEYWORDS},
+    {"iter_range", (PyCFunction)cursor_iter_range, METH_VARARGS|METH_KEYWORDS},
     {"iternext", (PyCFunction)cursor_iternext, METH_VARARGS|METH_KEYWORDS},
     {"iternext_dup", (PyCFunction)cursor_iternext_dup, METH_VARARGS|METH_KEYWORDS},
     {"iternext_nodup", (PyCFunction)cursor_iternext_nodup, METH_VARARGS|METH_KEYWORDS},
+    {"iternext_multiple", (PyCFunction)cursor_iternext_multiple, METH_NOARGS},
     {"iterprev", (PyCFunction)cursor_iterprev, METH_VARARGS|METH_KEYWORDS},
     {"iterprev_dup", (PyCFunction)cursor_iterprev_dup, METH_VARARGS|METH_KEYWORDS},
     {"iterprev_nodup", (PyCFunction)cursor_iterprev_nodup, METH_VARARGS|METH_KEYWORDS},
@@ -2789,14 +4219,17 @@ static struct PyMethodDef cursor_methods[] = {
     {"prev", (PyCFunction)cursor_prev, METH_NOARGS},
     {"prev_dup", (PyCFunction)cursor_prev_dup, METH_NOARGS},
     {"prev_nodup", (PyCFunction)cursor_prev_nodup, METH_NOARGS},
-    {"put", (PyCFunction)cursor_put, METH_VARARGS|METH_KEYWORDS},
+    {"put", (PyCFunction)cursor_put, METH_FAST},
     {"putmulti", (PyCFunction)cursor_put_multi, METH_VARARGS|METH_KEYWORDS},
-    {"replace", (PyCFunction)cursor_replace, METH_VARARGS|METH_KEYWORDS},
-    {"pop", (PyCFunction)cursor_pop, METH_VARARGS|METH_KEYWORDS},
+    {"putmulti_dup", (PyCFunction)cursor_put_multi_dup, METH_VARARGS|METH_KEYWORDS},
+    {"renew", (PyCFunction)cursor_renew, METH_VARARGS|METH_KEYWORDS},
+    {"replace", (PyCFunction)cursor_replace, METH_FAST},
+    {"pop", (PyCFunction)cursor_pop, METH_FAST},
     {"set_key", (PyCFunction)cursor_set_key, METH_O},
-    {"set_key_dup", (PyCFunction)cursor_set_key_dup, METH_VARARGS|METH_KEYWORDS},
+    {"set_key_dup", (PyCFunction)cursor_set_key_dup, METH_FAST},
     {"set_range", (PyCFunction)cursor_set_range, METH_O},
-    {"set_range_dup", (PyCFunction)cursor_set_range_dup, METH_VARARGS|METH_KEYWORDS},
+    {"set_range_dup", (PyCFunction)cursor_set_range_dup, METH_FAST},
+    {"to_array", (PyCFunction)cursor_to_array, METH_VARARGS|METH_KEYWORDS},
     {"value", (PyCFunction)cursor_value, METH_NOARGS},
     {"_iter_from", (PyCFunction)cursor_iter_from, METH_VARARGS},
     {NULL, NULL}
@@ -2858,6 +4291,7 @@ iter_dealloc(IterObject *self)
 {
     DEBUG("destroying iterator")
     Py_CLEAR(self->curs);
+    Py_CLEAR(self->stop_obj);
     PyObject_Del(self);
 }
 
@@ -2872,17 +4306,118 @@ iter_iter(IterObject *self)
 }
 
 /**
- * Iterator.next() -> result
+ * Iterator.next() for batch, bounded or limited iterators. Collects up to
+ * `batch` records with the GIL released once, then temporarily points the
+ * cursor at each of them in turn to produce the result using `val_func`.
+ * Unless `batch` is set, collects one record and returns it alone.
  */
 static PyObject *
-iter_next(IterObject *self)
+iter_next_batch(IterObject *self)
 {
-    if(! self->curs->valid) {
-        return err_invalid();
-    }
-    if(! self->curs->positioned) {
-        return NULL;
-    }
+    CursorObject *curs = self->curs;
+    PyObject *ret;
+    MDB_val pair[2];
+    MDB_val *keys;
+    MDB_val key;
+    MDB_val val;
+    size_t batch;
+    size_t count;
+    size_t i;
+    int rc;
+
+    batch = self->batch ? self->batch : 1;
+    if(batch > self->remaining) {
+        batch = self->remaining;
+    }
+    if(! batch) {
+        return NULL;
+    }
+
+    /* Must refresh `key` and `val` following mutation. */
+    if(curs->last_mutation != curs->trans->mutations &&
+       _cursor_get_c(curs, MDB_GET_CURRENT)) {
+        return NULL;
+    }
+    if(! curs->positioned) {
+        return NULL;
+    }
+    /* Second half holds the values. */
+    if(batch == 1) {
+        keys = pair;
+    } else if(batch > (PY_SSIZE_T_MAX / (2 * sizeof(MDB_val))) ||
+              (! ((keys = PyMem_Malloc(sizeof(MDB_val) * 2 * batch))))) {
+        return PyErr_NoMemory();
+    }
+
+    UNLOCKED(rc, iter_batch_c(curs->curs, self->op, self->started,
+                              &curs->key, &curs->val, keys, keys + batch,
+                              batch, self->bounded ? &self->bound : NULL,
+                              &count));
+    self->started = 1;
+    curs->positioned = rc == 0 || rc == ITER_BOUND_REACHED;
+    curs->last_mutation = curs->trans->mutations;
+    if(rc == ITER_BOUND_REACHED) {
+        self->remaining = 0;
+    } else if(self->remaining != (size_t) -1) {
+        self->remaining -= count;
+    }
+
+    ret = NULL;
+    if(rc && rc != MDB_NOTFOUND && rc != ITER_BOUND_REACHED) {
+        err_set("mdb_cursor_get", rc);
+    } else if(count && ((! self->batch) || (ret = PyList_New(count)))) {
+        key = curs->key;
+        val = curs->val;
+        for(i = 0; i < count; i++) {
+            PyObject *elt;
+            curs->key = keys[i];
+            curs->val = keys[batch + i];
+            if(! ((elt = self->val_func(curs)))) {
+                Py_CLEAR(ret);
+                break;
+            }
+            if(! self->batch) {
+                ret = elt;
+                break;
+            }
+            PyList_SET_ITEM(ret, i, elt);
+        }
+        curs->key = key;
+        curs->val = val;
+    }
+    if(! curs->positioned) {
+        curs->key.mv_size = 0;
+        curs->val.mv_size = 0;
+    }
+    if(keys != pair) {
+        PyMem_Free(keys);
+    }
+    return ret;
+}
+
+/**
+ * Iterator.next() -> result
+ */
+static PyObject *
+iter_next(IterObject *self)
+{
+    if(! self->curs->valid) {
+        return err_invalid();
+    }
+    if(! self->curs->positioned) {
+        return NULL;
+    }
+
+    if(self->batch || self->bounded || self->remaining != (size_t) -1) {
+        return iter_next_batch(self);
+    }
+    if(self->op == MDB_NEXT_MULTIPLE) {
+        if(! self->started) {
+            self->started = 1;
+            return cursor_get_multiple(self->curs, MDB_GET_MULTIPLE);
+        }
+        return cursor_get_multiple(self->curs, MDB_NEXT_MULTIPLE);
+    }
 
     if(self->started) {
         if(_cursor_get_c(self->curs, self->op)) {
@@ -3041,6 +4576,7 @@ trans_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
 static PyObject *
 trans_abort(TransObject *self)
 {
+    self->flags &= ~TRANS_RESET;
     if(self->valid) {
         DEBUG("invalidate")
         INVALIDATE(self)
@@ -3072,6 +4608,7 @@ trans_commit(TransObject *self)
 {
     int rc;
 
+    self->flags &= ~TRANS_RESET;
     if(! self->valid) {
         return err_invalid();
     }
@@ -3093,157 +4630,655 @@ trans_commit(TransObject *self)
             return err_set("mdb_txn_commit", rc);
         }
     }
-    self->valid = 0;
-    Py_RETURN_NONE;
+    self->valid = 0;
+    Py_RETURN_NONE;
+}
+
+/**
+ * Renew a read-only transaction left reset by reset(), commit() or abort(),
+ * along with any cursors that survived the reset, leaving them unpositioned.
+ * Returns 0 on success or sets an exception and returns -1.
+ */
+static int
+trans_renew_txn(TransObject *self)
+{
+    struct lmdb_object *child;
+    CursorObject *curs;
+    int rc;
+
+    if(! (self->env && self->txn && (self->flags & TRANS_SPARE))) {
+        err_invalid();
+        return -1;
+    }
+    RECORD_UNLOCKED(self->env, rc, mdb_txn_renew(self->txn));
+    if(rc) {
+        err_set("mdb_txn_renew", rc);
+        return -1;
+    }
+    self->flags &= ~(TRANS_SPARE | TRANS_RESET);
+    self->valid = 1;
+    self->mutations++;
+
+    for(child = self->children.next; child; child = child->siblings.next) {
+        if(Py_TYPE(child) != &PyCursor_Type || !child->valid) {
+            continue;
+        }
+        curs = (CursorObject *) child;
+        if((rc = mdb_cursor_renew(self->txn, curs->curs))) {
+            err_set("mdb_cursor_renew", rc);
+            return -1;
+        }
+        curs->positioned = 0;
+        curs->key.mv_size = 0;
+        curs->val.mv_size = 0;
+        curs->last_mutation = self->mutations;
+    }
+    return 0;
+}
+
+/**
+ * Transaction.reset()
+ */
+static PyObject *
+trans_reset(TransObject *self)
+{
+    if(! self->valid) {
+        return err_invalid();
+    }
+    if(! (self->flags & TRANS_RDONLY)) {
+        return err_set("Only read-only transactions can be reset.", EINVAL);
+    }
+#ifdef HAVE_MEMSINK
+    ms_notify((PyObject *) self, &self->sink_head);
+#endif
+    mdb_txn_reset(self->txn);
+    self->flags |= TRANS_SPARE | TRANS_RESET;
+    self->valid = 0;
+    /* Force cursors to refresh, failing until renewed, rather than return
+     * keys and values from the released snapshot. */
+    self->mutations++;
+    Py_RETURN_NONE;
+}
+
+/**
+ * Transaction.renew()
+ */
+static PyObject *
+trans_renew(TransObject *self)
+{
+    if(! (self->flags & TRANS_RESET)) {
+        return err_set("Transaction must be reset before renewing.", EINVAL);
+    }
+    if(trans_renew_txn(self)) {
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+/**
+ * Transaction.estimate_range() -> int
+ */
+static PyObject *
+trans_estimate_range(TransObject *self, PyObject *args, PyObject *kwds)
+{
+    struct trans_estimate_range {
+        PyObject *start;
+        PyObject *stop;
+        PyObject *inclusive;
+        DbObject *db;
+    } arg = {Py_None, Py_None, NULL, self->db};
+
+    static const struct argspec argspec[] = {
+        {"start", ARG_OBJ, OFFSET(trans_estimate_range, start)},
+        {"stop", ARG_OBJ, OFFSET(trans_estimate_range, stop)},
+        {"inclusive", ARG_OBJ, OFFSET(trans_estimate_range, inclusive)},
+        {"db", ARG_DB, OFFSET(trans_estimate_range, db)}
+    };
+    struct iter_bound bound = {{0, 0}, 0, 0, 0};
+    MDB_val start = {0, 0};
+    int start_inclusive = 1;
+    CursorObject *cursor;
+    MDB_stat st;
+    size_t count = 0;
+    double estimate;
+    int rc;
+
+    static PyObject *cache = NULL;
+    if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
+        return NULL;
+    }
+    if(! db_owner_check(arg.db, self->env)) {
+        return NULL;
+    }
+    if(arg.start != Py_None && val_from_buffer(&start, arg.start)) {
+        return NULL;
+    }
+    if(arg.stop != Py_None && val_from_buffer(&bound.stop, arg.stop)) {
+        return NULL;
+    }
+    if(arg.inclusive &&
+       parse_inclusive(arg.inclusive, &start_inclusive, &bound.inclusive)) {
+        return NULL;
+    }
+
+    if(! ((cursor = (CursorObject *) make_cursor(arg.db, self)))) {
+        return NULL;
+    }
+    if(cursor_range_start(cursor, &start, &bound.stop, start_inclusive,
+                          bound.inclusive, 0)) {
+        Py_DECREF((PyObject *)cursor);
+        return NULL;
+    }
+
+    /* Small ranges are counted exactly, larger ones estimated. */
+    rc = 0;
+    if(cursor->positioned) {
+        UNLOCKED(rc, iter_batch_c(cursor->curs, MDB_NEXT, 0, &cursor->key,
+                                  &cursor->val, NULL, NULL, ESTIMATE_EXACT,
+                                  bound.stop.mv_size ? &bound : NULL,
+                                  &count));
+    }
+    if(! rc && count == ESTIMATE_EXACT) {
+        UNLOCKED(rc, mdb_stat(self->txn, arg.db->dbi, &st));
+        if(! rc) {
+            UNLOCKED(rc, estimate_c(cursor->curs, st.ms_entries,
+                                    start.mv_size ? &start : NULL,
+                                    start_inclusive,
+                                    bound.stop.mv_size ? &bound.stop : NULL,
+                                    bound.inclusive, &estimate));
+        }
+        if(! rc) {
+            /* The range holds at least the records already counted. */
+            count = (estimate > (double) count) ? (size_t) estimate : count;
+        }
+    }
+    Py_DECREF((PyObject *)cursor);
+    if(rc && rc != MDB_NOTFOUND && rc != ITER_BOUND_REACHED) {
+        return err_set("mdb_cursor_get", rc);
+    }
+    return PyLong_FromUnsignedLongLong(count);
+}
+
+/**
+ * Transaction.cursor() -> Cursor
+ */
+static PyObject *
+trans_cursor(TransObject *self, FAST_ARGS)
+{
+    struct trans_cursor {
+        DbObject *db;
+    } arg = {self->db};
+
+    static const struct argspec argspec[] = {
+        {"db", ARG_DB, OFFSET(trans_cursor, db)}
+    };
+
+    static PyObject *cache = NULL;
+    if(PARSE_FAST(self->valid, &arg)) {
+        return NULL;
+    }
+    return make_cursor(arg.db, self);
+}
+
+/**
+ * Transaction.delete() -> bool
+ */
+static PyObject *
+trans_delete(TransObject *self, FAST_ARGS)
+{
+    struct trans_delete {
+        MDB_val key;
+        MDB_val val;
+        DbObject *db;
+    } arg = {{0, 0}, {0, 0}, self->db};
+
+    static const struct argspec argspec[] = {
+        {"key", ARG_BUF, OFFSET(trans_delete, key)},
+        {"value", ARG_BUF, OFFSET(trans_delete, val)},
+        {"db", ARG_DB, OFFSET(trans_delete, db)}
+    };
+    MDB_val *val_ptr;
+    int rc;
+
+    static PyObject *cache = NULL;
+    if(PARSE_FAST(self->valid, &arg)) {
+        return NULL;
+    }
+    if(! db_owner_check(arg.db, self->env)) {
+        return NULL;
+    }
+    val_ptr = arg.val.mv_size ? &arg.val : NULL;
+    self->mutations++;
+    RECORD_UNLOCKED(self->env, rc,
+                    mdb_del(self->txn, arg.db->dbi, &arg.key, val_ptr));
+    if(rc) {
+        if(rc == MDB_NOTFOUND) {
+             Py_RETURN_FALSE;
+        }
+        return err_set("mdb_del", rc);
+    }
+    Py_RETURN_TRUE;
+}
+
+/**
+ * Transaction.delete_range() -> int
+ */
+static PyObject *
+trans_delete_range(TransObject *self, PyObject *args, PyObject *kwds)
+{
+    struct trans_delete_range {
+        PyObject *start;
+        PyObject *stop;
+        PyObject *inclusive;
+        DbObject *db;
+    } arg = {Py_None, Py_None, NULL, self->db};
+
+    static const struct argspec argspec[] = {
+        {"start", ARG_OBJ, OFFSET(trans_delete_range, start)},
+        {"stop", ARG_OBJ, OFFSET(trans_delete_range, stop)},
+        {"inclusive", ARG_OBJ, OFFSET(trans_delete_range, inclusive)},
+        {"db", ARG_DB, OFFSET(trans_delete_range, db)}
+    };
+    CursorObject *cursor;
+    PyObject *ret;
+
+    static PyObject *cache = NULL;
+    if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
+        return NULL;
+    }
+    if(! db_owner_check(arg.db, self->env)) {
+        return NULL;
+    }
+    if(! ((cursor = (CursorObject *) make_cursor(arg.db, self)))) {
+        return NULL;
+    }
+    ret = do_delete_range(cursor, arg.start, arg.stop, arg.inclusive);
+    Py_DECREF((PyObject *)cursor);
+    return ret;
+}
+
+/**
+ * Transaction.drop(db)
+ */
+static PyObject *
+trans_drop(TransObject *self, PyObject *args, PyObject *kwds)
+{
+    struct trans_drop {
+        DbObject *db;
+        int delete;
+    } arg = {NULL, 1};
+
+    static const struct argspec argspec[] = {
+        {"db", ARG_DB, OFFSET(trans_drop, db)},
+        {"delete", ARG_BOOL, OFFSET(trans_drop, delete)}
+    };
+    int rc;
+
+    static PyObject *cache = NULL;
+    if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
+        return NULL;
+    }
+    if(! arg.db) {
+        return type_error("'db' argument required.");
+    } else if(! db_owner_check(arg.db, self->env)) {
+        return NULL;
+    }
+
+    UNLOCKED(rc, mdb_drop(self->txn, arg.db->dbi, arg.delete));
+    self->mutations++;
+    if(rc) {
+        return err_set("mdb_drop", rc);
+    }
+    Py_RETURN_NONE;
+}
+
+/**
+ * Transaction.get() -> result
+ */
+static PyObject *
+trans_get(TransObject *self, FAST_ARGS)
+{
+    struct trans_get {
+        MDB_val key;
+        PyObject *default_;
+        DbObject *db;
+    } arg = {{0, 0}, Py_None, self->db};
+
+    static const struct argspec argspec[] = {
+        {"key", ARG_BUF, OFFSET(trans_get, key)},
+        {"default", ARG_OBJ, OFFSET(trans_get, default_)},
+        {"db", ARG_DB, OFFSET(trans_get, db)}
+    };
+    MDB_val val;
+    int rc;
+
+    static PyObject *cache = NULL;
+    if(PARSE_FAST(self->valid, &arg)) {
+        return NULL;
+    }
+    if(! db_owner_check(arg.db, self->env)) {
+        return NULL;
+    }
+
+    if(! arg.key.mv_data) {
+        return type_error("key must be given.");
+    }
+
+    READ_UNLOCKED(self->env, rc,
+                  mdb_get(self->txn, arg.db->dbi, &arg.key, &val), &val);
+
+    if(rc) {
+        if(rc == MDB_NOTFOUND) {
+            Py_INCREF(arg.default_);
+            return arg.default_;
+        }
+        return err_set("mdb_get", rc);
+    }
+    return obj_from_val(&val, self->flags & TRANS_BUFFERS);
 }
 
 /**
- * Transaction.cursor() -> Cursor
+ * Transaction.getmulti() -> list
  */
 static PyObject *
-trans_cursor(TransObject *self, PyObject *args, PyObject *kwds)
+trans_getmulti(TransObject *self, PyObject *args, PyObject *kwds)
 {
-    struct trans_cursor {
+    struct trans_getmulti {
+        PyObject *keys;
+        PyObject *default_;
         DbObject *db;
-    } arg = {self->db};
+        int sorted_lookup;
+    } arg = {NULL, Py_None, self->db, 0};
 
     static const struct argspec argspec[] = {
-        {"db", ARG_DB, OFFSET(trans_cursor, db)}
+        {"keys", ARG_OBJ, OFFSET(trans_getmulti, keys)},
+        {"default", ARG_OBJ, OFFSET(trans_getmulti, default_)},
+        {"db", ARG_DB, OFFSET(trans_getmulti, db)},
+        {"sorted_lookup", ARG_BOOL, OFFSET(trans_getmulti, sorted_lookup)}
     };
 
     static PyObject *cache = NULL;
     if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
         return NULL;
     }
-    return make_cursor(arg.db, self);
+    if(! db_owner_check(arg.db, self->env)) {
+        return NULL;
+    }
+    if(! arg.keys) {
+        return type_error("keys must be given.");
+    }
+    return do_getmulti(NULL, self->txn, arg.db->dbi, arg.keys, arg.default_,
+                       arg.sorted_lookup, self->flags & TRANS_BUFFERS);
 }
 
 /**
- * Transaction.delete() -> bool
+ * Parse an incr() delta, returning 0 on success or setting an exception and
+ * returning -1 on error.
  */
-static PyObject *
-trans_delete(TransObject *self, PyObject *args, PyObject *kwds)
+static int
+incr_parse(PyObject *obj, int64_t *delta)
 {
-    struct trans_delete {
-        MDB_val key;
-        MDB_val val;
-        DbObject *db;
-    } arg = {{0, 0}, {0, 0}, self->db};
+    long long l = PyLong_AsLongLong(obj);
+    if(l == -1 && PyErr_Occurred()) {
+        return -1;
+    }
+    *delta = (int64_t) l;
+    return 0;
+}
 
-    static const struct argspec argspec[] = {
-        {"key", ARG_BUF, OFFSET(trans_delete, key)},
-        {"value", ARG_BUF, OFFSET(trans_delete, val)},
-        {"db", ARG_DB, OFFSET(trans_delete, db)}
-    };
-    MDB_val *val_ptr;
-    int rc;
+/**
+ * Check an incr() width, setting an exception and returning -1 if it is
+ * unsupported.
+ */
+static int
+incr_check_width(int width)
+{
+    if(width == 1 || width == 2 || width == 4 || width == 8) {
+        return 0;
+    }
+    PyErr_Format(PyExc_ValueError, "width must be 1, 2, 4 or 8");
+    return -1;
+}
 
-    static PyObject *cache = NULL;
-    if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
-        return NULL;
+/**
+ * Check an incr() key, setting BadValsizeError and returning -1 if LMDB would
+ * reject it, before any value is changed. `index` is the key's position in
+ * incr_many(), or -1 for incr().
+ */
+static int
+incr_check_key(EnvObject *env, MDB_val *key, Py_ssize_t index)
+{
+    int max = mdb_env_get_maxkeysize(env->env);
+
+    if(key->mv_size && key->mv_size <= (size_t) max) {
+        return 0;
     }
-    if(! db_owner_check(arg.db, self->env)) {
+    if(index < 0) {
+        err_format(MDB_BAD_VALSIZE, "incr: key must be 1 to %d bytes", max);
+    } else {
+        err_format(MDB_BAD_VALSIZE,
+                   "incr_many() element #%d: key must be 1 to %d bytes",
+                   (int) index, max);
+    }
+    return -1;
+}
+
+/**
+ * Raise an exception for an incr_c() error, described by a format string.
+ */
+static void * NOINLINE
+incr_error(int rc, const char *fmt, ...)
+{
+    char buf[128];
+    va_list ap;
+    va_start(ap, fmt);
+    vsnprintf(buf, sizeof buf, fmt, ap);
+    buf[sizeof buf - 1] = '\0';
+    va_end(ap);
+    if(rc == ERANGE) {
+        PyErr_Format(PyExc_OverflowError, "%s: result out of range", buf);
         return NULL;
     }
-    val_ptr = arg.val.mv_size ? &arg.val : NULL;
-    self->mutations++;
-    UNLOCKED(rc, mdb_del(self->txn, arg.db->dbi, &arg.key, val_ptr));
-    if(rc) {
-        if(rc == MDB_NOTFOUND) {
-             Py_RETURN_FALSE;
-        }
-        return err_set("mdb_del", rc);
+    return err_set(buf, rc);
+}
+
+static PyObject *
+incr_result(uint64_t v, int is_signed)
+{
+    if(is_signed) {
+        return PyLong_FromLongLong((long long) (int64_t) v);
     }
-    Py_RETURN_TRUE;
+    return PyLong_FromUnsignedLongLong(v);
 }
 
 /**
- * Transaction.drop(db)
+ * Transaction.incr() -> int
  */
 static PyObject *
-trans_drop(TransObject *self, PyObject *args, PyObject *kwds)
+trans_incr(TransObject *self, PyObject *args, PyObject *kwds)
 {
-    struct trans_drop {
+    struct trans_incr {
+        MDB_val key;
+        PyObject *delta;
         DbObject *db;
-        int delete;
-    } arg = {NULL, 1};
+        int width;
+        int is_signed;
+        int big_endian;
+    } arg = {{0, 0}, NULL, self->db, 8, 1, 0};
 
     static const struct argspec argspec[] = {
-        {"db", ARG_DB, OFFSET(trans_drop, db)},
-        {"delete", ARG_BOOL, OFFSET(trans_drop, delete)}
+        {"key", ARG_BUF, OFFSET(trans_incr, key)},
+        {"delta", ARG_OBJ, OFFSET(trans_incr, delta)},
+        {"db", ARG_DB, OFFSET(trans_incr, db)},
+        {"width", ARG_INT, OFFSET(trans_incr, width)},
+        {"signed", ARG_BOOL, OFFSET(trans_incr, is_signed)},
+        {"big_endian", ARG_BOOL, OFFSET(trans_incr, big_endian)}
     };
+    int64_t delta = 1;
+    uint64_t result;
+    size_t done;
     int rc;
 
     static PyObject *cache = NULL;
     if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
         return NULL;
     }
-    if(! arg.db) {
-        return type_error("'db' argument required.");
-    } else if(! db_owner_check(arg.db, self->env)) {
+    if(! db_owner_check(arg.db, self->env)) {
+        return NULL;
+    }
+    if(incr_check_width(arg.width) ||
+       incr_check_key(self->env, &arg.key, -1) ||
+       (arg.delta && incr_parse(arg.delta, &delta))) {
         return NULL;
     }
 
-    UNLOCKED(rc, mdb_drop(self->txn, arg.db->dbi, arg.delete));
     self->mutations++;
+    RECORD_UNLOCKED(self->env, rc,
+                    incr_many_c(self->txn, arg.db->dbi, &arg.key, &delta, 1,
+                                arg.width, arg.is_signed, arg.big_endian,
+                                &result, &done));
     if(rc) {
-        return err_set("mdb_drop", rc);
+        return incr_error(rc, "incr");
     }
-    Py_RETURN_NONE;
+    return incr_result(result, arg.is_signed);
 }
 
 /**
- * Transaction.get() -> result
+ * Transaction.incr_many() -> list
  */
 static PyObject *
-trans_get(TransObject *self, PyObject *args, PyObject *kwds)
+trans_incr_many(TransObject *self, PyObject *args, PyObject *kwds)
 {
-    struct trans_get {
-        MDB_val key;
-        PyObject *default_;
+    struct trans_incr_many {
+        PyObject *items;
         DbObject *db;
-    } arg = {{0, 0}, Py_None, self->db};
+        int width;
+        int is_signed;
+        int big_endian;
+    } arg = {NULL, self->db, 8, 1, 0};
 
     static const struct argspec argspec[] = {
-        {"key", ARG_BUF, OFFSET(trans_get, key)},
-        {"default", ARG_OBJ, OFFSET(trans_get, default_)},
-        {"db", ARG_DB, OFFSET(trans_get, db)}
+        {"items", ARG_OBJ, OFFSET(trans_incr_many, items)},
+        {"db", ARG_DB, OFFSET(trans_incr_many, db)},
+        {"width", ARG_INT, OFFSET(trans_incr_many, width)},
+        {"signed", ARG_BOOL, OFFSET(trans_incr_many, is_signed)},
+        {"big_endian", ARG_BOOL, OFFSET(trans_incr_many, big_endian)}
     };
-    MDB_val val;
+    PyObject *items;
+    PyObject *pairs;
+    PyObject *list = NULL;
+    MDB_val *keys;
+    int64_t *deltas;
+    uint64_t *results;
+    Py_ssize_t count;
+    Py_ssize_t i;
+    size_t done;
+    int immutable = 1;
     int rc;
 
     static PyObject *cache = NULL;
     if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
         return NULL;
     }
+    if(! arg.items) {
+        return type_error("items argument required.");
+    }
     if(! db_owner_check(arg.db, self->env)) {
         return NULL;
     }
+    if(incr_check_width(arg.width)) {
+        return NULL;
+    }
 
-    if(! arg.key.mv_data) {
-        return type_error("key must be given.");
+    if(PyDict_Check(arg.items)) {
+        items = PyDict_Items(arg.items);
+    } else if(PyObject_HasAttrString(arg.items, "items")) {
+        items = PyObject_CallMethod(arg.items, "items", NULL);
+    } else {
+        Py_INCREF(arg.items);
+        items = arg.items;
+    }
+    if(! items) {
+        return NULL;
+    }
+    /* A tuple holds references to every key while the GIL is released. */
+    pairs = PySequence_Tuple(items);
+    Py_DECREF(items);
+    if(! pairs) {
+        return NULL;
     }
 
-    Py_BEGIN_ALLOW_THREADS
-    rc = mdb_get(self->txn, arg.db->dbi, &arg.key, &val);
-    preload(rc, val.mv_data, val.mv_size);
-    Py_END_ALLOW_THREADS
+    count = PyTuple_GET_SIZE(pairs);
+    keys = PyMem_Malloc(sizeof(MDB_val) * (count + 1));
+    deltas = PyMem_Malloc(sizeof(int64_t) * (count + 1));
+    results = PyMem_Malloc(sizeof(uint64_t) * (count + 1));
+    if(! (keys && deltas && results)) {
+        PyErr_NoMemory();
+        goto out;
+    }
+
+    for(i = 0; i < count; i++) {
+        PyObject *pair = PyTuple_GET_ITEM(pairs, i);
+        if(! (PyTuple_Check(pair) && PyTuple_GET_SIZE(pair) == 2)) {
+            type_error("items must be (key, delta) tuples.");
+            goto out;
+        }
+        immutable &= PyBytes_CheckExact(PyTuple_GET_ITEM(pair, 0));
+        if(val_from_buffer(keys + i, PyTuple_GET_ITEM(pair, 0)) ||
+           incr_check_key(self->env, keys + i, i) ||
+           incr_parse(PyTuple_GET_ITEM(pair, 1), deltas + i)) {
+            goto out;
+        }
+    }
 
+    self->mutations++;
+    if(immutable) {
+        UNLOCKED(rc, incr_many_c(self->txn, arg.db->dbi, keys, deltas, count,
+                                 arg.width, arg.is_signed, arg.big_endian,
+                                 results, &done));
+    } else {
+        /* Other buffers may change while the GIL is released. */
+        rc = 0;
+        for(i = 0; i < count; i++) {
+            UNLOCKED(rc, incr_many_c(self->txn, arg.db->dbi, keys + i,
+                                     deltas + i, 1, arg.width, arg.is_signed,
+                                     arg.big_endian, results + i, &done));
+            if(rc) {
+                break;
+            }
+        }
+        done = i;
+    }
     if(rc) {
-        if(rc == MDB_NOTFOUND) {
-            Py_INCREF(arg.default_);
-            return arg.default_;
+        incr_error(rc, "incr_many() element #%d", (int) done);
+        goto out;
+    }
+
+    if(! ((list = PyList_New(count)))) {
+        goto out;
+    }
+    for(i = 0; i < count; i++) {
+        PyObject *v = incr_result(results[i], arg.is_signed);
+        if(! v) {
+            Py_CLEAR(list);
+            break;
         }
-        return err_set("mdb_get", rc);
+        PyList_SET_ITEM(list, i, v);
     }
-    return obj_from_val(&val, self->flags & TRANS_BUFFERS);
+
+out:
+    Py_DECREF(pairs);
+    PyMem_Free(keys);
+    PyMem_Free(deltas);
+    PyMem_Free(results);
+    return list;
 }
 
 /**
  * Transaction.put() -> bool
  */
 static PyObject *
-trans_put(TransObject *self, PyObject *args, PyObject *kwds)
+trans_put(TransObject *self, FAST_ARGS)
 {
     struct trans_put {
         MDB_val key;
@@ -3266,7 +5301,7 @@ trans_put(TransObject *self, PyObject *args, PyObject *kwds)
     int rc;
 
     static PyObject *cache = NULL;
-    if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
+    if(PARSE_FAST(self->valid, &arg)) {
         return NULL;
     }
     if(! db_owner_check(arg.db, self->env)) {
@@ -3291,8 +5326,8 @@ trans_put(TransObject *self, PyObject *args, PyObject *kwds)
         (int)arg.value.mv_size)
 
     self->mutations++;
-    UNLOCKED(rc, mdb_put(self->txn, (arg.db)->dbi,
-                         &arg.key, &arg.value, flags));
+    RECORD_UNLOCKED(self->env, rc, mdb_put(self->txn, (arg.db)->dbi,
+                                           &arg.key, &arg.value, flags));
     if(rc) {
         if(rc == MDB_KEYEXIST) {
             Py_RETURN_FALSE;
@@ -3307,11 +5342,96 @@ make_cursor(DbObject *db, TransObject *trans);
 static PyObject *
 do_cursor_replace(CursorObject *self, MDB_val *key, MDB_val *val);
 
+/**
+ * Shared by Transaction.put_if() and Transaction.delete_if(). `val` is NULL
+ * to delete, and `expected` is None if the key must not exist.
+ */
+static PyObject *
+trans_cas(TransObject *self, DbObject *db, MDB_val *key, MDB_val *val,
+          PyObject *expected)
+{
+    MDB_val exp_val;
+    int rc;
+
+    if(! db_owner_check(db, self->env)) {
+        return NULL;
+    }
+    if(expected != Py_None && val_from_buffer(&exp_val, expected)) {
+        return NULL;
+    }
+
+    self->mutations++;
+    RECORD_UNLOCKED(self->env, rc, cas_c(self->txn, db->dbi, key, val,
+                    (expected == Py_None) ? NULL : &exp_val));
+    if(rc) {
+        if(rc == MDB_NOTFOUND) {
+            Py_RETURN_FALSE;
+        }
+        return err_set(val ? "put_if" : "delete_if", rc);
+    }
+    Py_RETURN_TRUE;
+}
+
+/**
+ * Transaction.put_if() -> bool
+ */
+static PyObject *
+trans_put_if(TransObject *self, PyObject *args, PyObject *kwds)
+{
+    struct trans_put_if {
+        MDB_val key;
+        MDB_val value;
+        PyObject *expected;
+        DbObject *db;
+    } arg = {{0, 0}, {0, 0}, Py_None, self->db};
+
+    static const struct argspec argspec[] = {
+        {"key", ARG_BUF, OFFSET(trans_put_if, key)},
+        {"value", ARG_BUF, OFFSET(trans_put_if, value)},
+        {"expected", ARG_OBJ, OFFSET(trans_put_if, expected)},
+        {"db", ARG_DB, OFFSET(trans_put_if, db)}
+    };
+
+    static PyObject *cache = NULL;
+    if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
+        return NULL;
+    }
+    return trans_cas(self, arg.db, &arg.key, &arg.value, arg.expected);
+}
+
+/**
+ * Transaction.delete_if() -> bool
+ */
+static PyObject *
+trans_delete_if(TransObject *self, PyObject *args, PyObject *kwds)
+{
+    struct trans_delete_if {
+        MDB_val key;
+        PyObject *expected;
+        DbObject *db;
+    } arg = {{0, 0}, Py_None, self->db};
+
+    static const struct argspec argspec[] = {
+        {"key", ARG_BUF, OFFSET(trans_delete_if, key)},
+        {"expected", ARG_OBJ, OFFSET(trans_delete_if, expected)},
+        {"db", ARG_DB, OFFSET(trans_delete_if, db)}
+    };
+
+    static PyObject *cache = NULL;
+    if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
+        return NULL;
+    }
+    if(arg.expected == Py_None) {
+        return type_error("expected argument required.");
+    }
+    return trans_cas(self, arg.db, &arg.key, NULL, arg.expected);
+}
+
 /**
  * Transaction.replace() -> None|result
  */
 static PyObject *
-trans_replace(TransObject *self, PyObject *args, PyObject *kwds)
+trans_replace(TransObject *self, FAST_ARGS)
 {
     struct trans_replace {
         MDB_val key;
@@ -3328,7 +5448,7 @@ trans_replace(TransObject *self, PyObject *args, PyObject *kwds)
     CursorObject *cursor;
 
     static PyObject *cache = NULL;
-    if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
+    if(PARSE_FAST(self->valid, &arg)) {
         return NULL;
     }
     if(! db_owner_check(arg.db, self->env)) {
@@ -3351,7 +5471,7 @@ _cursor_get_c(CursorObject *self, enum MDB_cursor_op op);
  * Transaction.pop() -> None|result
  */
 static PyObject *
-trans_pop(TransObject *self, PyObject *args, PyObject *kwds)
+trans_pop(TransObject *self, FAST_ARGS)
 {
     struct trans_pop {
         MDB_val key;
@@ -3367,7 +5487,7 @@ trans_pop(TransObject *self, PyObject *args, PyObject *kwds)
     int rc;
 
     static PyObject *cache = NULL;
-    if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
+    if(PARSE_FAST(self->valid, &arg)) {
         return NULL;
     }
     if(! db_owner_check(arg.db, self->env)) {
@@ -3392,7 +5512,7 @@ trans_pop(TransObject *self, PyObject *args, PyObject *kwds)
         return NULL;
     }
 
-    UNLOCKED(rc, mdb_cursor_del(cursor->curs, 0));
+    RECORD_UNLOCKED(self->env, rc, mdb_cursor_del(cursor->curs, 0));
     Py_DECREF((PyObject *)cursor);
     self->mutations++;
     if(rc) {
@@ -3408,7 +5528,12 @@ trans_pop(TransObject *self, PyObject *args, PyObject *kwds)
 static PyObject *trans_enter(TransObject *self)
 {
     if(! self->valid) {
-        return err_invalid();
+        if(! (self->flags & TRANS_SESSION)) {
+            return err_invalid();
+        }
+        if(trans_renew_txn(self)) {
+            return NULL;
+        }
     }
     Py_INCREF(self);
     return (PyObject *)self;
@@ -3420,6 +5545,10 @@ static PyObject *trans_enter(TransObject *self)
 static PyObject *trans_exit(TransObject *self, PyObject *args)
 {
     if(! self->valid) {
+        if(self->flags & TRANS_SESSION) {
+            /* Already reset by commit() or abort(). */
+            Py_RETURN_NONE;
+        }
         return err_invalid();
     }
     if(PyTuple_GET_ITEM(args, 0) == Py_None) {
@@ -3475,19 +5604,98 @@ trans_stat(TransObject *self, PyObject *args, PyObject *kwds)
     return dict_from_fields(&st, mdb_stat_fields);
 }
 
+/**
+ * Transaction.split_points() -> list
+ */
+static PyObject *
+trans_split_points(TransObject *self, PyObject *args, PyObject *kwds)
+{
+    struct trans_split_points {
+        size_t n;
+        DbObject *db;
+    } arg = {0, self->db};
+
+    static const struct argspec argspec[] = {
+        {"n", ARG_SIZE, OFFSET(trans_split_points, n)},
+        {"db", ARG_DB, OFFSET(trans_split_points, db)}
+    };
+    CursorObject *cursor;
+    PyObject *list;
+    MDB_val *points;
+    MDB_stat st;
+    size_t count;
+    size_t i;
+    int rc;
+
+    static PyObject *cache = NULL;
+    if(parse_args(self->valid, SPECSIZE(), argspec, &cache, args, kwds, &arg)) {
+        return NULL;
+    }
+    if(! db_owner_check(arg.db, self->env)) {
+        return NULL;
+    }
+
+    UNLOCKED(rc, mdb_stat(self->txn, arg.db->dbi, &st));
+    if(rc) {
+        return err_set("mdb_stat", rc);
+    }
+    if(arg.n < 2 || st.ms_entries < 2) {
+        return PyList_New(0);
+    }
+    /* More ranges than records would only repeat keys. */
+    if(arg.n > st.ms_entries) {
+        arg.n = st.ms_entries;
+    }
+    if(! ((points = PyMem_Malloc(sizeof(MDB_val) * (arg.n - 1))))) {
+        return PyErr_NoMemory();
+    }
+    if(! ((cursor = (CursorObject *) make_cursor(arg.db, self)))) {
+        PyMem_Free(points);
+        return NULL;
+    }
+
+    UNLOCKED(rc, split_c(cursor->curs, st.ms_entries, arg.n, points, &count));
+    list = NULL;
+    if(rc) {
+        err_set("mdb_cursor_get", rc);
+    } else if((list = PyList_New(count))) {
+        for(i = 0; i < count; i++) {
+            PyObject *key = obj_from_val(&points[i], 0);
+            if(! key) {
+                Py_CLEAR(list);
+                break;
+            }
+            PyList_SET_ITEM(list, i, key);
+        }
+    }
+    Py_DECREF((PyObject *)cursor);
+    PyMem_Free(points);
+    return list;
+}
+
 static struct PyMethodDef trans_methods[] = {
     {"__enter__", (PyCFunction)trans_enter, METH_NOARGS},
     {"__exit__", (PyCFunction)trans_exit, METH_VARARGS},
     {"abort", (PyCFunction)trans_abort, METH_NOARGS},
     {"commit", (PyCFunction)trans_commit, METH_NOARGS},
-    {"cursor", (PyCFunction)trans_cursor, METH_VARARGS|METH_KEYWORDS},
-    {"delete", (PyCFunction)trans_delete, METH_VARARGS|METH_KEYWORDS},
+    {"estimate_range", (PyCFunction)trans_estimate_range, METH_VARARGS|METH_KEYWORDS},
+    {"cursor", (PyCFunction)trans_cursor, METH_FAST},
+    {"delete", (PyCFunction)trans_delete, METH_FAST},
+    {"delete_if", (PyCFunction)trans_delete_if, METH_VARARGS|METH_KEYWORDS},
+    {"delete_range", (PyCFunction)trans_delete_range, METH_VARARGS|METH_KEYWORDS},
     {"drop", (PyCFunction)trans_drop, METH_VARARGS|METH_KEYWORDS},
-    {"get", (PyCFunction)trans_get, METH_VARARGS|METH_KEYWORDS},
-    {"put", (PyCFunction)trans_put, METH_VARARGS|METH_KEYWORDS},
-    {"replace", (PyCFunction)trans_replace, METH_VARARGS|METH_KEYWORDS},
-    {"pop", (PyCFunction)trans_pop, METH_VARARGS|METH_KEYWORDS},
+    {"get", (PyCFunction)trans_get, METH_FAST},
+    {"getmulti", (PyCFunction)trans_getmulti, METH_VARARGS|METH_KEYWORDS},
+    {"put", (PyCFunction)trans_put, METH_FAST},
+    {"put_if", (PyCFunction)trans_put_if, METH_VARARGS|METH_KEYWORDS},
+    {"renew", (PyCFunction)trans_renew, METH_NOARGS},
+    {"replace", (PyCFunction)trans_replace, METH_FAST},
+    {"reset", (PyCFunction)trans_reset, METH_NOARGS},
+    {"pop", (PyCFunction)trans_pop, METH_FAST},
     {"id", (PyCFunction)trans_id, METH_NOARGS},
+    {"incr", (PyCFunction)trans_incr, METH_VARARGS|METH_KEYWORDS},
+    {"incr_many", (PyCFunction)trans_incr_many, METH_VARARGS|METH_KEYWORDS},
+    {"split_points", (PyCFunction)trans_split_points, METH_VARARGS|METH_KEYWORDS},
     {"stat", (PyCFunction)trans_stat, METH_VARARGS|METH_KEYWORDS},
     {NULL, NULL}
 };
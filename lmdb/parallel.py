@@ -0,0 +1,194 @@
+#
+# Copyright 2013 The py-lmdb authors, all rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted only as authorized by the OpenLDAP
+# Public License.
+#
+# A copy of this license is available in the file LICENSE in the
+# top-level directory of the distribution or, alternatively, at
+# <http://www.OpenLDAP.org/license.html>.
+#
+# OpenLDAP is a registered trademark of the OpenLDAP Foundation.
+#
+# Individual files and/or contributed packages may be copyright by
+# other parties and/or subject to additional restrictions.
+#
+# This work also contains materials derived from public sources.
+#
+# Additional information about OpenLDAP can be obtained at
+# <http://www.openldap.org/>.
+#
+
+"""
+Process pool map/reduce over the records of a database.
+
+An environment must never be used by a child process after fork(), so
+neither the calling process nor any pool worker inherits an open
+:py:class:`lmdb.Environment`: every worker opens the environment itself, and
+the key range partitions are planned by a short-lived child process.
+"""
+
+from __future__ import absolute_import
+import functools
+import multiprocessing
+import multiprocessing.util
+
+import lmdb
+
+__all__ = ['map_range']
+
+#: Per-worker (env, db), opened by _worker_init().
+_worker = None
+
+
+def _open(path, db_name, kwargs):
+    kwargs = dict(kwargs)
+    kwargs.setdefault('readonly', True)
+    if db_name is not None:
+        kwargs.setdefault('max_dbs', 1)
+    env = lmdb.open(path, **kwargs)
+    try:
+        db = None
+        if db_name is not None:
+            db = env.open_db(db_name, create=False)
+        return env, db
+    except:
+        env.close()
+        raise
+
+
+def _begin(env):
+    """Start a read transaction, adopting a new map size if another process
+    grew the map since the environment was opened."""
+    try:
+        return env.begin()
+    except lmdb.MapResizedError:
+        env.set_mapsize(0)
+        return env.begin()
+
+
+def _plan(path, db_name, kwargs, partitions):
+    # split_points() samples the tree rather than counting its records, so
+    # this serial step stays short compared to the scan that follows.
+    env, db = _open(path, db_name, kwargs)
+    try:
+        # Free slots held by crashed workers of any earlier run.
+        env.reader_check()
+        txn = _begin(env)
+        try:
+            points = txn.split_points(partitions, db=db)
+        finally:
+            txn.abort()
+        return points, env.max_readers()
+    finally:
+        env.close()
+
+
+def _worker_init(path, db_name, kwargs):
+    global _worker
+    _worker = _open(path, db_name, kwargs)
+    # Release the reader slot when the worker exits, rather than leaving it
+    # for reader_check() to reclaim.
+    multiprocessing.util.Finalize(None, _worker[0].close, exitpriority=0)
+
+
+def _worker_run(func, start, stop):
+    env, db = _worker
+    # Every task reuses the worker's one reader slot: the environment's spare
+    # transaction keeps it reserved between tasks.
+    txn = _begin(env)
+    try:
+        return func(txn.cursor(db).iter_range(start, stop))
+    finally:
+        txn.abort()
+
+
+def _star(args):
+    return _worker_run(*args)
+
+
+def map_range(path, db_name, func, partitions=None, reducer=None,
+              processes=None, **kwargs):
+    """Run `func` over the records of a database in a pool of worker
+    processes, returning the list of results, or the result of combining them
+    using `reducer` if it is given.
+
+    The database is divided into up to `partitions` key ranges containing
+    roughly equal numbers of records using
+    :py:meth:`Transaction.split_points`. Planning is done before any worker
+    starts, but costs a bounded number of seeks rather than a scan of the
+    database, so it takes a few milliseconds even for very large databases.
+
+    `func` is called once per range with an iterator yielding its
+    `(key, value)` pairs as bytestrings, in a read transaction of its own, and
+    its results are returned in key order. `func` and `reducer` must be
+    picklable, so they must be defined at the top level of a module.
+
+    Each worker opens the environment once and reuses its reader slot for all
+    the ranges it handles, reopening the map should another process grow it.
+    The number of workers is limited so that the environment's reader table
+    (see :py:meth:`Environment.max_readers`) can accommodate them alongside
+    the caller.
+
+        `path`:
+            Location of the environment, as for :py:func:`lmdb.open`.
+
+        `db_name`:
+            Name of an existing named database to scan, or ``None`` for the
+            main database.
+
+        `func`:
+            Function receiving an iterator over one range of records.
+
+        `partitions`:
+            Number of key ranges, defaulting to the number of CPUs.
+
+        `reducer`:
+            If not ``None``, a function of two arguments used to combine the
+            results of `func` as they arrive, as for
+            :py:func:`functools.reduce`.
+
+        `processes`:
+            Maximum number of workers, defaulting to `partitions`.
+
+    Remaining keyword arguments are passed to :py:func:`lmdb.open`, with
+    `readonly=True` by default, and `max_dbs=1` if `db_name` is given.
+
+    ::
+
+        def count_bytes(it):
+            return sum(len(value) for key, value in it)
+
+        total = lmdb.parallel.map_range('/path/to/env', b'db1',
+                                        count_bytes, reducer=operator.add)
+    """
+    partitions = partitions or multiprocessing.cpu_count()
+    pool = multiprocessing.Pool(1)
+    try:
+        points, max_readers = pool.apply(_plan,
+            (path, db_name, kwargs, partitions))
+    finally:
+        pool.close()
+        pool.join()
+
+    bounds = list(zip([None] + points, points + [None]))
+    processes = min(processes or partitions, len(bounds),
+                    max(1, max_readers - 1))
+    tasks = [(func, start, stop) for start, stop in bounds]
+
+    pool = multiprocessing.Pool(processes, _worker_init,
+                                (path, db_name, kwargs))
+    try:
+        results = pool.imap(_star, tasks)
+        if reducer is None:
+            results = list(results)
+        else:
+            results = functools.reduce(reducer, results)
+        pool.close()
+    except:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+    return results
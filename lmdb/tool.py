@@ -64,7 +64,9 @@ Basic tools for working with LMDB.
 
     stat: Print environment statistics.
 
-    warm: Read environment into page cache sequentially.
+    warm: Read environment into page cache sequentially. If --db, --start
+          or --stop is given, instead warm only the pages holding that
+          range of the database.
 
     watch: Show live environment statistics
 """
@@ -180,6 +182,11 @@ def make_parser():
                      help='Interval size (default: 1sec)')
     group.add_option('--window', type='int', default=10,
                      help='Average window size (default: 10)')
+    group = parser.add_option_group('Options for "warm" command')
+    group.add_option('--start',
+                     help='First key of the range to warm.')
+    group.add_option('--stop',
+                     help='Key following the range to warm.')
     return parser
 
 
@@ -463,6 +470,13 @@ def cmd_watch(opts, args):
 
 
 def cmd_warm(opts, args):
+    if opts.db or opts.start or opts.stop:
+        t0 = time.time()
+        pages = ENV.prefetch(db=DB, start=opts.start, stop=opts.stop)
+        print('Warmed %d pages in %dms' %
+            (pages, 1000 * (time.time() - t0)))
+        return
+
     stat = ENV.stat()
     info = ENV.info()
 
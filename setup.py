@@ -29,6 +29,7 @@ import platform
 
 from setuptools import Extension
 from setuptools import setup
+from setuptools.command.build_py import build_py
 
 try:
     import memsink
@@ -145,6 +146,16 @@ else:
         sys.stderr.write('Could not import lmdb; ensure cffi is installed!\n')
         ext_modules = []
 
+class BuildPy(build_py):
+    """Leave out lmdb.aio before Python 3.7, since its syntax would fail to
+    byte-compile."""
+    def find_package_modules(self, package, package_dir):
+        modules = build_py.find_package_modules(self, package, package_dir)
+        if sys.version_info < (3, 7):
+            modules = [m for m in modules if m[:2] != ('lmdb', 'aio')]
+        return modules
+
+
 def grep_version():
     path = os.path.join(os.path.dirname(__file__), 'lmdb/__init__.py')
     with open(path) as fp:
@@ -175,6 +186,7 @@ setup(
         "Topic :: Database",
         "Topic :: Database :: Database Engines/Servers",
     ],
+    cmdclass = {'build_py': BuildPy},
     ext_package = 'lmdb',
     ext_modules = ext_modules,
     install_requires = install_requires,
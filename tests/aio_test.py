@@ -0,0 +1,126 @@
+#
+# Copyright 2013 The py-lmdb authors, all rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted only as authorized by the OpenLDAP
+# Public License.
+#
+# A copy of this license is available in the file LICENSE in the
+# top-level directory of the distribution or, alternatively, at
+# <http://www.OpenLDAP.org/license.html>.
+#
+# OpenLDAP is a registered trademark of the OpenLDAP Foundation.
+#
+# Individual files and/or contributed packages may be copyright by
+# other parties and/or subject to additional restrictions.
+#
+# This work also contains materials derived from public sources.
+#
+# Additional information about OpenLDAP can be obtained at
+# <http://www.openldap.org/>.
+#
+
+from __future__ import absolute_import
+import asyncio
+import gc
+import threading
+import unittest
+
+import testlib
+from testlib import B
+
+import lmdb
+import lmdb.aio
+
+
+class AsyncTest(unittest.TestCase):
+    def tearDown(self):
+        self.aenv.close()
+        self.loop.close()
+        testlib.cleanup()
+
+    def setUp(self):
+        self.path, self.env = testlib.temp_env()
+        self.aenv = lmdb.aio.AsyncEnvironment(self.env, max_workers=2)
+        self.loop = asyncio.new_event_loop()
+
+    def run_async(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def test_put_get(self):
+        async def go():
+            async with self.aenv.begin(write=True) as txn:
+                assert await txn.put(B('a'), B('1'))
+                assert await txn.putmulti([(B('b'), B('2')),
+                                           (B('c'), B('3'))]) == (2, 2)
+            async with self.aenv.begin() as txn:
+                assert await txn.get(B('a')) == B('1')
+                assert await txn.getmulti([B('c'), B('x')]) == [B('3'), None]
+        self.run_async(go())
+
+    def test_abort(self):
+        async def go():
+            try:
+                async with self.aenv.begin(write=True) as txn:
+                    await txn.put(B('a'), B(''))
+                    raise ValueError()
+            except ValueError:
+                pass
+            txn = await self.aenv.begin()
+            assert await txn.get(B('a')) is None
+            await txn.abort()
+        self.run_async(go())
+
+    def test_abandoned(self):
+        # A write transaction that is never finished releases the write lock
+        # once collected.
+        async def go():
+            txn = await self.aenv.begin(write=True)
+            await txn.put(B('a'), B(''))
+            del txn
+            gc.collect()
+            txn = await asyncio.wait_for(self.aenv.begin(write=True), 5)
+            assert await txn.get(B('a')) is None
+            await txn.abort()
+        self.run_async(go())
+
+    def test_not_begun(self):
+        txn = self.aenv.begin()
+        self.assertRaises(lmdb.Error, self.run_async, txn.get(B('a')))
+
+    def test_writer_thread(self):
+        # Every write transaction runs on the same thread.
+        async def writer(n):
+            async with self.aenv.begin(write=True) as txn:
+                await txn.put(B('%d' % n), B(''))
+                return await txn.run(lambda txn: threading.current_thread())
+        async def go():
+            return await asyncio.gather(*[writer(n) for n in range(5)])
+        threads = self.run_async(go())
+        assert len(set(threads)) == 1
+        assert threads[0] is not threading.current_thread()
+        with self.env.begin() as txn:
+            assert len(list(txn.cursor())) == 5
+
+    def test_cursor(self):
+        with self.env.begin(write=True) as txn:
+            for i in range(1000):
+                txn.put(B('%04d' % i), B(''))
+        async def go():
+            async with self.aenv.begin() as txn:
+                curs = await txn.cursor()
+                keys = [k async for k in curs.iternext(values=False)]
+                assert keys == [B('%04d' % i) for i in range(1000)]
+                rng = [k async for k, v in curs.iter_range(B('0100'),
+                                                           B('0105'))]
+                assert rng == [B('%04d' % i) for i in range(100, 105)]
+                assert await curs.set_key(B('0999'))
+                assert await curs.item() == (B('0999'), B(''))
+                pfx = [k async for k in curs.iter_prefix(B('002'),
+                    values=False, strip_prefix=True, batch=3)]
+                assert pfx == [B('%d' % i) for i in range(10)]
+        self.run_async(go())
+
+
+if __name__ == '__main__':
+    unittest.main()
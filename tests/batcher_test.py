@@ -0,0 +1,138 @@
+#
+# Copyright 2013 The py-lmdb authors, all rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted only as authorized by the OpenLDAP
+# Public License.
+#
+# A copy of this license is available in the file LICENSE in the
+# top-level directory of the distribution or, alternatively, at
+# <http://www.OpenLDAP.org/license.html>.
+#
+# OpenLDAP is a registered trademark of the OpenLDAP Foundation.
+#
+# Individual files and/or contributed packages may be copyright by
+# other parties and/or subject to additional restrictions.
+#
+# This work also contains materials derived from public sources.
+#
+# Additional information about OpenLDAP can be obtained at
+# <http://www.openldap.org/>.
+#
+
+from __future__ import absolute_import
+import threading
+import unittest
+
+import testlib
+from testlib import B
+from testlib import BL
+
+import lmdb
+import lmdb.batcher
+
+
+@unittest.skipIf(lmdb.batcher.Future is None, 'concurrent.futures missing')
+class WriteBatcherTest(unittest.TestCase):
+    def tearDown(self):
+        testlib.cleanup()
+
+    def setUp(self):
+        self.path, self.env = testlib.temp_env()
+
+    def last_txnid(self):
+        return self.env.info()['last_txnid']
+
+    def test_put_delete(self):
+        with lmdb.WriteBatcher(self.env, max_delay_ms=1) as batcher:
+            assert batcher.put(B('a'), B('1')).result()
+            assert not batcher.put(B('a'), B('2'), overwrite=False).result()
+            assert batcher.delete(B('a')).result()
+            assert not batcher.delete(B('a')).result()
+            assert batcher.put(B('b'), B('3')).result()
+        with self.env.begin() as txn:
+            assert list(txn.cursor()) == [(B('b'), B('3'))]
+
+    def test_threads(self):
+        batcher = lmdb.WriteBatcher(self.env, max_delay_ms=20)
+        txnid = self.last_txnid()
+        futures = []
+        def submit(n):
+            for i in range(50):
+                futures.append(batcher.put(B('%d-%02d' % (n, i)), B('')))
+        threads = [threading.Thread(target=submit, args=(n,))
+                   for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert all(fut.result() for fut in futures)
+        batcher.close()
+        # 200 puts shared far fewer commits.
+        assert (self.last_txnid() - txnid) < 50
+        with self.env.begin() as txn:
+            assert txn.stat(self.env.open_db(None))['entries'] == 200
+
+    def test_max_ops(self):
+        txnid = self.last_txnid()
+        with lmdb.WriteBatcher(self.env, max_delay_ms=1000,
+                               max_ops=10) as batcher:
+            futures = [batcher.put(B('%02d' % i), B('')) for i in range(30)]
+            # Full batches don't wait for the delay.
+            futures[-1].result(timeout=5)
+        assert (self.last_txnid() - txnid) == 3
+
+    def test_close_flushes(self):
+        batcher = lmdb.WriteBatcher(self.env, max_delay_ms=1000)
+        fut = batcher.put(B('a'), B(''))
+        batcher.close()
+        assert fut.done() and fut.result()
+        self.assertRaises(RuntimeError, lambda: batcher.put(B('b'), B('')))
+        batcher.close()
+
+    def test_error(self):
+        with lmdb.WriteBatcher(self.env, max_delay_ms=50) as batcher:
+            ok1 = batcher.put(B('a'), B(''))
+            bad = batcher.put(B('a') * 1000, B(''))
+            ok2 = batcher.put(B('b'), B(''))
+            self.assertRaises(lmdb.BadValsizeError, bad.result)
+            assert ok1.result() and ok2.result()
+        with self.env.begin() as txn:
+            assert list(txn.cursor().iternext(values=False)) == [B('a'), B('b')]
+
+    def test_cancel(self):
+        with lmdb.WriteBatcher(self.env, max_delay_ms=1000) as batcher:
+            fut = batcher.put(B('a'), B(''))
+            fut2 = batcher.put(B('b'), B(''))
+            assert fut2.cancel()
+        assert fut.result()
+        with self.env.begin() as txn:
+            assert txn.get(B('b')) is None
+
+    def test_interrupted(self):
+        env = self.env
+        class Txn(object):
+            def __init__(self):
+                self.txn = env.begin(write=True)
+                self.abort = self.txn.abort
+                self.commit = self.txn.commit
+            def put(self, key, value, **kwargs):
+                if key == B('exit'):
+                    raise SystemExit
+                return self.txn.put(key, value, **kwargs)
+        class Env(object):
+            def begin(self, write=False):
+                return Txn()
+
+        batcher = lmdb.WriteBatcher(Env(), max_delay_ms=1000, max_ops=2)
+        futures = [batcher.put(key, B('')) for key in BL('a', 'exit', 'b')]
+        for fut in futures:
+            assert isinstance(fut.exception(timeout=5), SystemExit)
+        self.assertRaises(RuntimeError, lambda: batcher.put(B('c'), B('')))
+        batcher.close()
+        with self.env.begin() as txn:
+            assert txn.get(B('a')) is None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+#
+# Copyright 2013 The py-lmdb authors, all rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted only as authorized by the OpenLDAP
+# Public License.
+#
+# A copy of this license is available in the file LICENSE in the
+# top-level directory of the distribution or, alternatively, at
+# <http://www.OpenLDAP.org/license.html>.
+#
+# OpenLDAP is a registered trademark of the OpenLDAP Foundation.
+#
+# Individual files and/or contributed packages may be copyright by
+# other parties and/or subject to additional restrictions.
+#
+# This work also contains materials derived from public sources.
+#
+# Additional information about OpenLDAP can be obtained at
+# <http://www.openldap.org/>.
+#
+
+from __future__ import absolute_import
+import random
+import unittest
+
+import testlib
+from testlib import B
+from testlib import BT
+
+import lmdb
+import lmdb.bulk
+
+
+def shuffled(n):
+    items = [(B('%04d' % i), B('v%d' % i)) for i in range(n)]
+    random.Random(0).shuffle(items)
+    return items
+
+
+class LoadTest(unittest.TestCase):
+    def tearDown(self):
+        testlib.cleanup()
+
+    def setUp(self):
+        self.path, self.env = testlib.temp_env()
+
+    def test_empty(self):
+        assert lmdb.bulk.load(self.env, None, []) == (0, 0)
+        assert self.env.stat()['entries'] == 0
+
+    def test_in_memory(self):
+        items = shuffled(1000)
+        assert lmdb.bulk.load(self.env, None, iter(items)) == (1000, 1000)
+        with self.env.begin() as txn:
+            assert list(txn.cursor()) == sorted(items)
+
+    def test_spill(self):
+        items = shuffled(1000)
+        res = lmdb.bulk.load(self.env, None, items, memory_limit=1000,
+                             tmpdir=testlib.temp_dir())
+        assert res == (1000, 1000)
+        with self.env.begin() as txn:
+            assert list(txn.cursor()) == sorted(items)
+
+    def test_append_fill(self):
+        # Appending fills pages rather than splitting them.
+        path, env = testlib.temp_env()
+        lmdb.bulk.load(self.env, None, shuffled(5000))
+        with env.begin(write=True) as txn:
+            for key, value in shuffled(5000):
+                txn.put(key, value)
+        assert self.env.stat()['leaf_pages'] < env.stat()['leaf_pages']
+
+    def test_multi_pass(self):
+        # Runs are merged a few at a time through intermediate runs.
+        items = shuffled(300)
+        items += [(key, value + B('x')) for key, value in items[::7]]
+        expect = sorted(dict(items).items())
+        old = lmdb.bulk._FAN_IN
+        lmdb.bulk._FAN_IN = 3
+        try:
+            res = lmdb.bulk.load(self.env, None, items, memory_limit=500,
+                                 tmpdir=testlib.temp_dir())
+        finally:
+            lmdb.bulk._FAN_IN = old
+        assert res == (len(items), 300)
+        with self.env.begin() as txn:
+            assert list(txn.cursor()) == expect
+
+    def test_last_wins(self):
+        items = [BT('b', '1'), BT('a', '1'), BT('b', '2'), BT('a', '2'),
+                 BT('c', '1'), BT('b', '3')]
+        for limit in (1, 1 << 20):
+            _, env = testlib.temp_env()
+            assert lmdb.bulk.load(env, None, items, limit) == (6, 3)
+            with env.begin() as txn:
+                assert list(txn.cursor()) == [BT('a', '2'), BT('b', '3'),
+                                              BT('c', '1')]
+
+    def test_dupsort(self):
+        db = self.env.open_db(B('db1'), dupsort=True)
+        items = [BT('b', '2'), BT('a', '1'), BT('b', '1'), BT('b', '2'),
+                 BT('a', '1')]
+        assert lmdb.bulk.load(self.env, db, items, 1) == (5, 3)
+        with self.env.begin(db=db) as txn:
+            assert list(txn.cursor()) == [BT('a', '1'), BT('b', '1'),
+                                          BT('b', '2')]
+
+    def test_existing(self):
+        with self.env.begin(write=True) as txn:
+            txn.put(B('m'), B('old'))
+        items = [BT('z', '1'), BT('a', '1'), BT('m', '1')]
+        assert lmdb.bulk.load(self.env, None, items) == (3, 3)
+        with self.env.begin() as txn:
+            assert list(txn.cursor()) == [BT('a', '1'), BT('m', '1'),
+                                          BT('z', '1')]
+
+    def test_error(self):
+        def gen():
+            yield BT('a', '1')
+            raise ValueError('fail')
+        self.assertRaises(ValueError,
+            lambda: lmdb.bulk.load(self.env, None, gen()))
+        assert self.env.stat()['entries'] == 0
+
+
+if __name__ == '__main__':
+    unittest.main()
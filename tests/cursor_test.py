@@ -24,12 +24,17 @@
 
 from __future__ import absolute_import
 from __future__ import with_statement
+import array
+import struct
 import unittest
 
 import testlib
 from testlib import B
+from testlib import BL
 from testlib import BT
 
+import lmdb
+
 
 class ContextManagerTest(unittest.TestCase):
     def tearDown(self):
@@ -137,6 +142,14 @@ class CursorTest(CursorTestBase):
         # TODO: complete dup key support.
         #self.assertEqual(1, self.c.count())
 
+    def testNextNodup(self):
+        testlib.putData(self.txn)
+        self.c.first()
+        assert self.c.next_nodup()
+        self.assertEqual(B('b'), self.c.key())
+        self.c.last()
+        assert not self.c.next_nodup()
+
     def testPut(self):
         pass
 
@@ -173,6 +186,307 @@ class PutmultiTest(CursorTestBase):
         self.assertRaises(Exception,
              lambda: self.c.putmulti(range(2)))
 
+    def test_mutable(self):
+        # Elements other than bytes are stored without a batched GIL release.
+        l = [(B('a'), bytearray(B('1'))), BT('b', '2')]
+        consumed, added = self.c.putmulti(l)
+        assert consumed == added == 2
+        assert list(self.txn.cursor()) == [BT('a', '1'), BT('b', '2')]
+
+    def test_error(self):
+        l = [BT('a', ''), (B('b') * 1000, B('')), BT('c', '')]
+        self.assertRaises(lmdb.BadValsizeError,
+            lambda: self.c.putmulti(l))
+        assert self.txn.get(B('a')) == B('')
+        assert self.txn.get(B('c')) is None
+
+    def test_chunks(self):
+        # Spans several chunks of records.
+        it = ((B('%05d' % i), B('')) for i in range(3000))
+        consumed, added = self.c.putmulti(it)
+        assert consumed == added == 3000
+        assert len(list(self.txn.cursor())) == 3000
+
+    def test_iter_error(self):
+        def gen():
+            for i in range(1500):
+                yield B('%05d' % i), B('')
+            raise ValueError('gen')
+        self.assertRaises(ValueError, lambda: self.c.putmulti(gen()))
+        assert len(list(self.txn.cursor())) == 1500
+
+    def test_bad_element(self):
+        l = [BT('a', ''), 123]
+        self.assertRaises(TypeError, lambda: self.c.putmulti(l))
+        assert self.txn.get(B('a')) == B('')
+
+    def test_columns(self):
+        consumed, added = self.c.putmulti(keys=BL('b', 'a'),
+                                          values=BL('2', '1'))
+        assert consumed == added == 2
+        assert list(self.txn.cursor()) == [BT('a', '1'), BT('b', '2')]
+
+        consumed, added = self.c.putmulti(keys=BL('a', 'c'),
+                                          values=BL('x', '3'),
+                                          overwrite=False)
+        assert consumed == 2
+        assert added == 1
+        assert self.txn.get(B('a')) == B('1')
+
+    def test_columns_bad(self):
+        self.assertRaises(ValueError,
+            lambda: self.c.putmulti(keys=BL('a', 'b'), values=BL('1')))
+        self.assertRaises(TypeError,
+            lambda: self.c.putmulti(keys=BL('a')))
+        self.assertRaises(TypeError,
+            lambda: self.c.putmulti([BT('a', '1')], keys=BL('a'),
+                                    values=BL('1')))
+
+    def test_packed(self):
+        buf = struct.pack('>4I', 2, 20, 1, 10)
+        consumed, added = self.c.putmulti(buf, key_size=4, value_size=4)
+        assert consumed == added == 2
+        assert self.txn.get(struct.pack('>I', 1)) == struct.pack('>I', 10)
+
+        # Round trip through to_array().
+        out = bytearray(len(buf))
+        self.c.first()
+        assert self.c.to_array(out, keys=True) == 2
+        assert bytes(out) == struct.pack('>4I', 1, 10, 2, 20)
+
+    def test_packed_keys_only(self):
+        consumed, added = self.c.putmulti(B('abcd'), key_size=2)
+        assert consumed == added == 2
+        assert list(self.txn.cursor()) == [BT('ab', ''), BT('cd', '')]
+
+    def test_packed_bad(self):
+        self.assertRaises(ValueError,
+            lambda: self.c.putmulti(B('abcde'), key_size=2, value_size=1))
+
+
+class DeleteRangeTest(CursorTestBase):
+    def test_position(self):
+        testlib.putData(self.txn)
+        assert self.c.delete_range(B('b'), B('c')) == 2
+        assert self.c.item() == BT('d', '')
+        assert self.c.delete_range(B('c')) == 1
+        assert self.c.item() == BT('', '')
+        assert list(self.txn.cursor().iternext(values=False)) == BL('a')
+
+    def test_other_cursor(self):
+        testlib.putData(self.txn)
+        c2 = self.txn.cursor()
+        assert c2.set_key(B('d'))
+        assert self.c.delete_range(B('a'), B('b')) == 1
+        assert c2.key() == B('d')
+        assert self.c.delete_range() == 3
+        assert c2.key() == B('')
+
+
+class PutmultiDupTest(unittest.TestCase):
+    def tearDown(self):
+        testlib.cleanup()
+
+    def setUp(self):
+        self.path, self.env = testlib.temp_env()
+        self.db = self.env.open_db(B('db1'), dupsort=True, dupfixed=True)
+        self.txn = self.env.begin(write=True, db=self.db)
+        self.c = self.txn.cursor()
+
+    def values(self, key):
+        self.c.set_key(key)
+        return [struct.unpack('>I', v)[0]
+                for v in self.c.iternext_dup()]
+
+    def test_put(self):
+        buf = struct.pack('>5I', 9, 1, 5, 3, 7)
+        assert self.c.putmulti_dup(B('a'), buf, 4) == (5, 5)
+        assert self.values(B('a')) == [1, 3, 5, 7, 9]
+        assert self.c.count() == 5
+
+    def test_array(self):
+        arr = array.array('I', range(1000))
+        assert self.c.putmulti_dup(B('a'), arr, arr.itemsize) == (1000, 1000)
+        assert self.c.set_key(B('a'))
+        assert self.c.count() == 1000
+
+    def test_existing(self):
+        self.c.putmulti_dup(B('a'), struct.pack('>I', 5), 4)
+        buf = struct.pack('>4I', 1, 5, 9, 5)
+        assert self.c.putmulti_dup(B('a'), buf, 4) == (4, 2)
+        assert self.values(B('a')) == [1, 5, 9]
+
+        # Once values spill to a sub-database.
+        self.c.putmulti_dup(B('b'), struct.pack('>1000I', *range(1000)), 4)
+        buf = struct.pack('>3I', 999, 1000, 1)
+        assert self.c.putmulti_dup(B('b'), buf, 4) == (3, 1)
+        assert self.values(B('b')) == list(range(1001))
+
+    def test_empty(self):
+        assert self.c.putmulti_dup(B('a'), B(''), 4) == (0, 0)
+        assert self.txn.get(B('a')) is None
+
+    def test_bad(self):
+        self.assertRaises(ValueError,
+            lambda: self.c.putmulti_dup(B('a'), B('abcde'), 4))
+        self.assertRaises(TypeError,
+            lambda: self.c.putmulti_dup(B('a'), B('abcd'), 0))
+
+    def test_not_dupfixed(self):
+        db2 = self.env.open_db(B('db2'), txn=self.txn, dupsort=True)
+        c = self.txn.cursor(db=db2)
+        self.assertRaises(lmdb.IncompatibleError,
+            lambda: c.putmulti_dup(B('a'), B('abcd'), 4))
+
+
+class GetmultiTest(CursorTestBase):
+    def test_empty_seq(self):
+        assert [] == self.c.getmulti(())
+        assert not self.c.item()[0]
+
+    def test_order(self):
+        testlib.putData(self.txn)
+        keys = BL('d', 'missing', 'a', 'baa')
+        assert BL('', 'x', '', '') == self.c.getmulti(keys, B('x'))
+        assert BL('', '') == self.c.getmulti(iter(BL('d', 'a')))
+
+    def test_positioned(self):
+        testlib.putData(self.txn)
+        self.c.getmulti(BL('a', 'b'))
+        assert BT('b', '') == self.c.item()
+        self.c.getmulti(BL('a', 'missing'))
+        assert BT('', '') == self.c.item()
+
+    def test_empty_key(self):
+        testlib.putData(self.txn)
+        self.assertRaises(lmdb.BadValsizeError,
+            lambda: self.c.getmulti(BL('a', '')))
+
+    def test_sorted_lookup(self):
+        testlib.putData(self.txn)
+        keys = BL('d', 'missing', 'a', 'baa', 'a')
+        assert (BL('', 'x', '', '', '') ==
+                self.c.getmulti(keys, B('x'), sorted_lookup=True))
+        # Positioned on the greatest key visited, not the final one given.
+        self.c.getmulti(BL('d', 'a'), sorted_lookup=True)
+        assert BT('d', '') == self.c.item()
+
+
+class IternextMultipleTest(unittest.TestCase):
+    def tearDown(self):
+        testlib.cleanup()
+
+    def setUp(self):
+        self.path, self.env = testlib.temp_env()
+        db = self.env.open_db(B('db1'), dupsort=True, dupfixed=True)
+        self.txn = self.env.begin(write=True, db=db)
+        self.vals = [struct.pack('>Q', i) for i in range(2000)]
+        for val in self.vals:
+            self.txn.put(B('a'), val)
+        self.txn.put(B('b'), self.vals[0])
+        self.c = self.txn.cursor()
+
+    def test_unpositioned(self):
+        assert [] == list(self.c.iternext_multiple())
+
+    def test_pages(self):
+        assert self.c.set_key(B('a'))
+        pages = [bytes(page) for page in self.c.iternext_multiple()]
+        assert len(pages) > 1
+        assert B('').join(pages) == B('').join(self.vals)
+        assert not self.c.item()[0]
+
+    def test_positioned(self):
+        assert self.c.set_key(B('a'))
+        it = self.c.iternext_multiple()
+        page = next(it)
+        assert self.c.item() == (B('a'), page[-8:])
+        assert self.c.next_dup()
+        idx = self.vals.index(self.c.value())
+        assert B('').join(it) == B('').join(self.vals[idx + 1:])
+
+    def test_mid_page(self):
+        assert self.c.set_key_dup(B('a'), self.vals[3])
+        pages = list(self.c.iternext_multiple())
+        assert B('').join(pages) == B('').join(self.vals[3:])
+
+    def test_single(self):
+        assert self.c.set_key(B('b'))
+        assert [self.vals[0]] == list(self.c.iternext_multiple())
+
+    def test_incompatible(self):
+        db = self.env.open_db(B('db2'), txn=self.txn, dupsort=True)
+        self.txn.put(B('a'), B('a'), db=db)
+        c = self.txn.cursor(db=db)
+        assert c.first()
+        self.assertRaises(lmdb.IncompatibleError,
+            lambda: list(c.iternext_multiple()))
+
+
+class ToArrayTest(unittest.TestCase):
+    def tearDown(self):
+        testlib.cleanup()
+
+    def setUp(self):
+        self.path, self.env = testlib.temp_env()
+        self.db = self.env.open_db(B('ints'), integerkey=True)
+        self.txn = self.env.begin(write=True, db=self.db)
+        self.keys = list(range(100))
+        for i in self.keys:
+            self.txn.put(struct.pack('=Q', i), struct.pack('=d', i / 2.0))
+        self.c = self.txn.cursor()
+        self.c.first()
+
+    def test_unpositioned(self):
+        arr = array.array('d', [0])
+        assert 0 == self.txn.cursor().to_array(arr)
+
+    def test_values(self):
+        arr = array.array('d', [0]) * 150
+        assert 100 == self.c.to_array(arr)
+        assert [i / 2.0 for i in self.keys] == list(arr[:100])
+        assert not self.c.item()[0]
+
+    def test_keys(self):
+        arr = array.array('Q', [0]) * 100
+        assert 100 == self.c.to_array(arr, keys=True, values=False)
+        assert self.keys == list(arr)
+
+    def test_items(self):
+        buf = bytearray(16 * 100)
+        assert 100 == self.c.to_array(buf, keys=True)
+        assert struct.unpack_from('=Qd', buf, 16 * 7) == (7, 3.5)
+
+    def test_chunks(self):
+        arr = array.array('Q', [0]) * 30
+        got = []
+        while True:
+            count = self.c.to_array(arr, keys=True, values=False, limit=25)
+            if not count:
+                break
+            got.extend(arr[:count])
+        assert self.keys == got
+
+    def test_positioned(self):
+        arr = array.array('Q', [0]) * 10
+        assert self.c.set_range(struct.pack('=Q', 95))
+        assert 5 == self.c.to_array(arr, keys=True, values=False)
+        assert [95, 96, 97, 98, 99] == list(arr[:5])
+        assert self.c.set_key(struct.pack('=Q', 10))
+        assert 10 == self.c.to_array(arr, keys=True, values=False)
+        assert self.c.key() == struct.pack('=Q', 20)
+
+    def test_bad_size(self):
+        self.txn.put(struct.pack('=Q', 50), B('x'))
+        arr = array.array('d', [0]) * 100
+        self.assertRaises(lmdb.BadValsizeError,
+            lambda: self.c.to_array(arr))
+        assert self.c.value() == B('x')
+
+    def test_readonly(self):
+        self.assertRaises((BufferError, TypeError),
+            lambda: self.c.to_array(B('x') * 100))
+
 
 class ReplaceTest(CursorTestBase):
     def test_replace(self):
@@ -22,6 +22,7 @@
 
 from __future__ import absolute_import
 from __future__ import with_statement
+import mmap
 import os
 import signal
 import sys
@@ -228,6 +229,51 @@ class OpenTest(unittest.TestCase):
             self.assertRaises(lmdb.DbsFullError,
                 lambda: env.open_db(B('toomany')))
 
+    def test_gil(self):
+        _, env = testlib.temp_env()
+        assert env.flags()['gil'] == 'always'
+        self.assertRaises(ValueError,
+            lambda: testlib.temp_env(gil='sometimes'))
+        big = B('x') * 65536
+        for gil in 'always', 'never', 'adaptive':
+            _, env = testlib.temp_env(gil=gil)
+            assert env.flags()['gil'] == gil
+            with env.begin(write=True) as txn:
+                assert txn.put(B('a'), B('1'))
+                assert txn.put(B('b'), big)
+                assert txn.replace(B('a'), B('2')) == B('1')
+                assert txn.pop(B('a')) == B('2')
+                assert txn.put(B('c'), B('3'))
+                assert txn.delete(B('c'))
+            assert env.get(B('b')) == big
+            with env.begin() as txn:
+                assert txn.get(B('b')) == big
+                curs = txn.cursor()
+                assert curs.first()
+                assert curs.value() == big
+                assert list(curs.iternext(values=False)) == [B('b')]
+
+    def test_preload(self):
+        _, env = testlib.temp_env()
+        assert env.flags()['preload'] == 'madvise'
+        self.assertRaises(ValueError,
+            lambda: testlib.temp_env(preload='eagerly'))
+        big = B('x') * 65536
+        for preload in 'madvise', 'touch', 'none':
+            for gil in 'always', 'adaptive':
+                _, env = testlib.temp_env(preload=preload, gil=gil)
+                assert env.flags()['preload'] == preload
+                with env.begin(write=True) as txn:
+                    assert txn.put(B('a'), big)
+                    assert txn.put(B('b'), B('1'))
+                assert env.get(B('a')) == big
+                with env.begin() as txn:
+                    assert txn.get(B('a')) == big
+                    assert txn.getmulti([B('a'), B('b')]) == [big, B('1')]
+                    curs = txn.cursor()
+                    assert list(curs.iternext(batch=2)) == \
+                        [[(B('a'), big), (B('b'), B('1'))]]
+
 
 class SetMapSizeTest(unittest.TestCase):
     def tearDown(self):
@@ -746,6 +792,18 @@ class OpenDbTest(unittest.TestCase):
         db = env.open_db(B('node_schedules'), create=False)
         assert db is not None
 
+    def test_readonly_env_sub_use(self):
+        path, env = testlib.temp_env()
+        db = env.open_db(B('node_schedules'))
+        with env.begin(write=True, db=db) as txn:
+            txn.put(B('a'), B('b'))
+        env.close()
+
+        env = lmdb.open(path, max_dbs=10, readonly=True)
+        db = env.open_db(B('node_schedules'), create=False)
+        with env.begin(db=db) as txn:
+            assert txn.get(B('a')) == B('b')
+
 
 reader_count = lambda env: env.readers().count('\n') - 1
 
@@ -798,6 +856,141 @@ class SpareTxnTest(unittest.TestCase):
         assert 1 == reader_count(env)  # 1 cached
 
 
+class ReadSessionTest(unittest.TestCase):
+    def tearDown(self):
+        testlib.cleanup()
+
+    def setUp(self):
+        _, self.env = testlib.temp_env()
+        with self.env.begin(write=True) as txn:
+            txn.put(B('a'), B('1'))
+
+    def test_reuse(self):
+        session = self.env.read_session()
+        for value in B('1'), B('2'):
+            with session as txn:
+                assert txn is session
+                assert txn.get(B('a')) == value
+                assert list(txn.cursor()) == [(B('a'), value)]
+            # Each use sees the latest snapshot.
+            with self.env.begin(write=True) as txn:
+                txn.put(B('a'), B('2'))
+
+    def test_reset_outside_with(self):
+        session = self.env.read_session()
+        self.assertRaises(Exception, lambda: session.get(B('a')))
+        with session:
+            curs = session.cursor()
+        self.assertRaises(Exception, lambda: curs.first())
+        self.assertRaises(Exception, lambda: session.get(B('a')))
+
+    def test_abort(self):
+        session = self.env.read_session()
+        try:
+            with session as txn:
+                raise ValueError()
+        except ValueError:
+            pass
+        with session as txn:
+            txn.commit()
+        with session as txn:
+            assert txn.get(B('a')) == B('1')
+
+    def test_readers(self):
+        session = self.env.read_session()
+        count = reader_count(self.env)
+        for i in range(5):
+            with session as txn:
+                txn.get(B('a'))
+        assert reader_count(self.env) == count
+
+    def test_db(self):
+        _, env = testlib.temp_env(max_dbs=1)
+        db = env.open_db(B('db1'))
+        with env.begin(write=True, db=db) as txn:
+            txn.put(B('b'), B('2'))
+        with env.read_session(db=db) as txn:
+            assert txn.get(B('b')) == B('2')
+
+    def test_env_closed(self):
+        session = self.env.read_session()
+        self.env.close()
+        self.assertRaises(Exception, lambda: session.__enter__().get(B('a')))
+
+
+class EnvGetTest(unittest.TestCase):
+    def tearDown(self):
+        testlib.cleanup()
+
+    def test_get(self):
+        _, env = testlib.temp_env(max_dbs=1)
+        db = env.open_db(B('db1'))
+        with env.begin(write=True) as txn:
+            txn.put(B('a'), B('1'))
+            txn.put(B('b'), B('2'), db=db)
+        assert env.get(B('a')) == B('1')
+        assert env.get(B('b')) is None
+        assert env.get(B('b'), B('x')) == B('x')
+        assert env.get(B('b'), db=db) == B('2')
+        count = reader_count(env)
+        for i in range(5):
+            env.get(B('a'))
+        assert reader_count(env) == count
+
+    def test_closed(self):
+        _, env = testlib.temp_env()
+        env.close()
+        self.assertRaises(Exception, lambda: env.get(B('a')))
+
+
+class PrefetchTest(unittest.TestCase):
+    def tearDown(self):
+        testlib.cleanup()
+
+    def setUp(self):
+        _, self.env = testlib.temp_env(max_dbs=1)
+        with self.env.begin(write=True) as txn:
+            for i in range(100):
+                value = B('v') * (20000 if i % 2 else 10)
+                txn.put(B('%03d' % i), value)
+
+    def test_prefetch(self):
+        everything = self.env.prefetch()
+        leaves = self.env.prefetch(include_overflow=False)
+        assert 0 < leaves < everything
+        if self.env.stat()['psize'] == mmap.PAGESIZE:
+            st = self.env.stat()
+            assert everything - leaves == st['overflow_pages']
+            assert leaves == st['leaf_pages']
+
+    def test_range(self):
+        assert self.env.prefetch(start=B('000'), stop=B('010')) < \
+            self.env.prefetch()
+        assert self.env.prefetch(start=B('001'), stop=B('002')) > \
+            self.env.prefetch(start=B('001'), stop=B('002'),
+                              include_overflow=False)
+        assert self.env.prefetch(start=B('999')) == 0
+        assert self.env.prefetch(start=B('010'), stop=B('010')) == 0
+
+    def test_db(self):
+        db = self.env.open_db(B('db1'), dupsort=True)
+        assert self.env.prefetch(db=db) == 0
+        with self.env.begin(write=True, db=db) as txn:
+            for i in range(100):
+                txn.put(B('a'), B('%03d' % i))
+        assert self.env.prefetch(db=db) > 0
+
+    def test_readers(self):
+        self.env.prefetch()
+        count = reader_count(self.env)
+        self.env.prefetch()
+        assert reader_count(self.env) == count
+
+    def test_env_closed(self):
+        self.env.close()
+        self.assertRaises(Exception, lambda: self.env.prefetch())
+
+
 class LeakTest(unittest.TestCase):
     def tearDown(self):
         testlib.cleanup()
@@ -27,9 +27,12 @@ from __future__ import absolute_import
 from __future__ import with_statement
 import unittest
 
+import lmdb
+
 import testlib
 from testlib import B
 from testlib import BT
+from testlib import BL
 from testlib import KEYS, ITEMS, KEYS2, ITEMS2
 from testlib import putData, putBigData
 
@@ -192,6 +195,160 @@ class ReverseIterationTest(IterationTestBase):
         test_list = list(self.c.iterprev())
         self.assertEqual(test_list, ITEMS[::-1])
 
+class BatchIterationTest(IterationTestBase):
+    def flatten(self, it):
+        batches = list(it)
+        assert all(0 < len(batch) <= 2 for batch in batches)
+        return [elt for batch in batches for elt in batch]
+
+    def testIternext(self):
+        assert self.flatten(self.c.iternext(batch=2)) == ITEMS
+        self.assertEqual(self.c.item(), self.empty_entry)
+
+    def testKeys(self):
+        self.c.first()
+        test_list = self.flatten(self.c.iternext(values=False, batch=2))
+        self.assertEqual(test_list, KEYS)
+
+    def testIterprev(self):
+        self.assertEqual(self.flatten(self.c.iterprev(batch=2)), ITEMS[::-1])
+
+    def testPositioned(self):
+        it = self.c.iternext(batch=2)
+        self.assertEqual(next(it), ITEMS[:2])
+        self.assertEqual(self.c.item(), ITEMS[1])
+        self.assertEqual(next(it), ITEMS[2:4])
+
+    def testLargeBatch(self):
+        self.assertEqual(list(self.c.iternext(batch=1000)), [ITEMS])
+
+    def testNodup(self):
+        test_list = self.flatten(self.c.iternext_nodup(batch=2))
+        self.assertEqual(test_list, KEYS)
+
+
+class RangeIterationTest(IterationTestBase2):
+    def keys(self, **kwargs):
+        return list(self.c.iter_range(values=False, **kwargs))
+
+    def testUnbounded(self):
+        self.assertEqual(list(self.c.iter_range()), ITEMS2)
+        self.assertEqual(list(self.c.iter_range(reverse=True)), ITEMS2[::-1])
+
+    def testHalfOpen(self):
+        self.assertEqual(self.keys(start=B('b'), stop=B('e')),
+                         BL('b', 'baa', 'd'))
+        self.assertEqual(self.keys(start=B('bb'), stop=B('ee')),
+                         BL('d', 'e'))
+        self.assertEqual(self.keys(stop=B('b')), BL('a'))
+        self.assertEqual(self.keys(start=B('g')), BL('g', 'h'))
+
+    def testInclusive(self):
+        self.assertEqual(self.keys(start=B('b'), stop=B('e'),
+                                   inclusive=(False, True)),
+                         BL('baa', 'd', 'e'))
+        self.assertEqual(self.keys(start=B('b'), stop=B('e'),
+                                   inclusive=(True, True)),
+                         BL('b', 'baa', 'd', 'e'))
+
+    def testReverse(self):
+        self.assertEqual(self.keys(start=B('b'), stop=B('e'), reverse=True),
+                         BL('d', 'baa', 'b'))
+        self.assertEqual(self.keys(start=B('b'), stop=B('e'), reverse=True,
+                                   inclusive=(False, True)),
+                         BL('e', 'd', 'baa'))
+        self.assertEqual(self.keys(start=B('bb'), stop=B('zz'), reverse=True),
+                         BL('h', 'g', 'f', 'e', 'd'))
+
+    def testEmpty(self):
+        self.assertEqual(self.keys(start=B('e'), stop=B('b')), [])
+        self.assertEqual(self.keys(start=B('e'), stop=B('b'), reverse=True),
+                         [])
+        self.assertEqual(self.keys(start=B('zz')), [])
+        self.assertEqual(self.keys(stop=B('a'), reverse=True), [])
+
+    def testLimit(self):
+        self.assertEqual(self.keys(start=B('b'), limit=2), BL('b', 'baa'))
+        self.assertEqual(self.keys(limit=0), [])
+
+    def testBatch(self):
+        test_list = list(self.c.iter_range(start=B('b'), stop=B('f'),
+                                           batch=3, values=False))
+        self.assertEqual(test_list, [BL('b', 'baa', 'd'), BL('e')])
+        test_list = list(self.c.iter_range(start=B('b'), limit=4, batch=3))
+        self.assertEqual(test_list, [ITEMS2[1:4], ITEMS2[4:5]])
+
+    def testPositioned(self):
+        self.assertEqual(self.keys(start=B('b'), stop=B('e')),
+                         BL('b', 'baa', 'd'))
+        self.assertEqual(self.c.key(), B('e'))
+
+    def testBytearrayBound(self):
+        # The iterator keeps a copy of its bound.
+        stop = bytearray(B('e'))
+        it = self.c.iter_range(start=B('b'), stop=stop, values=False)
+        stop[:] = B('b' * 1000)
+        self.assertEqual(list(it), BL('b', 'baa', 'd'))
+
+
+class PrefixIterationTest(IterationTestBase2):
+    def testPrefix(self):
+        self.assertEqual(list(self.c.iter_prefix(B('b'))), ITEMS2[1:3])
+        self.assertEqual(self.c.key(), B('d'))
+        self.assertEqual(list(self.c.iter_prefix(B('ba'), values=False)),
+                         BL('baa'))
+
+    def testMissing(self):
+        self.assertEqual(list(self.c.iter_prefix(B('c'))), [])
+        self.assertEqual(list(self.c.iter_prefix(B('z'))), [])
+        self.assertEqual(list(self.c.iter_prefix(B('baaa'))), [])
+
+    def testEmpty(self):
+        self.assertEqual(list(self.c.iter_prefix(B(''))), ITEMS2)
+
+    def testStrip(self):
+        test_list = list(self.c.iter_prefix(B('b'), strip_prefix=True))
+        self.assertEqual(test_list, [(B(''), B('')), (B('aa'), B(''))])
+        self.assertEqual(self.c.key(), B('d'))
+
+    def testBatch(self):
+        test_list = list(self.c.iter_prefix(B('b'), batch=5, values=False,
+                                            strip_prefix=True))
+        self.assertEqual(test_list, [BL('', 'aa')])
+
+    def testBytearrayPrefix(self):
+        # The iterator keeps a copy of its prefix.
+        prefix = bytearray(B('b'))
+        it = self.c.iter_prefix(prefix, values=False)
+        prefix[:] = B('a' * 1000)
+        self.assertEqual(list(it), BL('b', 'baa'))
+
+
+class RangeIterationReverseKeyTest(unittest.TestCase):
+    def tearDown(self):
+        testlib.cleanup()
+
+    def test_reverse_key(self):
+        _, env = testlib.temp_env()
+        db = env.open_db(B('rev'), reverse_key=True)
+        txn = env.begin(write=True, db=db)
+        for key in BL('ba', 'ab', 'cc', 'ac'):
+            txn.put(key, B(''))
+        curs = txn.cursor()
+        # Ordered by reversed bytes: ba, ab, ac, cc.
+        self.assertEqual(list(curs.iter_range(stop=B('ac'), values=False)),
+                         BL('ba', 'ab'))
+
+    def test_prefix(self):
+        _, env = testlib.temp_env()
+        for name in 'reverse_key', 'integerkey':
+            db = env.open_db(B(name), **{name: True})
+            with env.begin(db=db) as txn:
+                curs = txn.cursor()
+                self.assertRaises(lmdb.IncompatibleError,
+                                  lambda: curs.iter_prefix(B('a')))
+
+
 class IterationTestWithDupsBase(unittest.TestCase):
     def tearDown(self):
         testlib.cleanup()
@@ -210,7 +367,23 @@ class IterationTestWithDupsBase(unittest.TestCase):
 
 
 class IterationTestWithDups(IterationTestWithDupsBase):
-    pass
+    def testIternextDupBatch(self):
+        for val in (B('a'), B('b'), B('c')):
+            self.c.put(B('zz'), val)
+        self.c.set_key(B('zz'))
+        test_list = list(self.c.iternext_dup(batch=2))
+        self.assertEqual(test_list, [[B('a'), B('b')], [B('c')]])
+
+    def testIterRangeDups(self):
+        for val in (B('a'), B('b'), B('c')):
+            self.c.put(B('zz'), val)
+        self.c.put(B('zzz'), B('a'))
+        test_list = list(self.c.iter_range(B('zz'), B('zz'),
+                                           inclusive=(True, True),
+                                           reverse=True, keys=False))
+        self.assertEqual(test_list, [B('c'), B('b'), B('a')])
+        test_list = list(self.c.iter_range(B('zz'), inclusive=(False, False)))
+        self.assertEqual(test_list, [(B('zzz'), B('a'))])
 
 
 class SeekIterationTest(IterationTestBase2):
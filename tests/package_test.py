@@ -63,6 +63,7 @@ class PackageExportsTest(unittest.TestCase):
             'Transaction',
             'TxnFullError',
             'VersionMismatchError',
+            'WriteBatcher',
             'enable_drop_gil',
             'version',
         ]
@@ -0,0 +1,103 @@
+#
+# Copyright 2013 The py-lmdb authors, all rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted only as authorized by the OpenLDAP
+# Public License.
+#
+# A copy of this license is available in the file LICENSE in the
+# top-level directory of the distribution or, alternatively, at
+# <http://www.OpenLDAP.org/license.html>.
+#
+# OpenLDAP is a registered trademark of the OpenLDAP Foundation.
+#
+# Individual files and/or contributed packages may be copyright by
+# other parties and/or subject to additional restrictions.
+#
+# This work also contains materials derived from public sources.
+#
+# Additional information about OpenLDAP can be obtained at
+# <http://www.openldap.org/>.
+#
+
+from __future__ import absolute_import
+import operator
+import unittest
+
+import testlib
+from testlib import B
+
+import lmdb
+import lmdb.parallel
+
+
+# Worker functions must be importable by the pool.
+def keys(it):
+    return [key for key, value in it]
+
+def count(it):
+    return sum(1 for _ in it)
+
+def fail(it):
+    raise ValueError('fail')
+
+
+class MapRangeTest(unittest.TestCase):
+    def tearDown(self):
+        testlib.cleanup()
+
+    def setUp(self):
+        self.path, self.env = testlib.temp_env()
+        with self.env.begin(write=True) as txn:
+            for i in range(100):
+                txn.put(B('%03d' % i), B(''))
+
+    def test_list(self):
+        res = lmdb.parallel.map_range(self.path, None, keys, partitions=4)
+        assert len(res) == 4
+        assert sum(res, []) == [B('%03d' % i) for i in range(100)]
+
+    def test_reducer(self):
+        res = lmdb.parallel.map_range(self.path, None, count, partitions=3,
+                                      reducer=operator.add)
+        assert res == 100
+
+    def test_processes(self):
+        res = lmdb.parallel.map_range(self.path, None, count, partitions=7,
+                                      processes=2)
+        assert len(res) == 7
+        assert sum(res) == 100
+
+    def test_max_readers(self):
+        path, env = testlib.temp_env(max_readers=3)
+        with env.begin(write=True) as txn:
+            for i in range(100):
+                txn.put(B('%03d' % i), B(''))
+        # Reading in this process takes one of the three slots.
+        with env.begin() as txn:
+            res = lmdb.parallel.map_range(path, None, count, partitions=8)
+        assert sum(res) == 100
+
+    def test_named_db(self):
+        db1 = self.env.open_db(B('db1'), dupsort=True)
+        with self.env.begin(write=True, db=db1) as txn:
+            for i in range(100):
+                txn.put(B('a'), B('%03d' % i))
+            txn.put(B('b'), B(''))
+        res = lmdb.parallel.map_range(self.path, B('db1'), count,
+                                      partitions=4, max_dbs=2)
+        assert res == [101]
+
+    def test_missing_db(self):
+        self.assertRaises(lmdb.NotFoundError,
+            lambda: lmdb.parallel.map_range(self.path, B('db2'), count,
+                                            max_dbs=3))
+
+    def test_fail(self):
+        self.assertRaises(ValueError,
+            lambda: lmdb.parallel.map_range(self.path, None, fail,
+                                            partitions=2))
+
+
+if __name__ == '__main__':
+    unittest.main()
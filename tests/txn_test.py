@@ -28,6 +28,7 @@ import weakref
 
 import testlib
 from testlib import B
+from testlib import BL
 from testlib import BT
 from testlib import OCT
 from testlib import INT_TYPES
@@ -358,6 +359,24 @@ class GetTest(unittest.TestCase):
         self.assertRaises(lmdb.BadValsizeError,
             lambda: txn.get(B('')))
 
+    def test_arguments(self):
+        _, env = testlib.temp_env()
+        db = env.open_db(None)
+        with env.begin(write=True) as txn:
+            txn.put(B('a'), B('b'))
+        txn = env.begin()
+        assert txn.get(B('a'), None, db) == B('b')
+        assert txn.get(key=B('a'), db=db) == B('b')
+        assert txn.get(B('b'), db=db, default=1) == 1
+        self.assertRaises(TypeError,
+            lambda: txn.get(B('a'), None, db, 1))
+        self.assertRaises(TypeError,
+            lambda: txn.get(B('a'), missing=1))
+        self.assertRaises(TypeError,
+            lambda: txn.get(B('a'), key=B('a')))
+        self.assertRaises(TypeError,
+            lambda: txn.get(db=db))
+
     def test_db(self):
         _, env = testlib.temp_env()
         maindb = env.open_db(None)
@@ -425,6 +444,328 @@ class GetTest(unittest.TestCase):
         assert txn.get(B('a')) == B('a')
 
 
+class GetmultiTest(unittest.TestCase):
+    def tearDown(self):
+        testlib.cleanup()
+
+    def test_bad_txn(self):
+        _, env = testlib.temp_env()
+        txn = env.begin()
+        txn.abort()
+        self.assertRaises(Exception,
+            lambda: txn.getmulti([B('a')]))
+
+    def test_missing(self):
+        _, env = testlib.temp_env()
+        txn = env.begin()
+        assert txn.getmulti([B('a'), B('b')]) == [None, None]
+        assert txn.getmulti([B('a')], default='default') == ['default']
+
+    def test_order(self):
+        _, env = testlib.temp_env()
+        txn = env.begin(write=True)
+        for key in BL('a', 'b', 'c'):
+            txn.put(key, key + key)
+        keys = BL('c', 'x', 'a', 'c', 'b')
+        assert txn.getmulti(keys) == [B('cc'), None, B('aa'), B('cc'), B('bb')]
+        assert txn.getmulti(iter(keys)) == txn.getmulti(keys)
+        assert txn.getmulti([]) == []
+
+    def test_db(self):
+        _, env = testlib.temp_env()
+        db1 = env.open_db(B('db1'))
+        txn = env.begin(write=True)
+        txn.put(B('a'), B('main'))
+        txn.put(B('a'), B('db1'), db=db1)
+        assert txn.getmulti([B('a')]) == [B('main')]
+        assert txn.getmulti([B('a')], db=db1) == [B('db1')]
+
+    def test_buffers(self):
+        _, env = testlib.temp_env()
+        txn = env.begin(write=True, buffers=True)
+        txn.put(B('a'), B('a'))
+        val, = txn.getmulti([B('a')])
+        assert type(val) is not BytesType
+        assert bytes(val) == B('a')
+
+    def test_dupsort(self):
+        _, env = testlib.temp_env()
+        db1 = env.open_db(B('db1'), dupsort=True)
+        txn = env.begin(write=True, db=db1)
+        assert txn.put(B('a'), B('b'))
+        assert txn.put(B('a'), B('a'))
+        assert txn.getmulti([B('a')]) == [B('a')]
+
+    def test_empty_key(self):
+        _, env = testlib.temp_env()
+        txn = env.begin()
+        self.assertRaises(lmdb.BadValsizeError,
+            lambda: txn.getmulti([B('a'), B('')]))
+
+    def test_bad_key(self):
+        _, env = testlib.temp_env()
+        txn = env.begin()
+        self.assertRaises(TypeError,
+            lambda: txn.getmulti([B('a'), UnicodeType('b')]))
+
+    def test_sorted_lookup(self):
+        _, env = testlib.temp_env()
+        txn = env.begin(write=True)
+        for i in range(500):
+            key = B('%04d' % i)
+            txn.put(key, key)
+        keys = [B('%04d' % ((i * 7919) % 600)) for i in range(1000)]
+        expect = [key if key < B('0500') else None for key in keys]
+        assert txn.getmulti(keys, sorted_lookup=True) == expect
+        assert txn.getmulti(keys) == expect
+        assert txn.getmulti([], sorted_lookup=True) == []
+
+    def test_sorted_lookup_reverse_key(self):
+        _, env = testlib.temp_env()
+        db1 = env.open_db(B('db1'), reverse_key=True)
+        txn = env.begin(write=True, db=db1)
+        for key in BL('ab', 'ba', 'ca'):
+            txn.put(key, key)
+        keys = BL('ca', 'x', 'ab', 'ba', 'ab')
+        assert (txn.getmulti(keys, sorted_lookup=True) ==
+                BL('ca') + [None] + BL('ab', 'ba', 'ab'))
+
+
+class EstimateRangeTest(unittest.TestCase):
+    def tearDown(self):
+        testlib.cleanup()
+
+    def setUp(self):
+        _, self.env = testlib.temp_env()
+        self.txn = self.env.begin(write=True)
+        for i in range(100):
+            self.txn.put(B('%03d' % i), B(''))
+
+    def test_bad_txn(self):
+        self.txn.abort()
+        self.assertRaises(Exception,
+            lambda: self.txn.estimate_range())
+
+    def test_unbounded(self):
+        assert self.txn.estimate_range() == 100
+        assert self.txn.estimate_range(B('050')) == 50
+        assert self.txn.estimate_range(stop=B('050')) == 50
+
+    def test_bounds(self):
+        assert self.txn.estimate_range(B('010'), B('020')) == 10
+        assert self.txn.estimate_range(B('010'), B('020'),
+                                       inclusive=(False, True)) == 10
+        assert self.txn.estimate_range(B('010'), B('020'),
+                                       inclusive=(True, True)) == 11
+        assert self.txn.estimate_range(B('0105'), B('0195')) == 9
+        assert self.txn.estimate_range(B('020'), B('010')) == 0
+        assert self.txn.estimate_range(B('999')) == 0
+
+    def test_db(self):
+        db1 = self.env.open_db(B('db1'), txn=self.txn, dupsort=True)
+        for val in BL('a', 'b', 'c'):
+            self.txn.put(B('a'), val, db=db1)
+        self.txn.put(B('b'), B('a'), db=db1)
+        assert self.txn.estimate_range(db=db1) == 4
+        assert self.txn.estimate_range(stop=B('b'), db=db1) == 3
+
+    def test_estimated(self):
+        db1 = self.env.open_db(B('db1'), txn=self.txn)
+        keys = [struct.pack('>L', i * 65537) for i in range(20000)]
+        self.txn.cursor(db=db1).putmulti((key, B('')) for key in keys)
+        assert self.txn.estimate_range(db=db1) == 20000
+        for lo, hi in (0, 10000), (5000, 6000), (1234, 19876), (19000, None):
+            stop = hi and keys[hi]
+            count = (hi or 20000) - lo
+            estimate = self.txn.estimate_range(keys[lo], stop, db=db1)
+            assert abs(estimate - count) <= 400, (lo, hi, estimate)
+
+
+class DeleteRangeTest(unittest.TestCase):
+    def tearDown(self):
+        testlib.cleanup()
+
+    def setUp(self):
+        _, self.env = testlib.temp_env()
+        self.txn = self.env.begin(write=True)
+        for i in range(100):
+            self.txn.put(B('%03d' % i), B(''))
+
+    def keys(self, db=None):
+        return list(self.txn.cursor(db=db).iternext(values=False))
+
+    def test_bad_txn(self):
+        self.txn.abort()
+        self.assertRaises(Exception,
+            lambda: self.txn.delete_range(B('010'), B('020')))
+
+    def test_range(self):
+        assert self.txn.delete_range(B('010'), B('020')) == 10
+        assert len(self.keys()) == 90
+        assert B('009') in self.keys()
+        assert B('010') not in self.keys()
+        assert B('020') in self.keys()
+        assert self.txn.delete_range(B('010'), B('020')) == 0
+
+    def test_inclusive(self):
+        assert self.txn.delete_range(B('010'), B('020'),
+                                     inclusive=(False, True)) == 10
+        assert B('010') in self.keys()
+        assert B('020') not in self.keys()
+
+    def test_open_ended(self):
+        assert self.txn.delete_range(B('090')) == 10
+        assert self.txn.delete_range(stop=B('010')) == 10
+        assert self.keys() == [B('%03d' % i) for i in range(10, 90)]
+
+    def test_missing_bounds(self):
+        assert self.txn.delete_range(B('0105'), B('0115')) == 1
+        assert self.txn.delete_range(B('x'), B('z')) == 0
+        assert len(self.keys()) == 99
+
+    def test_all(self):
+        assert self.txn.delete_range() == 100
+        assert self.keys() == []
+        assert self.txn.delete_range() == 0
+        self.txn.put(B('a'), B(''))
+        assert self.keys() == [B('a')]
+
+    def test_empty_bounded(self):
+        # Deleting the last record leaves the database empty.
+        assert self.txn.delete_range(B('000')) == 100
+        assert self.keys() == []
+        for i in range(100):
+            self.txn.put(B('%03d' % i), B(''))
+        assert self.txn.delete_range(None, B('999')) == 100
+        assert self.keys() == []
+        self.txn.put(B('a'), B(''))
+        assert self.txn.delete_range(B('a'), B('b')) == 1
+        assert self.keys() == []
+
+        db1 = self.env.open_db(B('db1'), txn=self.txn, dupsort=True)
+        self.txn.put(B('a'), B('1'), db=db1)
+        self.txn.put(B('a'), B('2'), db=db1)
+        assert self.txn.delete_range(B('a'), db=db1) == 2
+        assert self.keys(db1) == []
+
+    def test_named_db(self):
+        # The main database is never dropped, as that would delete the
+        # records of named databases.
+        db1 = self.env.open_db(B('db1'), txn=self.txn)
+        self.txn.put(B('a'), B(''), db=db1)
+        assert self.txn.delete_range(stop=B('db1')) == 100
+        assert self.keys() == [B('db1')]
+        assert self.keys(db1) == [B('a')]
+
+    def test_named_db_skipped(self):
+        # Records of named databases are skipped, without disturbing the
+        # transaction, even among records of the same size.
+        db1 = self.env.open_db(B('db1'), txn=self.txn)
+        self.txn.put(B('a'), B(''), db=db1)
+        for key in BL('d', 'db0', 'db2', 'e'):
+            self.txn.put(key, B(' ') * 48)
+            self.txn.put(key + B('x'), B(' ') * 28)
+        assert self.txn.delete_range() == 108
+        assert self.txn.delete_range(B('d')) == 0
+        self.txn.commit()
+        with self.env.begin() as txn:
+            assert list(txn.cursor().iternext(values=False)) == [B('db1')]
+            assert txn.get(B('a'), db=db1) == B('')
+
+    def test_dupsort(self):
+        db1 = self.env.open_db(B('db1'), txn=self.txn, dupsort=True)
+        for key in 'abc':
+            for i in range(5):
+                self.txn.put(B(key), B('%d' % i), db=db1)
+        assert self.txn.delete_range(B('a'), B('b'), inclusive=(False, True),
+                                     db=db1) == 5
+        assert self.keys(db1) == BL('a', 'a', 'a', 'a', 'a',
+                                    'c', 'c', 'c', 'c', 'c')
+        assert self.txn.delete_range(db=db1) == 10
+        assert self.keys(db1) == []
+        assert len(self.keys()) == 101
+
+
+class SplitPointsTest(unittest.TestCase):
+    def tearDown(self):
+        testlib.cleanup()
+
+    def setUp(self):
+        _, self.env = testlib.temp_env()
+        self.txn = self.env.begin(write=True)
+        for i in range(100):
+            self.txn.put(B('%03d' % i), B(''))
+
+    def test_bad_txn(self):
+        self.txn.abort()
+        self.assertRaises(Exception,
+            lambda: self.txn.split_points(2))
+
+    def test_split(self):
+        assert self.txn.split_points(4) == BL('025', '050', '075')
+        assert self.txn.split_points(3) == BL('033', '066')
+        assert self.txn.split_points(1) == []
+        assert self.txn.split_points(0) == []
+
+    def test_ranges(self):
+        points = self.txn.split_points(7)
+        bounds = list(zip([None] + points, points + [None]))
+        counts = [len(list(self.txn.cursor().iter_range(lo, hi)))
+                  for lo, hi in bounds]
+        assert sum(counts) == 100
+        assert max(counts) - min(counts) <= 1
+
+    def test_small(self):
+        db1 = self.env.open_db(B('db1'), txn=self.txn)
+        assert self.txn.split_points(4, db=db1) == []
+        self.txn.put(B('a'), B(''), db=db1)
+        self.txn.put(B('b'), B(''), db=db1)
+        assert self.txn.split_points(4, db=db1) == BL('b')
+
+    def test_dupsort(self):
+        db1 = self.env.open_db(B('db1'), txn=self.txn, dupsort=True)
+        self.txn.put(B('a'), B(''), db=db1)
+        for i in range(10):
+            self.txn.put(B('b'), B('%d' % i), db=db1)
+        self.txn.put(B('c'), B(''), db=db1)
+        assert self.txn.split_points(4, db=db1) == BL('b')
+        self.txn.delete(B('a'), db=db1)
+        assert self.txn.split_points(4, db=db1) == []
+
+    def _check_sampled(self, db, keys, n):
+        txn = self.txn
+        txn.cursor(db=db).putmulti((key, B('')) for key in keys)
+        points = txn.split_points(n, db=db)
+        assert len(points) == n - 1
+        bounds = list(zip([None] + points, points + [None]))
+        counts = [len(list(txn.cursor(db=db).iter_range(lo, hi)))
+                  for lo, hi in bounds]
+        assert sum(counts) == len(keys)
+        ideal = len(keys) // n
+        assert all(ideal // 2 < count < ideal * 2 for count in counts)
+
+    def test_sampled(self):
+        db1 = self.env.open_db(B('db1'), txn=self.txn)
+        keys = [B('%08x' % ((i * 2654435761) & 0xffffffff))
+                for i in range(20000)]
+        self._check_sampled(db1, keys, 8)
+
+    def test_sampled_clustered(self):
+        db1 = self.env.open_db(B('db1'), txn=self.txn)
+        keys = [B('a%d' % i) for i in range(100)]
+        keys += [B('user:%07d' % i) for i in range(20000)]
+        self._check_sampled(db1, keys, 8)
+
+    def test_sampled_reverse_key(self):
+        db1 = self.env.open_db(B('db1'), txn=self.txn, reverse_key=True)
+        self._check_sampled(db1, [B('%08d' % i) for i in range(20000)], 8)
+
+    def test_sampled_integerkey(self):
+        db1 = self.env.open_db(B('db1'), txn=self.txn, integerkey=True)
+        keys = [struct.pack('=Q', i * i) for i in range(20000)]
+        self._check_sampled(db1, keys, 8)
+
+
 class PutTest(unittest.TestCase):
     def tearDown(self):
         testlib.cleanup()
@@ -534,5 +875,238 @@ class LeakTest(unittest.TestCase):
         assert r2() is None
 
 
+class IncrTest(unittest.TestCase):
+    def tearDown(self):
+        testlib.cleanup()
+
+    def setUp(self):
+        _, self.env = testlib.temp_env()
+        self.txn = self.env.begin(write=True)
+
+    def test_bad_txn(self):
+        self.txn.abort()
+        self.assertRaises(Exception, lambda: self.txn.incr(B('a')))
+
+    def test_create(self):
+        assert self.txn.incr(B('a')) == 1
+        assert self.txn.get(B('a')) == struct.pack('<q', 1)
+        assert self.txn.incr(B('a'), 41) == 42
+        assert self.txn.incr(B('a'), -50) == -8
+        assert self.txn.get(B('a')) == struct.pack('<q', -8)
+
+    def test_formats(self):
+        for fmt, width, signed, big_endian in [('<b', 1, True, False),
+                                               ('>H', 2, False, True),
+                                               ('>i', 4, True, True),
+                                               ('<Q', 8, False, False)]:
+            key = B(fmt)
+            self.txn.put(key, struct.pack(fmt, 100))
+            kw = dict(width=width, signed=signed, big_endian=big_endian)
+            assert self.txn.incr(key, 20, **kw) == 120
+            assert self.txn.get(key) == struct.pack(fmt, 120)
+
+    def test_overflow(self):
+        self.txn.put(B('a'), struct.pack('<b', 127))
+        self.assertRaises(OverflowError,
+            lambda: self.txn.incr(B('a'), width=1))
+        assert self.txn.get(B('a')) == struct.pack('<b', 127)
+        assert self.txn.incr(B('a'), -255, width=1) == -128
+        self.assertRaises(OverflowError,
+            lambda: self.txn.incr(B('b'), -1, signed=False))
+        assert self.txn.get(B('b')) is None
+        big = (1 << 64) - 1
+        self.txn.put(B('c'), struct.pack('<Q', big - 1))
+        assert self.txn.incr(B('c'), signed=False) == big
+        self.assertRaises(OverflowError,
+            lambda: self.txn.incr(B('c'), signed=False))
+        self.assertRaises(OverflowError,
+            lambda: self.txn.incr(B('c'), 1 << 63))
+
+    def test_errors(self):
+        self.txn.put(B('a'), B('abc'))
+        self.assertRaises(lmdb.BadValsizeError,
+            lambda: self.txn.incr(B('a')))
+        self.assertRaises(ValueError,
+            lambda: self.txn.incr(B('a'), width=3))
+        db = self.env.open_db(B('db1'), txn=self.txn, dupsort=True)
+        self.assertRaises(lmdb.IncompatibleError,
+            lambda: self.txn.incr(B('a'), db=db))
+
+    def test_many(self):
+        self.txn.incr(B('b'), 5)
+        res = self.txn.incr_many([(B('a'), 1), (B('b'), 2), (B('a'), 3)])
+        assert res == [1, 7, 4]
+        res = self.txn.incr_many({B('c'): 2}, width=2, big_endian=True)
+        assert res == [2]
+        assert self.txn.get(B('c')) == struct.pack('>h', 2)
+        assert self.txn.incr_many([]) == []
+
+    def test_many_error(self):
+        self.txn.put(B('b'), B('x'))
+        try:
+            self.txn.incr_many([(B('a'), 1), (B('b'), 1)])
+            assert 0
+        except lmdb.BadValsizeError as e:
+            assert 'element #1' in str(e)
+        assert self.txn.incr(B('a')) == 2
+
+    def test_bad_key(self):
+        long_key = B('a') * (self.env.max_key_size() + 1)
+        for key in B(''), long_key:
+            try:
+                self.txn.incr(key)
+                assert 0
+            except lmdb.BadValsizeError as e:
+                assert 'key must be' in str(e)
+        # Checked before any increment is applied.
+        try:
+            self.txn.incr_many([(B('a'), 1), (B(''), 1)])
+            assert 0
+        except lmdb.BadValsizeError as e:
+            assert 'element #1: key must be' in str(e)
+        assert self.txn.get(B('a')) is None
+
+class PutIfTest(unittest.TestCase):
+    def tearDown(self):
+        testlib.cleanup()
+
+    def setUp(self):
+        _, self.env = testlib.temp_env()
+        self.txn = self.env.begin(write=True)
+        self.txn.put(B('a'), B('1'))
+
+    def test_bad_txn(self):
+        self.txn.abort()
+        self.assertRaises(Exception,
+            lambda: self.txn.put_if(B('a'), B('2'), B('1')))
+
+    def test_put_if(self):
+        assert self.txn.put_if(B('a'), B('2'), B('1'))
+        assert self.txn.get(B('a')) == B('2')
+        assert not self.txn.put_if(B('a'), B('3'), B('1'))
+        assert not self.txn.put_if(B('a'), B('3'), B('22'))
+        assert not self.txn.put_if(B('a'), B('3'), B(''))
+        assert self.txn.get(B('a')) == B('2')
+        assert self.txn.put_if(B('a'), B('longer value'), B('2'))
+        assert self.txn.get(B('a')) == B('longer value')
+
+    def test_put_if_absent(self):
+        assert not self.txn.put_if(B('a'), B('2'))
+        assert not self.txn.put_if(B('a'), B('2'), None)
+        assert self.txn.get(B('a')) == B('1')
+        assert not self.txn.put_if(B('b'), B('2'), B('1'))
+        assert self.txn.put_if(B('b'), B('2'))
+        assert self.txn.get(B('b')) == B('2')
+
+    def test_delete_if(self):
+        assert not self.txn.delete_if(B('a'), B('2'))
+        assert not self.txn.delete_if(B('b'), B('1'))
+        assert self.txn.delete_if(B('a'), B('1'))
+        assert self.txn.get(B('a')) is None
+        self.assertRaises(TypeError,
+            lambda: self.txn.delete_if(B('a'), None))
+
+    def test_dupsort(self):
+        db = self.env.open_db(B('db1'), txn=self.txn, dupsort=True)
+        for v in '135':
+            self.txn.put(B('a'), B(v), db=db)
+        def values():
+            curs = self.txn.cursor(db=db)
+            curs.set_key(B('a'))
+            return list(curs.iternext_dup())
+        assert self.txn.put_if(B('a'), B('6'), B('1'), db=db)
+        assert values() == [B('3'), B('5'), B('6')]
+        assert not self.txn.put_if(B('a'), B('7'), B('1'), db=db)
+        assert self.txn.delete_if(B('a'), B('5'), db=db)
+        assert values() == [B('3'), B('6')]
+
+class ResetRenewTest(unittest.TestCase):
+    def tearDown(self):
+        testlib.cleanup()
+
+    def setUp(self):
+        _, self.env = testlib.temp_env()
+        self.put(B('a'), B('1'))
+
+    def put(self, key, value):
+        with self.env.begin(write=True) as txn:
+            txn.put(key, value)
+
+    def test_renew(self):
+        txn = self.env.begin()
+        assert txn.get(B('a')) == B('1')
+        txn.reset()
+        self.assertRaises(Exception, lambda: txn.get(B('a')))
+        self.put(B('a'), B('2'))
+        txn.renew()
+        assert txn.get(B('a')) == B('2')
+        self.assertRaises(Exception, txn.renew)
+        txn.abort()
+
+    def test_renew_unreset(self):
+        # Only a transaction released by reset() can be renewed.
+        txn = self.env.begin()
+        self.assertRaises(lmdb.InvalidParameterError, txn.renew)
+        txn.commit()
+        self.assertRaises(lmdb.InvalidParameterError, txn.renew)
+        txn = self.env.begin()
+        txn.abort()
+        self.assertRaises(lmdb.InvalidParameterError, txn.renew)
+        txn = self.env.begin()
+        txn.reset()
+        txn.abort()
+        self.assertRaises(lmdb.InvalidParameterError, txn.renew)
+
+    def test_reset_write(self):
+        txn = self.env.begin(write=True)
+        self.assertRaises(lmdb.Error, txn.reset)
+        txn.abort()
+
+    def test_cursor_renewed(self):
+        txn = self.env.begin()
+        curs = txn.cursor()
+        assert curs.first()
+        assert curs.key() == B('a')
+        txn.reset()
+        self.assertRaises(Exception, curs.key)
+        self.assertRaises(Exception, curs.first)
+        self.put(B('b'), B('2'))
+        txn.renew()
+        assert curs.key() == B('')
+        assert list(curs) == [(B('a'), B('1')), (B('b'), B('2'))]
+        txn.abort()
+
+    def test_readers(self):
+        txn = self.env.begin()
+        count = len(self.env.readers().splitlines())
+        for i in range(3):
+            txn.reset()
+            txn.renew()
+        assert len(self.env.readers().splitlines()) == count
+        txn.abort()
+
+    def test_cursor_renew_txn(self):
+        txn1 = self.env.begin()
+        curs = txn1.cursor()
+        assert curs.first()
+        self.put(B('b'), B('2'))
+        txn2 = self.env.begin()
+        curs.renew(txn2)
+        assert curs.key() == B('')
+        assert list(curs) == [(B('a'), B('1')), (B('b'), B('2'))]
+        txn1.abort()
+        # Cursor now belongs to txn2, so survives txn1.
+        assert curs.set_key(B('b'))
+        txn2.abort()
+        self.assertRaises(Exception, curs.first)
+
+    def test_cursor_renew_write(self):
+        txn = self.env.begin()
+        curs = txn.cursor()
+        wtxn = self.env.begin(write=True)
+        self.assertRaises(lmdb.Error, lambda: curs.renew(wtxn))
+        wtxn.abort()
+        txn.abort()
+
 if __name__ == '__main__':
     unittest.main()